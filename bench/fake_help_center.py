@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+가짜 헬프센터 서버 (벤치마크용)
+
+국가별 시작 페이지 아래에 서로 링크된 문서 페이지를 생성하고 robots.txt, sitemap.xml,
+ETag 조건부 요청(304)을 지원합니다. 같은 seed에는 항상 같은 페이지를 반환합니다.
+
+    python bench/fake_help_center.py --port 8902 --pages 200
+"""
+
+import argparse
+import hashlib
+import random
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 국가별 시작 경로 (Config.KNOWLEDGE_BASE_URLS와 같은 구조)
+SITES = {"kr": "/moneywalk/ko", "us": "/moneywalkus/en"}
+
+TOPICS = {
+    "kr": ["포인트 적립", "수면 모드", "상품 교환", "친구 초대", "광고 시청", "만보기 오류", "현금 인출", "계정 관리"],
+    "us": ["Earning points", "Sleep mode", "Gift card rewards", "Inviting friends", "Watching ads", "Step tracking", "VoiceOver", "Account"]
+}
+SENTENCES = {
+    "kr": [
+        "앱을 최신 버전으로 업데이트한 뒤 다시 시도해 주세요.",
+        "포인트는 광고 시청이 완료된 후 최대 10분 이내에 적립됩니다.",
+        "문제가 계속되면 앱 내 1:1 문의로 기기 정보와 함께 알려주세요.",
+        "교환한 상품은 보관함에서 확인할 수 있으며 유효기간을 확인해 주세요.",
+        "걸음 수는 휴대폰의 건강 앱 권한이 허용되어 있어야 정상적으로 측정됩니다.",
+        "친구 초대 보상은 초대받은 친구가 가입을 완료하면 지급됩니다."
+    ],
+    "us": [
+        "Please update the app to the latest version and try again.",
+        "Points are credited within 10 minutes after an ad finishes playing.",
+        "If the issue continues, contact in-app support with your device details.",
+        "Redeemed gift cards appear in your reward box within 24 hours.",
+        "Step counts require motion and fitness permissions to be enabled.",
+        "Referral rewards are granted once your friend completes sign-up."
+    ]
+}
+
+class FakeHelpCenterHandler(BaseHTTPRequestHandler):
+    pages_per_site = 100
+    seed = 0
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        path = self.path.split("?")[0].split("#")[0].rstrip("/") or "/"
+        
+        if path == "/robots.txt":
+            host = self.headers.get("Host", "127.0.0.1")
+            return self._send(200, f"User-agent: *\nDisallow: /private\nSitemap: http://{host}/sitemap.xml\n", "text/plain")
+        if path == "/sitemap.xml":
+            return self._send(200, self._sitemap(), "application/xml")
+        
+        for country, base in SITES.items():
+            if path == base:
+                return self._send(200, self._page(country, 0), "text/html")
+            if path.startswith(f"{base}/articles/"):
+                try:
+                    number = int(path.rsplit("/", 1)[1])
+                except ValueError:
+                    break
+                if 1 <= number < self.pages_per_site:
+                    return self._send(200, self._page(country, number), "text/html")
+        
+        self._send(404, "<html><body>Not found</body></html>", "text/html")
+    
+    def _sitemap(self) -> str:
+        host = self.headers.get("Host", "127.0.0.1")
+        urls = "".join(
+            f"<url><loc>http://{host}{base}/articles/{n}</loc></url>"
+            for base in SITES.values() for n in range(1, self.pages_per_site, 7)
+        )
+        return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+    
+    def _page(self, country: str, number: int) -> str:
+        return _render_page(country, number, self.pages_per_site, self.seed)
+    
+    def _send(self, status: int, body: str, content_type: str):
+        encoded = body.encode('utf-8')
+        etag = '"' + hashlib.md5(encoded).hexdigest() + '"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(encoded)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+@lru_cache(maxsize=4096)
+def _render_page(country: str, number: int, pages: int, seed: int) -> str:
+    rng = random.Random(f"{seed}-{country}-{number}")
+    base = SITES[country]
+    topic = rng.choice(TOPICS[country])
+    paragraphs = "".join(
+        "<p>" + " ".join(rng.choice(SENTENCES[country]) for _ in range(rng.randint(3, 8))) + "</p>"
+        for _ in range(rng.randint(3, 10))
+    )
+    
+    # 트리 구조(자식 페이지) + 임의 관련 문서 링크 + 추적 파라미터가 붙은 중복 링크
+    children = [n for n in (number * 4 + 1, number * 4 + 2, number * 4 + 3, number * 4 + 4) if n < pages]
+    related = [rng.randrange(1, pages) for _ in range(3)] if pages > 1 else []
+    links = "".join(f'<a href="{base}/articles/{n}">{n}</a>' for n in children + related)
+    links += f'<a href="{base}/articles/{related[0]}?utm_source=footer#top">dup</a>' if related else ""
+    links += '<a href="/private/admin">admin</a><a href="https://example.com/out">out</a>'
+    
+    return (
+        f"<html><head><title>{topic} {number}</title></head><body>"
+        f"<nav>{links}</nav><h1>{topic} ({number})</h1>{paragraphs}<footer>© Moneywalk</footer>"
+        "</body></html>"
+    )
+
+
+def serve(port: int, pages: int = 100, seed: int = 0):
+    """가짜 헬프센터 실행 (블로킹)"""
+    handler = type("Handler", (FakeHelpCenterHandler,), {"pages_per_site": pages, "seed": seed})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 헬프센터 서버")
+    parser.add_argument("--port", type=int, default=8902)
+    parser.add_argument("--pages", type=int, default=100, help="국가별 페이지 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    print("가짜 헬프센터: " + ", ".join(f"http://127.0.0.1:{args.port}{base}" for base in SITES.values()))
+    serve(args.port, args.pages, args.seed)
+
+if __name__ == "__main__":
+    main()
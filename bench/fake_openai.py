@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+OpenAI 호환 가짜 서버 (벤치마크용)
+
+/v1/chat/completions, /v1/embeddings를 구현하며 같은 입력에는 항상 같은 결과를 반환합니다.
+프롬프트 캐시도 흉내 내어, 이전 요청과 메시지 단위로 같은 접두사가 1024토큰 이상이면
+usage.prompt_tokens_details.cached_tokens로 보고합니다 (128토큰 단위).
+지연 시간·지터·분당 요청 한도(429)·오류율(500)을 설정할 수 있습니다.
+
+    python bench/fake_openai.py --port 8901 --latency-ms 400 --jitter-ms 150 --rpm 3000
+    OPENAI_BASE_URL=http://127.0.0.1:8901/v1 python main.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import Config
+
+class FakeOpenAIState:
+    """서버 설정과 분당 요청 한도 상태"""
+    
+    def __init__(self, latency_ms: float = 300, jitter_ms: float = 100, embedding_latency_ms: float = 50,
+                 rpm: int = 0, error_rate: float = 0.0, dimension: int = 1536, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.embedding_latency_ms = embedding_latency_ms
+        self.rpm = rpm
+        self.error_rate = error_rate
+        self.dimension = dimension
+        
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_requests = 0
+        self._prompt_prefixes = set()
+        self.stats = {"chat": 0, "embeddings": 0, "rate_limited": 0, "errors": 0}
+    
+    def admit(self) -> str:
+        """요청 허용 여부: "ok" | "rate_limited" | "error" (1분 고정 윈도 기준)"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 60:
+                self._window_start = now
+                self._window_requests = 0
+            
+            if self.rpm and self._window_requests >= self.rpm:
+                self.stats["rate_limited"] += 1
+                return "rate_limited"
+            self._window_requests += 1
+            
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return "error"
+            return "ok"
+    
+    def cached_tokens(self, messages: list) -> int:
+        """이전 요청과 공유하는 메시지 접두사 중 가장 긴 것의 토큰 수 (1024 미만이면 0)"""
+        cached, prefix_tokens = 0, 0
+        with self._lock:
+            for i, message in enumerate(messages):
+                prefix_tokens += _count_tokens(str(message.get("content", "")))
+                key = _seed(messages[:i + 1])
+                if key in self._prompt_prefixes:
+                    cached = prefix_tokens
+                self._prompt_prefixes.add(key)
+        return cached // 128 * 128 if cached >= 1024 else 0
+    
+    def retry_after(self) -> float:
+        with self._lock:
+            return max(0.1, 60 - (time.monotonic() - self._window_start))
+    
+    def sleep(self, base_ms: float):
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, base_ms + jitter) / 1000)
+
+
+def _seed(value) -> int:
+    return int(hashlib.sha256(json.dumps(value, ensure_ascii=False).encode('utf-8')).hexdigest()[:16], 16)
+
+
+def _count_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한글은 글자당 1, 그 외 4글자당 1)"""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii) // 4 + 1
+
+
+def fake_embedding(value, dimension: int):
+    """입력(문자열 또는 토큰 배열)별로 고정된 단위 벡터"""
+    import numpy as np
+    
+    vector = np.random.default_rng(_seed(value)).standard_normal(dimension).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def fake_chat_reply(messages: list, json_mode: bool) -> str:
+    """프롬프트 종류(분류 / 분류+응답 JSON / 응답)에 맞는 고정 답변"""
+    system = "\n".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+    user = str(messages[-1].get("content", "")) if messages else ""
+    rng = random.Random(_seed(user))
+    category = rng.choice(Config.REVIEW_CATEGORIES)
+    
+    korean = bool(re.search(r"[가-힣]", user.split("Classify")[0])) or "Country: KR" in user
+    if korean:
+        body = rng.choice([
+            "앱 사용 중 불편을 드려 죄송합니다. 말씀하신 내용은 담당 부서에 전달하여 빠르게 확인하겠습니다.",
+            "좋은 평가 감사합니다. 앞으로도 더 나은 서비스를 제공하기 위해 노력하겠습니다.",
+            "포인트 적립 관련 문의는 앱 내 1:1 문의로 남겨주시면 자세히 확인해 드리겠습니다."
+        ])
+        response = f"안녕하세요, 머니워크 운영팀입니다. 소중한 시간을 내어 리뷰를 남겨주셔서 감사합니다. {body} 오늘도 건강한 하루 보내세요!"
+    else:
+        body = rng.choice([
+            "We're sorry for the inconvenience and our team is looking into it.",
+            "Thank you so much for the kind words!",
+            "Please reach out via in-app support so we can check your account."
+        ])
+        response = f"Hi, thank you for your feedback. {body} Have a great day!"
+    
+    if json_mode:
+        return json.dumps({"category": category, "response": response}, ensure_ascii=False)
+    if "카테고리명만 반환" in system:
+        return category
+    return response
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    state: FakeOpenAIState = None
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._send(400, {"error": {"message": "invalid json", "type": "invalid_request_error"}})
+        
+        if self.path.endswith("/chat/completions"):
+            endpoint = "chat"
+        elif self.path.endswith("/embeddings"):
+            endpoint = "embeddings"
+        else:
+            return self._send(404, {"error": {"message": f"unknown path {self.path}", "type": "invalid_request_error"}})
+        
+        admission = self.state.admit()
+        if admission == "rate_limited":
+            return self._send(
+                429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                {"retry-after": f"{self.state.retry_after():.1f}"}
+            )
+        if admission == "error":
+            return self._send(500, {"error": {"message": "The server had an error", "type": "server_error"}})
+        
+        self.state.stats[endpoint] += 1
+        if endpoint == "chat":
+            self._chat(payload)
+        else:
+            self._embeddings(payload)
+    
+    def _chat(self, payload: dict):
+        self.state.sleep(self.state.latency_ms)
+        messages = payload.get("messages", [])
+        json_mode = (payload.get("response_format") or {}).get("type") == "json_object"
+        content = fake_chat_reply(messages, json_mode)
+        
+        prompt_tokens = sum(_count_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = _count_tokens(content)
+        cached_tokens = self.state.cached_tokens(messages)
+        self._send(200, {
+            "id": f"chatcmpl-{_seed(messages) % 10**12}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", Config.LLM_MODEL),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens}
+            }
+        })
+    
+    def _embeddings(self, payload: dict):
+        self.state.sleep(self.state.embedding_latency_ms)
+        inputs = payload.get("input", [])
+        # 문자열 1개, 문자열 목록, 토큰 배열 1개, 토큰 배열 목록 모두 허용
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        
+        dimension = payload.get("dimensions") or self.state.dimension
+        data = [
+            {"object": "embedding", "index": i, "embedding": fake_embedding(value, dimension)}
+            for i, value in enumerate(inputs)
+        ]
+        tokens = sum(len(value) if isinstance(value, list) else _count_tokens(value) for value in inputs)
+        self._send(200, {
+            "object": "list",
+            "data": data,
+            "model": payload.get("model", Config.EMBEDDING_MODEL),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        })
+    
+    def _send(self, status: int, body: dict, headers: dict = None):
+        encoded = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+def serve(port: int, **options):
+    """가짜 서버 실행 (블로킹)"""
+    handler = type("Handler", (FakeOpenAIHandler,), {"state": FakeOpenAIState(**options)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 호환 가짜 서버")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=300, help="채팅 응답 평균 지연")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="지연 시간 ± 범위")
+    parser.add_argument("--embedding-latency-ms", type=float, default=50, help="임베딩 응답 평균 지연")
+    parser.add_argument("--rpm", type=int, default=0, help="분당 요청 한도 (0이면 무제한, 초과 시 429)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류 비율 (0~1)")
+    parser.add_argument("--dimension", type=int, default=1536, help="임베딩 차원")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    print(f"가짜 OpenAI 서버: http://127.0.0.1:{args.port}/v1")
+    serve(
+        args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        embedding_latency_ms=args.embedding_latency_ms, rpm=args.rpm,
+        error_rate=args.error_rate, dimension=args.dimension, seed=args.seed
+    )
+
+if __name__ == "__main__":
+    main()
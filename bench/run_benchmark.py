@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+리뷰봇 오프라인 처리량 벤치마크
+
+가짜 OpenAI 서버와 가짜 헬프센터를 띄운 뒤 시나리오마다 새 프로세스와 임시 작업 디렉터리에서
+ReviewBot을 실행하고 처리량(reviews/sec), p95 지연 시간, 프롬프트 캐시 토큰 비율, 최대 RSS를 보고합니다.
+
+    python bench/run_benchmark.py --sizes 100,1000 --latency-ms 300 --workers 8
+    python bench/run_benchmark.py --sizes 100000 --latency-ms 20 --json results.json
+    python bench/run_benchmark.py --sizes 1000 --latency-ms 20 --scenarios batch --processes 0,2,4,8
+
+시나리오
+- init_kb: 헬프센터 수집 + 벡터 저장소 생성 (initialize_knowledge_base)
+- batch: 리뷰 N개 일괄 처리 (process_reviews_batch, 빈 응답 캐시에서 시작)
+- stats: 리뷰 N개가 캐시된 상태에서 새 프로세스로 통계 조회 (get_statistics)
+
+--processes를 지정하면 batch 시나리오를 BATCH_PROCESSES 값마다(0: 단일 프로세스 스레드 풀) 빈 응답 캐시에서
+다시 실행하므로, 프로세스 풀 처리량이 코어 수에 따라 늘어나는지 비교할 수 있습니다 (--workers는 프로세스당 동시 처리 수).
+
+OpenAIEmbeddings는 기본적으로 tiktoken 인코딩 파일을 내려받아 입력을 토큰 배열로 보내므로,
+벤치마크는 EMBEDDING_CHECK_CTX_LENGTH=false로 원문을 그대로 보냅니다. 토큰 배열 경로를
+측정하려면 인코딩 파일을 캐시(TIKTOKEN_CACHE_DIR)한 뒤 EMBEDDING_CHECK_CTX_LENGTH=true로 실행하세요.
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"포트 {port} 서버가 시작되지 않았습니다.")
+
+def _peak_rss_mb() -> float:
+    # 리눅스는 KB, macOS는 바이트 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _link_case_files(workdir: str):
+    from config import Config
+    for path in Config.REVIEW_CASE_FILES.values():
+        if os.path.exists(os.path.join(ROOT, path)):
+            os.symlink(os.path.join(ROOT, path), os.path.join(workdir, path))
+
+# ---------------------------------------------------------------------------
+# 자식 프로세스 (시나리오 1개 실행 후 결과 JSON을 마지막 줄에 출력)
+# ---------------------------------------------------------------------------
+
+def run_child(scenario: str, reviews: int, help_center: str, seed: int, duplicate_ratio: float) -> dict:
+    from config import Config
+    from services.metrics import metrics
+    
+    Config.KNOWLEDGE_BASE_URLS = {
+        "kr": f"{help_center}/moneywalk/ko",
+        "us": f"{help_center}/moneywalkus/en"
+    }
+    
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        from services.review_bot import ReviewBot
+        bot = ReviewBot()
+        result = {"scenario": scenario, "reviews": reviews}
+        
+        if scenario == "init_kb":
+            start = time.perf_counter()
+            bot.initialize_knowledge_base(force_update=True)
+            result["seconds"] = time.perf_counter() - start
+            result["chunks"] = sum(
+                bot.vector_store_service.get_document_count(country.lower()) for country in Config.COUNTRIES
+            )
+        
+        elif scenario == "batch":
+            from bench.synthetic_reviews import generate_reviews
+            
+            batch = list(generate_reviews(reviews, seed=seed, duplicate_ratio=duplicate_ratio))
+            bot.initialize_knowledge_base(force_update=False)
+            metrics.reset()
+            
+            start = time.perf_counter()
+            responses = bot.process_reviews_batch(batch)
+            result["seconds"] = time.perf_counter() - start
+            result["responses"] = len(responses)
+            result["processes"] = Config.BATCH_PROCESSES
+            result["reviews_per_sec"] = len(batch) / result["seconds"] if result["seconds"] else None
+            result["p95_ms"] = metrics.percentiles("review_total").get("p95")
+            result["llm_calls"] = metrics.counters.get("llm_calls_total", 0)
+            result["prompt_tokens"] = metrics.counters.get("llm_prompt_tokens_total", 0)
+            result["cached_prompt_ratio"] = metrics.cached_prompt_ratio()
+            result["dense_retrieval_skipped"] = metrics.counters.get("retrieval_dense_skipped_total", 0)
+            baseline_tokens = metrics.counters.get("context_baseline_tokens_total", 0)
+            if baseline_tokens:
+                result["context_token_savings"] = 1 - metrics.counters.get("context_tokens_total", 0) / baseline_tokens
+        
+        elif scenario == "stats":
+            start = time.perf_counter()
+            bot.get_statistics()
+            result["seconds"] = time.perf_counter() - start
+        
+        else:
+            raise ValueError(f"알 수 없는 시나리오: {scenario}")
+    
+    result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    return result
+
+# ---------------------------------------------------------------------------
+# 부모 프로세스
+# ---------------------------------------------------------------------------
+
+def _run_scenario(scenario: str, workdir: str, env: dict, args, reviews: int = 0) -> dict:
+    command = [
+        sys.executable, os.path.abspath(__file__), "--child", scenario,
+        "--reviews", str(reviews), "--help-center", env["BENCH_HELP_CENTER"],
+        "--seed", str(args.seed), "--duplicate-ratio", str(args.duplicate_ratio)
+    ]
+    result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or ["실행 실패"]
+        return {"scenario": scenario, "reviews": reviews, "error": tail[0]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def _print_result(result: dict):
+    label = result['scenario']
+    if result.get("processes", 0) > 1:
+        label = f"{label}/p{result['processes']}"
+    if "error" in result:
+        print(f"{label:<8} {result['reviews']:>8,}  실패: {result['error']}")
+        return
+    rate = f"{result['reviews_per_sec']:.1f}" if result.get("reviews_per_sec") else "-"
+    p95 = f"{result['p95_ms']:.0f}" if result.get("p95_ms") is not None else "-"
+    cached = f"{result['cached_prompt_ratio'] * 100:.0f}%" if result.get("cached_prompt_ratio") is not None else "-"
+    print(f"{label:<8} {result['reviews']:>8,} {result['seconds']:>9.2f}s {rate:>10} {p95:>9} {cached:>9} {result['peak_rss_mb']:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="리뷰봇 오프라인 처리량 벤치마크")
+    parser.add_argument("--sizes", default="100,1000", help="일괄 처리 리뷰 수 (쉼표 구분, 예: 100,1000,10000,100000)")
+    parser.add_argument("--scenarios", default="init_kb,batch,stats", help="실행할 시나리오 (쉼표 구분)")
+    parser.add_argument("--workers", type=int, default=None, help="BATCH_MAX_WORKERS (기본: 설정값)")
+    parser.add_argument("--processes", default=None, help="batch 시나리오의 BATCH_PROCESSES 값 (쉼표 구분, 예: 0,2,4)")
+    parser.add_argument("--latency-ms", type=float, default=300, help="가짜 채팅 응답 평균 지연")
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--embedding-latency-ms", type=float, default=50)
+    parser.add_argument("--server-rpm", type=int, default=0, help="가짜 서버 분당 요청 한도 (초과 시 429)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 서버 500 오류 비율")
+    parser.add_argument("--pages", type=int, default=60, help="가짜 헬프센터 국가별 페이지 수")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1, help="정확히 중복되는 리뷰 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--keep", action="store_true", help="임시 작업 디렉터리 유지")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--reviews", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--help-center", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(run_child(args.child, args.reviews, args.help_center, args.seed, args.duplicate_ratio)))
+        return
+    
+    from bench import fake_help_center, fake_openai
+    
+    openai_port, help_port = _free_port(), _free_port()
+    servers = [
+        multiprocessing.Process(target=fake_openai.serve, args=(openai_port,), kwargs={
+            "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+            "embedding_latency_ms": args.embedding_latency_ms, "rpm": args.server_rpm,
+            "error_rate": args.error_rate, "seed": args.seed
+        }, daemon=True),
+        multiprocessing.Process(target=fake_help_center.serve, args=(help_port, args.pages, args.seed), daemon=True)
+    ]
+    for server in servers:
+        server.start()
+    _wait_for_port(openai_port)
+    _wait_for_port(help_port)
+    
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": ROOT + os.pathsep + env.get("PYTHONPATH", ""),
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+        "BENCH_HELP_CENTER": f"http://127.0.0.1:{help_port}",
+        "METRICS_PROMETHEUS_PATH": "",
+        "METRICS_TRACE_PATH": ""
+    })
+    # 클라이언트 측 한도는 가짜 서버가 아닌 실제 계정 기준이므로 지정하지 않았으면 넉넉하게
+    env.setdefault("OPENAI_REQUESTS_PER_MINUTE", "100000")
+    env.setdefault("OPENAI_TOKENS_PER_MINUTE", "1000000000")
+    # tiktoken 인코딩 파일을 내려받지 않도록 원문 그대로 임베딩 요청 (가짜 서버는 두 형식 모두 지원)
+    env.setdefault("EMBEDDING_CHECK_CTX_LENGTH", "false")
+    if args.workers:
+        env["BATCH_MAX_WORKERS"] = str(args.workers)
+    
+    scenarios = args.scenarios.split(",")
+    sizes = [int(size) for size in args.sizes.split(",")]
+    process_counts = [int(count) for count in args.processes.split(",")] if args.processes else [None]
+    results = []
+    base_dir = tempfile.mkdtemp(prefix="reviewbot_bench_")
+    
+    print(f"CPU 코어 {os.cpu_count()}개")
+    print(f"{'시나리오':<8} {'리뷰 수':>8} {'소요 시간':>10} {'reviews/s':>10} {'p95(ms)':>9} {'캐시 토큰':>9} {'RSS(MB)':>9}")
+    print("-" * 62)
+    try:
+        # 지식베이스는 한 번 생성하고 배치마다 복사해 사용 (응답 캐시는 빈 상태에서 시작)
+        kb_dir = os.path.join(base_dir, "kb")
+        os.makedirs(kb_dir)
+        _link_case_files(kb_dir)
+        result = _run_scenario("init_kb", kb_dir, env, args)
+        if "init_kb" in scenarios:
+            results.append(result)
+            _print_result(result)
+        
+        for size in sizes:
+            for n, processes in enumerate(process_counts):
+                suffix = f"_p{processes}" if processes is not None else ""
+                workdir = os.path.join(base_dir, f"batch_{size}{suffix}")
+                shutil.copytree(
+                    kb_dir, workdir, symlinks=True,
+                    ignore=shutil.ignore_patterns("response_cache*", "semantic_cache")
+                )
+                scenario_env = dict(env)
+                if processes is not None:
+                    scenario_env["BATCH_PROCESSES"] = str(processes)
+                
+                # 통계 조회는 처리 방식과 무관하므로 크기마다 한 번만
+                for scenario in ("batch", "stats") if n == 0 else ("batch",):
+                    if scenario in scenarios:
+                        result = _run_scenario(scenario, workdir, scenario_env, args, size)
+                        results.append(result)
+                        _print_result(result)
+    finally:
+        for server in servers:
+            server.terminate()
+        if args.keep:
+            print(f"작업 디렉터리: {base_dir}")
+        else:
+            shutil.rmtree(base_dir, ignore_errors=True)
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
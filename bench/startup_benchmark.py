@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+리뷰봇 콜드 스타트 벤치마크
+
+진입 경로별로 새 파이썬 프로세스를 실행해 해당 작업을 마칠 때까지의 시간을 측정합니다.
+(OpenAI API는 호출하지 않으며, 캐시 초기화는 임시 작업 디렉터리의 복사본에서 실행)
+
+    python bench/startup_benchmark.py --repeat 5
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import Config
+
+BOT_SETUP = "from services.review_bot import ReviewBot\nbot = ReviewBot()\n"
+
+# 진입 경로별 실행 코드
+SCENARIOS = {
+    "python 시작 (기준)": "pass",
+    "ReviewBot import": "from services.review_bot import ReviewBot",
+    "메뉴 표시 (ReviewBot 생성)": BOT_SETUP,
+    "3. 통계 조회": BOT_SETUP + "bot.get_statistics()",
+    "4. 캐시 초기화": BOT_SETUP + "bot.clear_cache()",
+    "1. 기존 지식베이스 로드": BOT_SETUP + "bot._check_existing_vector_stores() and bot.initialize_knowledge_base(force_update=False)",
+    "리뷰 처리 준비 (분류기+생성기)": BOT_SETUP + "bot.review_classifier\nbot.response_generator",
+}
+
+def prepare_workdir(workdir: str):
+    """캐시는 복사하고 (수정될 수 있음) 벡터 저장소·임베딩 캐시·케이스 CSV는 링크"""
+    for path in (Config.RESPONSE_CACHE_PATH, f"{Config.RESPONSE_CACHE_PATH}-wal", f"{Config.RESPONSE_CACHE_PATH}-shm"):
+        if os.path.exists(os.path.join(ROOT, path)):
+            shutil.copy2(os.path.join(ROOT, path), os.path.join(workdir, path))
+    
+    if os.path.isdir(os.path.join(ROOT, Config.SEMANTIC_CACHE_PATH)):
+        shutil.copytree(os.path.join(ROOT, Config.SEMANTIC_CACHE_PATH), os.path.join(workdir, Config.SEMANTIC_CACHE_PATH))
+    
+    for path in [Config.VECTOR_STORE_PATH, Config.EMBEDDING_CACHE_PATH, *Config.REVIEW_CASE_FILES.values()]:
+        if os.path.exists(os.path.join(ROOT, path)):
+            os.symlink(os.path.join(ROOT, path), os.path.join(workdir, path))
+
+def run_once(code: str, env: dict) -> float:
+    with tempfile.TemporaryDirectory() as workdir:
+        prepare_workdir(workdir)
+        
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=workdir, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        elapsed = time.perf_counter() - start
+    
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "실행 실패")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="진입 경로별 콜드 스타트 시간 측정")
+    parser.add_argument("--repeat", type=int, default=5, help="시나리오별 반복 횟수")
+    args = parser.parse_args()
+    
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark")  # 클라이언트 생성용 (호출하지 않음)
+    
+    print(f"{'진입 경로':<32} {'중앙값':>8} {'최소':>8} {'최대':>8}")
+    print("-" * 60)
+    
+    for name, code in SCENARIOS.items():
+        try:
+            timings = [run_once(code, env) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:<32} 실패: {e}")
+            continue
+        print(f"{name:<32} {statistics.median(timings):>7.3f}s {min(timings):>7.3f}s {max(timings):>7.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+KR/US 리뷰 케이스 CSV를 시드로 한 합성 리뷰 생성기 (벤치마크용)
+
+같은 seed에는 항상 같은 리뷰 목록을 생성합니다. duplicate_ratio 비율만큼은
+앞서 생성한 리뷰를 그대로 반복해 정확 일치 캐시 적중을 재현합니다.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.review import Review
+from utils.review_cases import load_review_cases
+
+# CSV가 없을 때 사용하는 기본 시드
+FALLBACK_CASES = [
+    {"country": "KR", "category": "포인트_관련", "review": "광고를 봤는데 포인트가 안 들어와요. 확인해주세요."},
+    {"country": "KR", "category": "기능_오류", "review": "잠자기 버튼이 사라졌어요. 어디 있나요?"},
+    {"country": "KR", "category": "칭찬", "review": "앱이 정말 좋아요! 걸으면서 포인트도 모으고 재미있네요"},
+    {"country": "US", "category": "접근성", "review": "This app is not voiceover friendly. Hard to use for blind users."},
+    {"country": "US", "category": "기능_오류", "review": "Great app! But sometimes it crashes when I try to watch ads."}
+]
+
+PREFIXES = {
+    "KR": ["", "", "진짜 ", "요즘 ", "어제부터 ", "업데이트 후에 ", "솔직히 "],
+    "US": ["", "", "Honestly, ", "Lately ", "Since the update, ", "Ugh. ", "FYI "]
+}
+SUFFIXES = {
+    "KR": ["", "", " 빨리 해결해주세요.", " 감사합니다!", " ㅠㅠ", " 확인 부탁드려요.", " 벌써 세 번째예요."],
+    "US": ["", "", " Please fix this.", " Thanks!", " :(", " Any update?", " Third time now."]
+}
+AUTHORS = {
+    "KR": ["김민수", "이지영", "박철민", "최수진", "정하늘", "걷기왕", "moneywalker", "익명"],
+    "US": ["John", "Sarah", "Mike T.", "jenny_runs", "Chris", "A Google user", "stepcounter99", "Pat"]
+}
+RATINGS = {"칭찬": (4, 5), "기타": (2, 4)}
+
+def _mutate(text: str, country: str, rng: random.Random) -> str:
+    text = rng.choice(PREFIXES[country]) + text + rng.choice(SUFFIXES[country])
+    
+    # 숫자 변경 (포인트·금액 등)
+    digits = [i for i, ch in enumerate(text) if ch.isdigit()]
+    if digits and rng.random() < 0.5:
+        i = rng.choice(digits)
+        text = text[:i] + str(rng.randint(0, 9)) + text[i + 1:]
+    
+    # 인접 글자 바꾸기 (오타)
+    if len(text) > 10 and rng.random() < 0.3:
+        i = rng.randrange(len(text) - 1)
+        text = text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    
+    return text
+
+def generate_reviews(count: int, seed: int = 42, duplicate_ratio: float = 0.1) -> Iterator[Review]:
+    """합성 리뷰를 count개 생성"""
+    rng = random.Random(seed)
+    cases = [case for case in load_review_cases() if case["review"]] or FALLBACK_CASES
+    start = datetime(2024, 1, 1)
+    generated: List[Review] = []
+    
+    for i in range(count):
+        if generated and rng.random() < duplicate_ratio:
+            original = rng.choice(generated)
+            review = original.copy(update={"id": f"bench_{i:06d}"})
+        else:
+            case = rng.choice(cases)
+            country = case["country"]
+            low, high = RATINGS.get(case.get("category"), (1, 3))
+            review = Review(
+                id=f"bench_{i:06d}",
+                author=rng.choice(AUTHORS[country]),
+                rating=rng.randint(low, high),
+                content=_mutate(case["review"], country, rng),
+                created_at=start + timedelta(minutes=i),
+                country=country,
+                platform=rng.choice(["google_play", "app_store"])
+            )
+            # 중복 후보는 최근 1000개로 제한 (메모리 일정하게 유지)
+            generated.append(review)
+            if len(generated) > 1000:
+                generated.pop(0)
+        
+        yield review
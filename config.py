@@ -6,23 +6,48 @@ load_dotenv()
 class Config:
     # OpenAI API 설정
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # 호환 API 주소 (벤치마크용 가짜 서버 등, 없으면 기본값)
     
     # 임베딩 모델 설정
     EMBEDDING_MODEL = "text-embedding-3-small"
+    EMBEDDING_CHECK_CTX_LENGTH = os.getenv("EMBEDDING_CHECK_CTX_LENGTH", "true").lower() == "true"  # tiktoken으로 입력 길이 확인·분할 (false면 원문 그대로 요청)
+    EMBEDDING_CACHE_PATH = "embedding_cache"  # (모델, 텍스트 해시) 기준 임베딩 캐시
     
     # LLM 모델 설정
     LLM_MODEL = "gpt-4o"  # 최신 GPT-4o 모델
     
+    # OpenAI 호출 한도 설정 (분류기·응답 생성기·임베딩 공용)
+    OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500"))
+    OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "30000"))
+    OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))  # AIMD 동시 실행 상한
+    OPENAI_MIN_CONCURRENCY = 1
+    OPENAI_MAX_RETRIES = 5  # 429/일시 오류 재시도 횟수
+    
     # 문서 수집 URL (한국/미국만)
     KNOWLEDGE_BASE_URLS = {
         "kr": "https://docs.channel.io/moneywalk/ko",
         "us": "https://docs.channel.io/moneywalkus/en"
     }
     
+    # 크롤링 설정
+    CRAWL_MAX_WORKERS = 8  # 전체 동시 요청 수 (연결 풀 크기)
+    CRAWL_CONCURRENCY_PER_HOST = 4  # 호스트별 동시 요청 수
+    CRAWL_TIMEOUT = 30
+    CRAWL_CACHE_PATH = "crawl_cache.json"  # 조건부 요청(ETag/Last-Modified)용 캐시
+    CRAWL_MAX_DEPTH = 4  # 시작 페이지로부터 최대 링크 깊이
+    CRAWL_MAX_PAGES = 300  # 국가별 최대 수집 페이지 수
+    CRAWL_TIME_BUDGET_SECONDS = 300  # 국가별 최대 수집 시간
+    
     # 텍스트 분할 설정
     CHUNK_SIZE = 800
     CHUNK_OVERLAP = 100
     
+    # RAG 컨텍스트 토큰 예산 (플랫폼별, 검색된 청크를 관련도 순으로 이 안에 담음)
+    CONTEXT_TOKEN_BUDGET = {
+        "google_play": 1000,
+        "app_store": 1500
+    }
+    
     # 리뷰 응답 길이 제한
     MAX_RESPONSE_LENGTH = {
         "google_play": 350,
@@ -31,6 +56,97 @@ class Config:
     
     # 벡터 저장소 설정
     VECTOR_STORE_PATH = "vector_stores"
+    VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "flat")  # flat | ivf | hnsw
+    VECTOR_INDEX_QUANTIZATION = os.getenv("VECTOR_INDEX_QUANTIZATION", "none")  # none | sq8 | pq
+    VECTOR_INDEX_MMAP = os.getenv("VECTOR_INDEX_MMAP", "true").lower() == "true"  # 인덱스를 메모리 매핑으로 로드
+    VECTOR_IVF_NLIST = 0  # IVF 클러스터 수 (0이면 문서 수에 맞춰 자동 결정)
+    VECTOR_IVF_NPROBE = 8  # IVF 검색 시 탐색할 클러스터 수
+    VECTOR_HNSW_M = 32  # HNSW 노드당 연결 수
+    VECTOR_HNSW_EF_SEARCH = 64  # HNSW 검색 후보 수
+    VECTOR_PQ_M = 48  # PQ 하위 벡터 수 (임베딩 차원의 약수)
+    VECTOR_RECALL_SAMPLE = 100  # 생성 시 flat 검색 대비 재현율 측정에 쓰는 샘플 수
+    VECTOR_VALIDATION_QUERIES = 5  # 새 버전 교체 전 검증에 쓰는 표본 질의 수
+    VECTOR_MAX_SHRINK_RATIO = 0.3  # 새 버전 문서 수가 현재 버전보다 이 비율 넘게 줄면 교체하지 않음 (부분 수집 방지, 1이면 검사 안 함)
+    VECTOR_STORE_KEEP_VERSIONS = 2  # 국가별로 남겨둘 저장소 버전 수 (현재 + 롤백용 이전 버전)
+    
+    # 검색 설정 (BM25 역색인: 한글 음절 2-gram + 영문 단어, 저장소 버전마다 함께 저장)
+    RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")  # dense | hybrid (BM25 + 벡터 RRF)
+    HYBRID_CANDIDATES = 10  # RRF로 합치기 전 BM25·벡터 검색 각각의 후보 수
+    HYBRID_RRF_K = 60  # RRF 순위 상수
+    BM25_K1 = 1.5
+    BM25_B = 0.75
+    BM25_SKIP_CONFIDENCE = float(os.getenv("BM25_SKIP_CONFIDENCE", "0.6"))  # 이 이상이면 임베딩 없이 BM25 결과만 사용 (1 초과면 항상 벡터 검색, 이미 임베딩된 리뷰는 항상 벡터 검색)
+    BM25_SKIP_MARGIN = 1.5  # BM25 1위 점수가 2위의 이 배수 이상일 때만 확실한 결과로 판단
+    
+    # 응답 캐시 설정
+    RESPONSE_CACHE_PATH = "response_cache.db"
+    LEGACY_RESPONSE_CACHE_FILE = "response_cache.json"  # 이전 버전 JSON 캐시 (최초 1회 마이그레이션)
+    RESPONSE_CACHE_COMPACTION_INTERVAL = 1000  # N회 쓰기마다 WAL 체크포인트
+    
+    # 로컬 분류기 설정 (키워드 규칙 + 임베딩 중심점, 신뢰도가 낮을 때만 LLM 사용)
+    LOCAL_CLASSIFIER_ENABLED = os.getenv("LOCAL_CLASSIFIER_ENABLED", "true").lower() == "true"
+    LOCAL_CLASSIFIER_CONFIDENCE_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_CONFIDENCE_THRESHOLD", "0.75"))
+    LOCAL_CLASSIFIER_TEMPERATURE = 0.05  # 중심점 유사도 softmax 온도
+    LOCAL_CLASSIFIER_MIN_SIMILARITY = float(os.getenv("LOCAL_CLASSIFIER_MIN_SIMILARITY", "0.45"))  # 최근접 중심점 최소 코사인 유사도 (미만이면 범위 밖)
+    LOCAL_CLASSIFIER_MIN_MARGIN = float(os.getenv("LOCAL_CLASSIFIER_MIN_MARGIN", "0.03"))  # 1·2위 중심점 유사도 최소 차이
+    LOCAL_CLASSIFIER_EMBED_ON_MISS = os.getenv("LOCAL_CLASSIFIER_EMBED_ON_MISS", "false").lower() == "true"  # 캐시에 없는 리뷰도 임베딩 API 호출
+    LOCAL_CLASSIFIER_MAX_CACHE_SEEDS = 2000  # 시드로 사용할 최근 캐시 항목 수
+    
+    # 실제 리뷰 케이스 CSV
+    REVIEW_CASE_FILES = {
+        "KR": "KR_User_Review_Cases (1).csv",
+        "US": "US_User_Review_Cases (1).csv"
+    }
+    
+    # Few-shot 답변 예시 설정 (리뷰 케이스 CSV + 프롬프트 예시 + 승인된 캐시 답변)
+    FEW_SHOT_ENABLED = os.getenv("FEW_SHOT_ENABLED", "true").lower() == "true"  # false면 전체 예시를 시스템 프롬프트에 포함
+    EXAMPLE_STORE_PATH = "example_store"
+    FEW_SHOT_K = 3  # 요청마다 넣는 최대 예시 수
+    FEW_SHOT_MIN_SIMILARITY = float(os.getenv("FEW_SHOT_MIN_SIMILARITY", "0.3"))  # 이보다 덜 비슷한 예시는 제외
+    
+    # 분류+응답 통합 모드 (LLM 호출 1회로 카테고리와 답변을 함께 생성)
+    FUSED_CLASSIFY_RESPOND = os.getenv("FUSED_CLASSIFY_RESPOND", "false").lower() == "true"
+    
+    # 유사 중복 응답 캐시 설정 (리뷰 임베딩 코사인 유사도)
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_PATH = "semantic_cache"
+    SEMANTIC_CACHE_THRESHOLDS = {
+        "default": 0.95,
+        "칭찬": 0.90,          # 칭찬은 내용이 달라도 답변이 거의 같음
+        "기능_오류": 0.97,      # 오류 종류별로 안내가 달라 엄격하게 적용
+        "포인트_관련": 0.97
+    }
+    SEMANTIC_CACHE_MAX_ENTRIES = 5000  # LRU 최대 항목 수
+    SEMANTIC_CACHE_TTL_SECONDS = 30 * 24 * 3600  # 30일
+    SEMANTIC_CACHE_SEARCH_K = 5
+    SEMANTIC_CACHE_SAVE_INTERVAL = 50  # N개 추가마다 디스크 저장
+    SEMANTIC_CACHE_PERSONALIZE = True  # 캐시 응답의 작성자명을 새 작성자명으로 교체
+    
+    # 배치 처리 설정
+    BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))  # 동시 처리 리뷰 수 (프로세스 풀은 프로세스당)
+    BATCH_PROCESSES = int(os.getenv("BATCH_PROCESSES", "0"))  # 2 이상이면 프로세스 풀로 일괄 처리 (0/1: 단일 프로세스)
+    BATCH_PROCESS_CHUNK_SIZE = 32  # 작업자 프로세스에 한 번에 보내는 최대 리뷰 수
+    BATCH_PROCESS_START_METHOD = os.getenv("BATCH_PROCESS_START_METHOD", "spawn")  # spawn / forkserver / fork
+    
+    # 실행 저널 설정 (배치/스트림 중단 후 재시작 시 완료된 리뷰 건너뛰기)
+    RUN_JOURNAL_ENABLED = os.getenv("RUN_JOURNAL_ENABLED", "true").lower() == "true"
+    RUN_JOURNAL_PATH = "run_journal.db"
+    RUN_MAX_RETRIES = int(os.getenv("RUN_MAX_RETRIES", "3"))  # 리뷰별 최대 처리 시도 횟수 (초과 시 재실행에서도 건너뜀)
+    
+    # 데몬(로컬 HTTP API) 설정
+    DAEMON_HOST = os.getenv("DAEMON_HOST", "127.0.0.1")
+    DAEMON_PORT = int(os.getenv("DAEMON_PORT", "8080"))
+    DAEMON_MAX_BODY_BYTES = 10 * 1024 * 1024  # 요청 본문 최대 크기
+    
+    # 리뷰 파일 스트림 처리 설정
+    STREAM_OUTPUT_PATH = "review_responses.jsonl"  # 응답 JSONL 기본 경로 (체크포인트는 옆에 .checkpoint.json)
+    STREAM_WINDOW_SIZE = 256  # 출력 전까지 메모리에 둘 수 있는 최대 리뷰 수 (초과 시 입력 읽기 대기)
+    STREAM_CHECKPOINT_INTERVAL = 500  # N개 입력마다 출력·캐시를 디스크에 반영하고 체크포인트 기록
+    
+    # 계측 설정
+    METRICS_MAX_SAMPLES = 10000  # 단계별 백분위 계산에 보관하는 최근 샘플 수
+    METRICS_PROMETHEUS_PATH = os.getenv("METRICS_PROMETHEUS_PATH")  # 지정 시 배치 처리 후 Prometheus 텍스트 파일 저장
+    METRICS_TRACE_PATH = os.getenv("METRICS_TRACE_PATH")  # 지정 시 단계별 실행 기록을 JSONL로 추가
     
     # 케이스 분류 (실제 케이스 기반으로 업데이트)
     REVIEW_CATEGORIES = [
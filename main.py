@@ -4,9 +4,11 @@
 LangChain 기반 RAG 아키텍처를 활용한 리뷰봇
 """
 
+import argparse
 import os
 import sys
 from datetime import datetime
+from config import Config
 from models.review import Review
 from services.review_bot import ReviewBot
 from schedulers.update_scheduler import UpdateScheduler
@@ -67,10 +69,33 @@ def print_detailed_statistics(stats: dict):
     performance = stats.get('성능 지표', {})
     if performance:
         print(f"\n⚡ 성능 지표:")
-        print(f"   캐시 적중률: {performance.get('cache_hit_rate', 'N/A')}")
+        print(f"   캐시 적중률: {performance.get('cache_hit_rate', 'N/A')} (정확 일치 {performance.get('exact_cache_hit_rate', 'N/A')}, 유사 캐시 {performance.get('semantic_cache_hit_rate', 'N/A')})")
         print(f"   평균 응답 길이: {performance.get('avg_response_length', 0):.1f}자")
         print(f"   캐시 파일 크기: {performance.get('total_cache_size', 'N/A')}")
     
+    # 분류 단계별 처리량
+    tier_counts = stats.get('분류 단계별 처리량', {})
+    if tier_counts:
+        tier_names = {"rules": "키워드 규칙", "centroid": "임베딩 중심점", "llm": "LLM"}
+        print(f"\n🧭 분류 단계별 처리량:")
+        for tier, count in tier_counts.items():
+            print(f"   {tier_names.get(tier, tier)}: {count:,}건")
+    
+    # 단계별 지연 시간
+    stage_latency = stats.get('단계별 지연 시간 (ms)', {})
+    if stage_latency:
+        print(f"\n⏱️  단계별 지연 시간 (ms):")
+        for stage, pct in stage_latency.items():
+            if pct.get('count'):
+                print(f"   {stage}: {pct['count']:,}회 | p50 {pct['p50']:.1f} | p95 {pct['p95']:.1f} | p99 {pct['p99']:.1f}")
+    
+    # 토큰 사용량
+    token_usage = stats.get('토큰 사용량', {})
+    if token_usage.get('LLM 호출 수'):
+        print(f"\n🔢 토큰 사용량:")
+        for name, value in token_usage.items():
+            print(f"   {name}: {value:,}")
+    
     # 시스템 상태
     system_status = stats.get('시스템 상태', {})
     if system_status:
@@ -149,8 +174,24 @@ def create_sample_reviews():
     
     return sample_reviews
 
+def run_daemon(host: str = None, port: int = None):
+    """데몬 모드: 지식베이스를 한 번 로드하고 로컬 HTTP API로 리뷰 처리 (스케줄러 포함)"""
+    from services.review_daemon import ReviewDaemon
+    
+    ReviewDaemon(ReviewBot(), host=host, port=port).serve_forever()
+
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="머니워크 리뷰 응답 자동화 봇")
+    parser.add_argument("--daemon", action="store_true", help="로컬 HTTP API 데몬으로 실행")
+    parser.add_argument("--host", default=None, help=f"데몬 주소 (기본: {Config.DAEMON_HOST})")
+    parser.add_argument("--port", type=int, default=None, help=f"데몬 포트 (기본: {Config.DAEMON_PORT})")
+    args = parser.parse_args()
+    
+    if args.daemon:
+        run_daemon(args.host, args.port)
+        return
+    
     print("=" * 50)
     print("🤖 머니워크 리뷰 응답 자동화 봇")
     print("=" * 50)
@@ -161,19 +202,20 @@ def main():
     # 사용자 선택 메뉴
     print("\n다음 중 선택해주세요:")
     print("1. 기존 지식베이스 사용 (빠름)")
-    print("2. 지식베이스 강제 업데이트 (느림, API 비용 발생)")
+    print("2. 지식베이스 업데이트 (변경된 문서만 재임베딩)")
     print("3. 통계 조회")
     print("4. 캐시 초기화")
+    print("5. 리뷰 파일 처리 (CSV/JSONL 스트림, 중단 시 이어서 처리)")
     
-    choice = input("\n선택 (1-4): ").strip()
+    choice = input("\n선택 (1-5): ").strip()
     
     if choice == "1":
         # 기존 지식베이스 사용
         bot.initialize_knowledge_base(force_update=False)
     elif choice == "2":
-        # 강제 업데이트
-        print("\n⚠️  경고: 새로운 문서를 크롤링하고 벡터 저장소를 재생성합니다.")
-        print("   OpenAI API 비용이 발생하며 시간이 오래 걸립니다.")
+        # 증분 업데이트
+        print("\n⚠️  경고: 새로운 문서를 크롤링하고 변경된 문서를 벡터 저장소에 반영합니다.")
+        print("   변경된 문서 양에 비례해 OpenAI API 비용이 발생합니다.")
         confirm = input("계속하시겠습니까? (y/N): ").strip().lower()
         if confirm == 'y':
             bot.update_knowledge_base()
@@ -189,6 +231,18 @@ def main():
         # 캐시 초기화
         bot.clear_cache()
         return
+    elif choice == "5":
+        # 리뷰 파일 스트림 처리
+        input_path = input("리뷰 파일 경로 (CSV/JSONL): ").strip()
+        if not os.path.exists(input_path):
+            print(f"파일을 찾을 수 없습니다: {input_path}")
+            return
+        output_path = input(f"응답 저장 경로 (기본: {Config.STREAM_OUTPUT_PATH}): ").strip() or None
+        
+        bot.initialize_knowledge_base(force_update=False)
+        summary = bot.process_review_file(input_path, output_path)
+        print(f"\n✅ 응답 {summary['responses']:,}개 저장: {summary['output_path']} (실패 {summary['failed']:,}개, {summary['elapsed_seconds']}초)")
+        return
     else:
         print("잘못된 선택입니다.")
         return
@@ -310,7 +364,7 @@ def main():
         print(response.response_text)
         print("-" * 40)
         print(f"📚 사용된 소스: {len(response.used_sources)}개")
-        
+    
     print(f"\n✅ 총 {len(responses)}개 응답 생성 완료!")
     
     # 벡터 저장소 정보 출력
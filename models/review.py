@@ -20,4 +20,5 @@ class ReviewResponse(BaseModel):
     generated_at: datetime
     country: str
     platform: str
-    used_sources: list[str] = []  # RAG에서 사용된 문서 소스들 
\ No newline at end of file
+    used_sources: list[str] = []  # RAG에서 사용된 문서 소스들
+    fallback: bool = False  # LLM 응답 생성 실패로 반환한 기본 응답 (캐시에 저장하지 않고 저널에는 실패로 기록)
@@ -1,5 +1,4 @@
 import schedule
-import time
 import threading
 from datetime import datetime
 from services.review_bot import ReviewBot
@@ -11,6 +10,7 @@ class UpdateScheduler:
         self.review_bot = review_bot
         self.is_running = False
         self.scheduler_thread = None
+        self._stop_event = threading.Event()
     
     def setup_schedule(self):
         """스케줄 설정"""
@@ -31,6 +31,7 @@ class UpdateScheduler:
             return
         
         self.is_running = True
+        self._stop_event.clear()
         self.scheduler_thread = threading.Thread(target=self._run_scheduler)
         self.scheduler_thread.daemon = True
         self.scheduler_thread.start()
@@ -40,6 +41,7 @@ class UpdateScheduler:
     def stop_scheduler(self):
         """스케줄러 중지"""
         self.is_running = False
+        self._stop_event.set()
         if self.scheduler_thread:
             self.scheduler_thread.join()
         
@@ -50,7 +52,7 @@ class UpdateScheduler:
         """스케줄러 실행"""
         while self.is_running:
             schedule.run_pending()
-            time.sleep(60)  # 1분마다 확인
+            self._stop_event.wait(60)  # 1분마다 확인 (중지 시 즉시 종료)
     
     def _update_knowledge_base(self):
         """지식베이스 업데이트 작업"""
@@ -65,9 +67,9 @@ class UpdateScheduler:
         """캐시 정리 작업"""
         try:
             print(f"[{datetime.now()}] 캐시 정리 시작")
-            # 현재는 간단히 통계만 출력
             stats = self.review_bot.get_statistics()
-            print(f"현재 캐시된 응답 수: {stats['total_responses']}")
+            print(f"현재 캐시된 응답 수: {stats['총 생성된 응답']}")
+            self.review_bot.compact_cache()
             print(f"[{datetime.now()}] 캐시 정리 완료")
         except Exception as e:
             print(f"[{datetime.now()}] 캐시 정리 오류: {e}") 
\ No newline at end of file
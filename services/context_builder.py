@@ -0,0 +1,159 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from config import Config
+from services.metrics import metrics
+
+class ContextBuilder:
+    """RAG 지식베이스 컨텍스트 구성 (플랫폼별 토큰 예산)
+
+    - 검색된 청크를 관련도 순으로 예산(CONTEXT_TOKEN_BUDGET)에 들어가는 만큼만 담음
+      (가장 관련 있는 청크 하나는 예산보다 길면 잘라서라도 포함)
+    - 같은 문서에서 나온 인접 청크의 겹치는 부분(CHUNK_OVERLAP)과 다른 청크에 포함된 청크는 제거
+    - 청크별 토큰 수는 청크 ID(content_hash)로 캐시
+    - 기존 방식(검색 결과 전체를 그대로 연결) 대비 토큰 수를 metrics에 기록
+    토큰 수는 tiktoken으로 계산하고, 인코딩을 불러올 수 없으면(오프라인 등) 글자 수로 추정합니다.
+    """
+    
+    # 겹침으로 판단하는 최소 글자 수
+    MIN_OVERLAP_CHARS = 20
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._token_counts: Dict[str, int] = {}  # 청크 ID → 토큰 수
+        self._encoding = None
+        self._encoding_loaded = False
+    
+    def build(self, docs: List[Document], platform: str) -> Tuple[List[Document], str, int]:
+        """(포함된 문서, 지식베이스 컨텍스트, 컨텍스트 토큰 수) 반환"""
+        budget = Config.CONTEXT_TOKEN_BUDGET.get(platform, min(Config.CONTEXT_TOKEN_BUDGET.values()))
+        selected: List[Document] = []
+        parts: List[str] = []
+        used_tokens = 0
+        baseline_tokens = 0
+        
+        for i, doc in enumerate(docs):
+            chunk_tokens = self._chunk_tokens(doc)
+            baseline_tokens += chunk_tokens + self.count_tokens(f"문서 {i+1}: ") + (2 if i else 0)
+            
+            text = self._strip_overlap(doc, selected)
+            if not text:
+                metrics.increment("context_chunks_deduplicated_total")
+                continue
+            
+            label = f"문서 {len(parts) + 1}: "
+            tokens = (chunk_tokens if text == doc.page_content else self.count_tokens(text)) + self.count_tokens(label) + (2 if parts else 0)
+            if used_tokens + tokens > budget:
+                if parts:
+                    metrics.increment("context_chunks_over_budget_total")
+                    continue
+                # 가장 관련 있는 청크는 예산에 맞춰 잘라서 포함
+                text = self._truncate(text, budget - self.count_tokens(label))
+                tokens = self.count_tokens(label + text)
+            
+            selected.append(doc)
+            parts.append(label + text)
+            used_tokens += tokens
+        
+        metrics.increment("context_builds_total")
+        metrics.increment("context_tokens_total", used_tokens)
+        metrics.increment("context_baseline_tokens_total", baseline_tokens)
+        return selected, "\n\n".join(parts), used_tokens
+    
+    def count_tokens(self, text: str) -> int:
+        encoding = self._get_encoding()
+        if encoding is None:
+            from services.rate_limiter import openai_rate_limiter
+            
+            return openai_rate_limiter.estimate_tokens(text)
+        return len(encoding.encode(text, disallowed_special=()))
+    
+    def _chunk_tokens(self, doc: Document) -> int:
+        """청크 본문의 토큰 수 (청크 ID 기준 캐시)"""
+        from services.vector_store import VectorStoreService
+        
+        chunk_id = VectorStoreService.chunk_hash(doc)
+        with self._lock:
+            tokens = self._token_counts.get(chunk_id)
+        if tokens is None:
+            tokens = self.count_tokens(doc.page_content)
+            with self._lock:
+                self._token_counts[chunk_id] = tokens
+        return tokens
+    
+    def _strip_overlap(self, doc: Document, selected: List[Document]) -> str:
+        """이미 담은 청크와 겹치는 부분을 뺀 본문 (완전히 포함되면 빈 문자열)"""
+        text = doc.page_content.strip()
+        source = doc.metadata.get('source')
+        
+        for other in selected:
+            other_text = other.page_content
+            if text in other_text:
+                return ""
+            if other.metadata.get('source') != source:
+                continue
+            
+            # 앞 청크의 끝 = 이 청크의 시작, 또는 이 청크의 끝 = 뒤 청크의 시작
+            overlap = self._overlap_length(other_text, text)
+            if overlap:
+                text = text[overlap:].lstrip()
+                continue
+            overlap = self._overlap_length(text, other_text)
+            if overlap:
+                text = text[:-overlap].rstrip()
+        
+        return text
+    
+    def _overlap_length(self, head: str, tail: str) -> int:
+        """head의 끝과 tail의 시작이 겹치는 글자 수 (MIN_OVERLAP_CHARS 미만이면 0)"""
+        longest = min(len(head), len(tail), Config.CHUNK_OVERLAP * 2)
+        for length in range(longest, self.MIN_OVERLAP_CHARS - 1, -1):
+            if head.endswith(tail[:length]):
+                return length
+        return 0
+    
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """토큰 수가 max_tokens 이하가 되도록 뒤를 자름"""
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return encoding.decode(encoding.encode(text, disallowed_special=())[:max(0, max_tokens)])
+        
+        while text and self.count_tokens(text) > max_tokens:
+            text = text[:int(len(text) * 0.9)]
+        return text
+    
+    def _get_encoding(self):
+        """LLM 모델의 tiktoken 인코딩 (불러올 수 없으면 None)"""
+        if self._encoding_loaded:
+            return self._encoding
+        
+        with self._lock:
+            if not self._encoding_loaded:
+                try:
+                    import tiktoken
+                    
+                    try:
+                        self._encoding = tiktoken.encoding_for_model(Config.LLM_MODEL)
+                    except KeyError:
+                        # 설치된 tiktoken이 모르는 모델은 cl100k_base로 계산
+                        self._encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    print(f"tiktoken 인코딩 로드 실패, 글자 수로 토큰을 추정합니다: {e}")
+                    self._encoding = None
+                self._encoding_loaded = True
+        return self._encoding
+    
+    @staticmethod
+    def savings() -> Optional[Dict]:
+        """기존 방식 대비 컨텍스트 토큰 절감량 (구성한 적이 없으면 None)"""
+        baseline = metrics.counters.get("context_baseline_tokens_total", 0)
+        if not metrics.counters.get("context_builds_total"):
+            return None
+        used = metrics.counters.get("context_tokens_total", 0)
+        return {
+            "builds": metrics.counters.get("context_builds_total", 0),
+            "context_tokens": used,
+            "baseline_tokens": baseline,
+            "saved_tokens": baseline - used,
+            "saved_ratio": (baseline - used) / baseline if baseline else 0.0
+        }
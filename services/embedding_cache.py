@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+from config import Config
+
+class EmbeddingCache:
+    """디스크 기반 임베딩 캐시 ((모델, sha256(텍스트)) → float32 벡터)
+
+    모델별 디렉터리에 다음 파일을 저장합니다.
+    - vectors.f32: float32 벡터를 행 단위로 이어 붙인 파일 (메모리 매핑으로 조회)
+    - keys.txt: 행 번호 순서의 텍스트 해시 목록 (한 줄에 하나)
+    - meta.json: 모델명과 벡터 차원
+    벡터를 먼저 쓰고 키를 나중에 쓰므로, 중간에 종료되어도 키가 있는 행은 항상 완전합니다.
+    추가·꼬리 정리는 파일 잠금(.lock, fcntl) 안에서 하고, 잠금을 잡은 뒤 다른 프로세스가 추가한 행을
+    먼저 반영하므로 데몬·스케줄러 등 여러 프로세스가 같은 캐시에 써도 벡터와 키의 행 번호가 어긋나지 않습니다.
+    
+    read_only=True(프로세스 풀 작업자)이면 새 벡터를 파일에 쓰지 않고 메모리에 보관하며(조회에도 사용),
+    take_pending()으로 꺼내 부모 프로세스가 저장합니다.
+    """
+    
+    def __init__(self, model: Optional[str] = None, cache_path: Optional[str] = None, read_only: bool = False):
+        self.model = model or Config.EMBEDDING_MODEL
+        self.cache_dir = os.path.join(cache_path or Config.EMBEDDING_CACHE_PATH, self.model.replace("/", "_"))
+        self.read_only = read_only
+        
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._row_count = 0  # keys.txt의 행 수 (= 다음 추가 위치)
+        self._keys_offset = 0  # 반영한 keys.txt 바이트 위치
+        self._dimension: Optional[int] = None
+        self._matrix = None  # np.memmap (행 수가 늘면 다시 매핑)
+        self._pending: Dict[str, List[float]] = {}  # 읽기 전용 모드에서 부모에게 넘길 새 벡터
+        
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def get_many(self, hashes: List[str]) -> Dict[str, List[float]]:
+        """캐시에 있는 해시의 벡터만 반환"""
+        with self._lock:
+            found = {h: self._pending[h] for h in hashes if h in self._pending}
+            rows = {h: self._rows[h] for h in hashes if h in self._rows}
+            if rows:
+                matrix = self._mapped_matrix()
+                found.update((h, matrix[row].tolist()) for h, row in rows.items())
+            return found
+    
+    def put_many(self, hashes: List[str], vectors: List[List[float]]):
+        """새 벡터를 파일 끝에 추가 (읽기 전용 모드는 메모리에 보관)"""
+        if not hashes:
+            return
+        if self.read_only:
+            with self._lock:
+                for h, v in zip(hashes, vectors):
+                    if h not in self._rows:
+                        self._pending.setdefault(h, list(v))
+            return
+        
+        import numpy as np
+        
+        with self._lock, self._file_lock():
+            # 다른 프로세스가 그사이 추가한 행을 먼저 반영해야 추가 위치가 맞음
+            self._sync_rows()
+            new_items = {}
+            for h, v in zip(hashes, vectors):
+                if h not in self._rows:
+                    new_items.setdefault(h, v)
+            if not new_items:
+                return
+            
+            array = np.asarray(list(new_items.values()), dtype=np.float32)
+            if self._dimension is None:
+                self._init_storage(array.shape[1])
+            if array.shape[1] != self._dimension:
+                print(f"임베딩 차원 불일치로 캐시 저장 생략: {array.shape[1]} != {self._dimension}")
+                return
+            
+            with open(self._vectors_path, 'ab') as f:
+                f.write(array.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            
+            with open(self._keys_path, 'a', encoding='utf-8') as f:
+                f.write("".join(f"{h}\n" for h in new_items))
+                f.flush()
+                os.fsync(f.fileno())
+                self._keys_offset = f.tell()
+            
+            for h in new_items:
+                self._rows[h] = self._row_count
+                self._row_count += 1
+    
+    def take_pending(self) -> Tuple[List[str], List[List[float]]]:
+        """읽기 전용 모드에서 보관한 새 벡터를 (해시 목록, 벡터 목록)으로 꺼내고 비움"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return list(pending.keys()), list(pending.values())
+    
+    def _sync_rows(self):
+        """다른 프로세스가 keys.txt에 추가한 행 반영 (_lock·파일 잠금 안에서 호출)"""
+        if not os.path.exists(self._keys_path):
+            return
+        with open(self._keys_path, 'r', encoding='utf-8') as f:
+            f.seek(self._keys_offset)
+            added = f.read()
+            self._keys_offset = f.tell()
+        if not added:
+            return
+        
+        if self._dimension is None:
+            with open(self._meta_path, 'r', encoding='utf-8') as f:
+                self._dimension = json.load(f)["dimension"]
+        for h in added.splitlines():
+            self._rows.setdefault(h, self._row_count)
+            self._row_count += 1
+    
+    @contextmanager
+    def _file_lock(self):
+        """캐시 디렉터리 단위 프로세스 간 배타 잠금 (fcntl이 없는 플랫폼은 프로세스 내 잠금만 사용)"""
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(os.path.join(self.cache_dir, ".lock"), 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.cache_dir, "vectors.f32")
+    
+    @property
+    def _keys_path(self) -> str:
+        return os.path.join(self.cache_dir, "keys.txt")
+    
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.cache_dir, "meta.json")
+    
+    def _init_storage(self, dimension: int):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._meta_path, 'w', encoding='utf-8') as f:
+            json.dump({"model": self.model, "dimension": dimension}, f)
+        self._dimension = dimension
+    
+    def _mapped_matrix(self):
+        import numpy as np
+        
+        if self._matrix is None or self._matrix.shape[0] < self._row_count:
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=np.float32, mode='r',
+                shape=(self._row_count, self._dimension)
+            )
+        return self._matrix
+    
+    def _load(self):
+        if not os.path.exists(self._meta_path):
+            return
+        
+        if self.read_only:
+            self._read_files()
+            return
+        # 꼬리 정리가 다른 프로세스의 진행 중인 추가를 잘라내지 않도록 파일 잠금 안에서
+        with self._file_lock():
+            self._read_files()
+    
+    def _read_files(self):
+        try:
+            with open(self._meta_path, 'r', encoding='utf-8') as f:
+                self._dimension = json.load(f)["dimension"]
+            
+            row_bytes = self._dimension * 4
+            complete_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+            
+            keys = []
+            if os.path.exists(self._keys_path):
+                with open(self._keys_path, 'r', encoding='utf-8') as f:
+                    # 마지막 줄이 잘린 경우(줄바꿈 없음)는 무시
+                    keys = [line[:-1] for line in f if line.endswith("\n")]
+            
+            rows = min(len(keys), complete_rows)
+            self._rows = {}
+            for i, h in enumerate(keys[:rows]):
+                self._rows.setdefault(h, i)
+            self._row_count = rows
+            
+            # 키가 기록되지 않은 꼬리 벡터/키는 잘라내어 다음 추가 위치를 맞춤
+            if not self.read_only:
+                if os.path.exists(self._vectors_path) and os.path.getsize(self._vectors_path) != rows * row_bytes:
+                    with open(self._vectors_path, 'r+b') as f:
+                        f.truncate(rows * row_bytes)
+                if len(keys) != rows or self._keys_file_has_partial_line():
+                    with open(self._keys_path, 'w', encoding='utf-8') as f:
+                        f.write("".join(f"{h}\n" for h in keys[:rows]))
+                self._keys_offset = os.path.getsize(self._keys_path) if os.path.exists(self._keys_path) else 0
+        except Exception as e:
+            print(f"임베딩 캐시 로드 실패: {e}")
+            self._rows = {}
+            self._row_count = 0
+            self._keys_offset = 0
+            self._dimension = None
+    
+    def _keys_file_has_partial_line(self) -> bool:
+        if not os.path.exists(self._keys_path) or os.path.getsize(self._keys_path) == 0:
+            return False
+        with open(self._keys_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+
+class CachedEmbeddings(Embeddings):
+    """EmbeddingCache를 거쳐 캐시에 없는 텍스트만 실제 임베딩 클라이언트로 요청하는 래퍼"""
+    
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.stats = {"hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [self.cache.text_hash(text) for text in texts]
+        found = self.cache.get_many(hashes)
+        
+        # 캐시에 없는 텍스트는 중복 제거 후 한 번에 요청
+        missing = {}
+        for h, text in zip(hashes, texts):
+            if h not in found and h not in missing:
+                missing[h] = text
+        
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            self.cache.put_many(list(missing.keys()), vectors)
+            found.update(zip(missing.keys(), vectors))
+        
+        with self._stats_lock:
+            self.stats["hits"] += len(texts) - len(missing)
+            self.stats["misses"] += len(missing)
+        
+        return [found[h] for h in hashes]
+    
+    def is_cached(self, texts: List[str]) -> List[bool]:
+        """텍스트별로 캐시에 임베딩이 있는지 (API 호출 없음)"""
+        hashes = [self.cache.text_hash(text) for text in texts]
+        found = self.cache.get_many(hashes)
+        return [h in found for h in hashes]
+    
+    def embed_query(self, text: str) -> List[float]:
+        h = self.cache.text_hash(text)
+        found = self.cache.get_many([h])
+        if h in found:
+            with self._stats_lock:
+                self.stats["hits"] += 1
+            return found[h]
+        
+        vector = self.embeddings.embed_query(text)
+        self.cache.put_many([h], [vector])
+        with self._stats_lock:
+            self.stats["misses"] += 1
+        return vector
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional
+from langchain_core.embeddings import Embeddings
+from config import Config
+from models.review import Review
+
+if TYPE_CHECKING:
+    from services.response_cache import ResponseCacheStore
+
+class ExampleStore:
+    """Few-shot 답변 예시 저장소 (리뷰 → 답변 예시 임베딩 인덱스)
+
+    예시 출처:
+    - KR/US 리뷰 케이스 CSV의 실제 리뷰·답변
+    - 응답 생성 프롬프트에 쓰던 실제 답변 예시 (utils.review_cases.PROMPT_EXAMPLES)
+    - 응답 캐시에서 승인(approve)된 답변
+    인덱스(FAISS 내적, 정규화 벡터)와 예시 목록을 디스크에 저장해 두고, 출처 지문(CSV 크기·수정 시각,
+    승인 목록)이 같으면 그대로 불러옵니다. 출처가 바뀌면 바뀐 예시만 임베딩하여 추가/삭제합니다.
+    read_only=True이면 저장된 인덱스를 불러오기만 하고 갱신하지 않습니다 (프로세스 풀 작업자).
+    새 예시 임베딩에 실패하면(API 오류·오프라인) 그 예시 없이 계속 진행하고 refresh_error에 오류를 남깁니다.
+    """
+    
+    def __init__(self, embeddings: Embeddings, response_cache: Optional["ResponseCacheStore"] = None,
+                 store_path: Optional[str] = None, read_only: bool = False):
+        self.embeddings = embeddings
+        self.response_cache = response_cache
+        self.store_path = store_path or Config.EXAMPLE_STORE_PATH
+        self.read_only = read_only
+        
+        self._lock = threading.RLock()
+        self._index = None
+        self._examples: Dict[int, Dict] = {}  # 인덱스 ID → 예시
+        self._next_id = 0
+        self._fingerprint = None
+        self.refresh_error: Optional[str] = None  # 마지막 갱신의 임베딩 오류 (다음 refresh()까지 재시도하지 않음)
+        
+        self._load()
+        if not read_only and self._fingerprint != self._source_fingerprint():
+            self.refresh()
+    
+    def __len__(self) -> int:
+        return len(self._examples)
+    
+    def search(self, review: Review, k: Optional[int] = None) -> List[Dict]:
+        """리뷰와 가장 가까운 같은 국가의 예시 최대 k개 (FEW_SHOT_MIN_SIMILARITY 미만 제외)"""
+        import numpy as np
+        
+        k = k or Config.FEW_SHOT_K
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return []
+        
+        vector = self._normalize(self.embeddings.embed_query(review.content))
+        with self._lock:
+            # 다른 국가 예시를 걸러낼 수 있도록 넉넉히 검색
+            similarities, ids = self._index.search(
+                np.asarray([vector], dtype=np.float32), min(self._index.ntotal, k * 4)
+            )
+            results = []
+            for similarity, example_id in zip(similarities[0], ids[0]):
+                example = self._examples.get(int(example_id))
+                if example is None or example["country"] != review.country.upper():
+                    continue
+                if similarity < Config.FEW_SHOT_MIN_SIMILARITY:
+                    break
+                results.append(dict(example, similarity=float(similarity)))
+                if len(results) >= k:
+                    break
+        return results
+    
+    def refresh(self) -> Dict[str, int]:
+        """출처에서 예시를 다시 모아 바뀐 예시만 반영하고 저장 (추가/삭제/유지/임베딩 실패 수 반환)"""
+        import numpy as np
+        
+        fingerprint = self._source_fingerprint()
+        examples = {self._example_key(example): example for example in self._collect_examples()}
+        
+        with self._lock:
+            existing = {example["key"]: example_id for example_id, example in self._examples.items()}
+            removed = [example_id for key, example_id in existing.items() if key not in examples]
+            added = [key for key in examples if key not in existing]
+        
+        # 임베딩은 잠금 밖에서 (임베딩 캐시에 있으면 API 호출 없음)
+        vectors = []
+        failed = 0
+        if added:
+            texts = [self._embedding_text(examples[key]) for key in added]
+            try:
+                vectors = [self._normalize(vector) for vector in self.embeddings.embed_documents(texts)]
+                self.refresh_error = None
+            except Exception as e:
+                # 새 예시 없이 계속 (삭제는 반영, 지문은 그대로 두어 다음 실행에서 다시 임베딩)
+                print(f"답변 예시 임베딩 오류 (새 예시 {len(added)}개 제외): {e}")
+                self.refresh_error = str(e)
+                failed = len(added)
+                added = []
+                fingerprint = self._fingerprint
+        
+        with self._lock:
+            if removed:
+                self._index.remove_ids(np.asarray(removed, dtype=np.int64))
+                for example_id in removed:
+                    del self._examples[example_id]
+            
+            if added:
+                self._ensure_index(len(vectors[0]))
+                ids = list(range(self._next_id, self._next_id + len(added)))
+                self._next_id += len(added)
+                self._index.add_with_ids(np.asarray(vectors, dtype=np.float32), np.asarray(ids, dtype=np.int64))
+                for example_id, key in zip(ids, added):
+                    self._examples[example_id] = dict(examples[key], key=key)
+            
+            self._fingerprint = fingerprint
+            self._save()
+        
+        result = {"added": len(added), "removed": len(removed), "unchanged": len(examples) - len(added) - failed, "failed": failed}
+        if added or removed:
+            print(f"답변 예시 저장소 갱신: 추가 {result['added']}개, 삭제 {result['removed']}개, 유지 {result['unchanged']}개")
+        return result
+    
+    def _collect_examples(self) -> List[Dict]:
+        from utils.review_cases import load_prompt_examples, load_review_cases
+        
+        examples = [dict(case, source="case_csv") for case in load_review_cases() if case["response"]]
+        examples.extend(dict(example, source="prompt") for example in load_prompt_examples())
+        
+        if self.response_cache is not None:
+            for data in self.response_cache.approved_values():
+                if not data.get("review_content") or not data.get("response_text"):
+                    continue
+                examples.append({
+                    "country": str(data.get("country") or "").upper(),
+                    "case": data.get("category") or "",
+                    "category": data.get("category"),
+                    "review": data["review_content"],
+                    "response": data["response_text"],
+                    "source": "approved"
+                })
+        return examples
+    
+    def _source_fingerprint(self) -> str:
+        """예시 출처가 바뀌었는지 판단하는 지문 (CSV 크기·수정 시각, 승인된 캐시 키, 프롬프트 예시)"""
+        from utils.review_cases import PROMPT_EXAMPLES
+        
+        parts = [json.dumps(PROMPT_EXAMPLES, ensure_ascii=False)]
+        for country, file_path in sorted(Config.REVIEW_CASE_FILES.items()):
+            if os.path.exists(file_path):
+                parts.append(f"{country}:{os.path.getsize(file_path)}:{os.path.getmtime(file_path)}")
+        if self.response_cache is not None:
+            parts.extend(self.response_cache.approved_keys())
+        return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _example_key(example: Dict) -> str:
+        content = f"{example['country']}\n{example['review']}\n{example['response']}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _embedding_text(example: Dict) -> str:
+        """리뷰 원문으로 검색 (원문이 없는 프롬프트 예시는 케이스명 + 답변)"""
+        return example["review"] or f"{example['case']}: {example['response']}"
+    
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.store_path, "index.faiss")
+    
+    @property
+    def _examples_path(self) -> str:
+        return os.path.join(self.store_path, "examples.json")
+    
+    def _ensure_index(self, dimension: int):
+        if self._index is None:
+            import faiss
+            self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+    
+    @staticmethod
+    def _normalize(vector) -> list:
+        import numpy as np
+        
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return (array / norm if norm else array).tolist()
+    
+    def _save(self):
+        """인덱스와 예시 목록을 임시 파일에 쓴 뒤 교체 (_lock 안에서 호출)"""
+        import faiss
+        
+        os.makedirs(self.store_path, exist_ok=True)
+        if self._index is not None:
+            faiss.write_index(self._index, f"{self._index_path}.tmp")
+            os.replace(f"{self._index_path}.tmp", self._index_path)
+        with open(f"{self._examples_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({
+                "fingerprint": self._fingerprint,
+                "next_id": self._next_id,
+                "examples": [[example_id, example] for example_id, example in self._examples.items()]
+            }, f, ensure_ascii=False)
+        os.replace(f"{self._examples_path}.tmp", self._examples_path)
+    
+    def _load(self):
+        if not (os.path.exists(self._index_path) and os.path.exists(self._examples_path)):
+            return
+        
+        try:
+            import faiss
+            
+            with open(self._examples_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            self._index = faiss.read_index(self._index_path)
+            self._next_id = saved["next_id"]
+            self._examples = {int(example_id): example for example_id, example in saved["examples"]}
+            self._fingerprint = saved["fingerprint"]
+        except Exception as e:
+            print(f"답변 예시 저장소 로드 실패: {e}")
+            self._index = None
+            self._examples = {}
+            self._next_id = 0
+            self._fingerprint = None
@@ -0,0 +1,129 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from langchain.docstore.document import Document
+from config import Config
+
+# 저장소 버전 디렉터리 안의 파일명
+LEXICAL_INDEX_FILE = "lexical_index.json"
+LEXICAL_INDEX_VERSION = 1
+
+HANGUL_RUN = re.compile(r"[가-힣]+")
+LATIN_TOKEN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """한글은 음절 2-gram(한 글자 단어는 그대로), 영문·숫자는 소문자 단어 단위로 분리
+
+    띄어쓰기가 달라도("초대코드" / "초대 코드") 같은 토큰이 나오도록 한글은 n-gram을 사용합니다.
+    """
+    text = text.lower()
+    tokens = [token for token in LATIN_TOKEN.findall(text) if len(token) > 1 or token.isdigit()]
+    for run in HANGUL_RUN.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+class LexicalIndex:
+    """BM25 역색인 (벡터 저장소 버전 디렉터리에 함께 저장)
+
+    문서는 FAISS 저장소의 docstore ID로 식별하므로 검색 결과를 같은 docstore에서 바로 꺼낼 수 있습니다.
+    임베딩 API 호출 없이 로컬에서 검색하며, confidence()로 밀집 검색을 생략해도 될지 판단합니다.
+    """
+    
+    def __init__(self, doc_ids: List[str], doc_lengths: List[int], postings: Dict[str, List[List[int]]]):
+        self.doc_ids = doc_ids
+        self.doc_lengths = doc_lengths
+        self.postings = postings  # 토큰 → [[문서 위치, 빈도], ...]
+        self.avg_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+        self._idf = {
+            term: math.log(1 + (len(doc_ids) - len(entries) + 0.5) / (len(entries) + 0.5))
+            for term, entries in postings.items()
+        }
+    
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+    
+    @classmethod
+    def build(cls, docs: List[Tuple[str, Document]]) -> "LexicalIndex":
+        """(docstore ID, 문서) 목록으로 색인 생성"""
+        doc_ids, doc_lengths = [], []
+        postings: Dict[str, List[List[int]]] = {}
+        for position, (doc_id, doc) in enumerate(docs):
+            counts = Counter(tokenize(doc.page_content))
+            doc_ids.append(doc_id)
+            doc_lengths.append(sum(counts.values()))
+            for term, frequency in counts.items():
+                postings.setdefault(term, []).append([position, frequency])
+        return cls(doc_ids, doc_lengths, postings)
+    
+    @classmethod
+    def from_store(cls, store) -> "LexicalIndex":
+        """FAISS 저장소의 docstore 전체로 색인 생성 (색인 파일이 없는 이전 버전 저장소용)"""
+        docs = []
+        for doc_id in store.index_to_docstore_id.values():
+            doc = store.docstore.search(doc_id)
+            if isinstance(doc, Document):
+                docs.append((doc_id, doc))
+        return cls.build(docs)
+    
+    @classmethod
+    def load(cls, store_path: str) -> Optional["LexicalIndex"]:
+        """저장소 디렉터리의 색인 파일 로드 (없거나 형식이 다르면 None)"""
+        path = os.path.join(store_path, LEXICAL_INDEX_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get("version") != LEXICAL_INDEX_VERSION:
+            return None
+        return cls(saved["doc_ids"], saved["doc_lengths"], saved["postings"])
+    
+    def save(self, store_path: str):
+        path = os.path.join(store_path, LEXICAL_INDEX_FILE)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": LEXICAL_INDEX_VERSION,
+                "doc_ids": self.doc_ids,
+                "doc_lengths": self.doc_lengths,
+                "postings": self.postings
+            }, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+    
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """BM25 상위 k개 (docstore ID, 점수)"""
+        k1, b = Config.BM25_K1, Config.BM25_B
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for position, frequency in self.postings[term]:
+                norm = k1 * (1 - b + b * self.doc_lengths[position] / self.avg_length)
+                scores[position] = scores.get(position, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+        
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.doc_ids[position], score) for position, score in ranked]
+    
+    def confidence(self, query: str, results: List[Tuple[str, float]]) -> float:
+        """BM25 1위 결과의 신뢰도 (0~1)
+
+        1위 점수 / 질의 토큰 IDF 합(평균 길이 문서에 색인된 질의 토큰이 모두 한 번씩 나올 때의 점수)에
+        질의 토큰 중 색인에 있는 토큰의 비율을 곱한 값입니다. 질의 대부분이 지식베이스 용어일 때만 높고,
+        2위와의 점수 차가 BM25_SKIP_MARGIN배 미만이면 결과가 뚜렷하지 않으므로 0입니다.
+        """
+        if not results:
+            return 0.0
+        if len(results) > 1 and results[0][1] < results[1][1] * Config.BM25_SKIP_MARGIN:
+            return 0.0
+        
+        terms = set(tokenize(query))
+        known = [term for term in terms if term in self._idf]
+        ideal = sum(self._idf[term] for term in known)
+        if not ideal:
+            return 0.0
+        return min(1.0, results[0][1] / ideal) * len(known) / len(terms)
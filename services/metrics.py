@@ -0,0 +1,231 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import Config
+
+def _nearest_rank(sorted_samples: List[float], q: float) -> float:
+    """정렬된 샘플의 q 분위수 (nearest-rank 방식)"""
+    return sorted_samples[max(0, math.ceil(q * len(sorted_samples)) - 1)]
+
+
+class MetricsRegistry:
+    """리뷰 처리 파이프라인 계측 (단계별 지연 시간, 토큰 사용량, 캐시 적중/미적중)
+
+    - 단계별 지연 시간은 최근 N개 샘플로 p50/p95/p99를 계산
+    - 카운터는 프로세스 시작 이후 누적값
+    - Prometheus 텍스트 파일(node_exporter textfile 수집기용)과 JSONL 트레이스로 내보내기
+    """
+    
+    def __init__(self, max_samples: Optional[int] = None, trace_path: Optional[str] = None):
+        self.max_samples = max_samples or Config.METRICS_MAX_SAMPLES
+        self.trace_path = trace_path or Config.METRICS_TRACE_PATH
+        
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._totals: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])  # 단계 → [횟수, 합계(초)]
+        self.counters: Dict[str, int] = defaultdict(int)
+    
+    @contextmanager
+    def span(self, stage: str, **attributes):
+        """with 블록의 실행 시간을 stage 단계로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **attributes)
+    
+    def observe(self, stage: str, seconds: float, **attributes):
+        with self._lock:
+            self._samples[stage].append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += seconds
+        
+        if self.trace_path:
+            self._write_trace({"stage": stage, "duration_ms": round(seconds * 1000, 3), **attributes})
+    
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+    
+    def record_llm_usage(self, stage: str, prompt_tokens: int, completion_tokens: int,
+                         cached_tokens: int = 0, estimated: bool = False):
+        """LLM 호출 1회의 토큰 사용량 기록
+
+        cached_tokens: 프롬프트 캐시에서 재사용된 프롬프트 토큰 수 (prompt_tokens에 포함)
+        estimated: API 응답에 사용량이 없어 추정한 경우
+        """
+        with self._lock:
+            self.counters["llm_calls_total"] += 1
+            self.counters["llm_prompt_tokens_total"] += prompt_tokens
+            self.counters["llm_prompt_cached_tokens_total"] += cached_tokens
+            self.counters["llm_completion_tokens_total"] += completion_tokens
+            self.counters[f"llm_{stage}_prompt_tokens_total"] += prompt_tokens
+            self.counters[f"llm_{stage}_prompt_cached_tokens_total"] += cached_tokens
+            self.counters[f"llm_{stage}_completion_tokens_total"] += completion_tokens
+            if cached_tokens:
+                self.counters["llm_prompt_cache_hits_total"] += 1
+            if estimated:
+                self.counters["llm_usage_estimated_total"] += 1
+    
+    def cached_prompt_ratio(self) -> Optional[float]:
+        """전체 프롬프트 토큰 중 프롬프트 캐시에서 재사용된 비율, 호출이 없으면 None"""
+        prompt_tokens = self.counters.get("llm_prompt_tokens_total", 0)
+        return self.counters.get("llm_prompt_cached_tokens_total", 0) / prompt_tokens if prompt_tokens else None
+    
+    def hit_rate(self, name: str) -> Optional[float]:
+        """{name}_hits_total / ({name}_hits_total + {name}_misses_total), 조회가 없으면 None"""
+        hits = self.counters.get(f"{name}_hits_total", 0)
+        misses = self.counters.get(f"{name}_misses_total", 0)
+        return hits / (hits + misses) if hits + misses else None
+    
+    def percentiles(self, stage: str) -> Dict[str, float]:
+        """단계별 횟수와 p50/p95/p99/평균 (밀리초)"""
+        with self._lock:
+            samples = sorted(self._samples.get(stage, ()))
+            count, total = self._totals.get(stage, (0, 0.0))
+        
+        if not samples:
+            return {"count": 0}
+        
+        return {
+            "count": count,
+            "p50": round(_nearest_rank(samples, 0.50) * 1000, 2),
+            "p95": round(_nearest_rank(samples, 0.95) * 1000, 2),
+            "p99": round(_nearest_rank(samples, 0.99) * 1000, 2),
+            "mean": round(total / count * 1000, 2)
+        }
+    
+    def summary(self) -> Dict:
+        with self._lock:
+            stages = list(self._totals.keys())
+            counters = dict(self.counters)
+        return {
+            "stages": {stage: self.percentiles(stage) for stage in stages},
+            "counters": counters
+        }
+    
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self.counters.clear()
+    
+    def export_state(self) -> Dict:
+        """다른 프로세스로 보낼 현재 샘플·합계·카운터 (작업자 프로세스 → 부모 합산용)"""
+        with self._lock:
+            return {
+                "samples": {stage: list(samples) for stage, samples in self._samples.items()},
+                "totals": {stage: list(totals) for stage, totals in self._totals.items()},
+                "counters": dict(self.counters)
+            }
+    
+    def merge_state(self, state: Dict):
+        """export_state() 결과를 이 레지스트리에 더함"""
+        with self._lock:
+            for stage, samples in state["samples"].items():
+                self._samples[stage].extend(samples)
+            for stage, (count, total) in state["totals"].items():
+                totals = self._totals[stage]
+                totals[0] += count
+                totals[1] += total
+            for name, amount in state["counters"].items():
+                self.counters[name] += amount
+    
+    def write_prometheus(self, path: Optional[str] = None):
+        """Prometheus 텍스트 형식으로 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = path or Config.METRICS_PROMETHEUS_PATH
+        if not path:
+            return
+        
+        lines = [
+            "# HELP reviewbot_stage_duration_seconds Review pipeline stage latency.",
+            "# TYPE reviewbot_stage_duration_seconds summary"
+        ]
+        with self._lock:
+            stages = {stage: (sorted(self._samples[stage]), tuple(totals)) for stage, totals in self._totals.items()}
+            counters = dict(self.counters)
+        
+        for stage, (samples, (count, total)) in sorted(stages.items()):
+            for q in (0.5, 0.95, 0.99):
+                if samples:
+                    lines.append(f'reviewbot_stage_duration_seconds{{stage="{stage}",quantile="{q}"}} {_nearest_rank(samples, q):.6f}')
+            lines.append(f'reviewbot_stage_duration_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'reviewbot_stage_duration_seconds_count{{stage="{stage}"}} {count}')
+        
+        for name, value in sorted(counters.items()):
+            lines.append(f"# TYPE reviewbot_{name} counter")
+            lines.append(f"reviewbot_{name} {value}")
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(f"{path}.tmp", path)
+    
+    def _write_trace(self, record: Dict):
+        record = {"timestamp": datetime.now().isoformat(), **record}
+        try:
+            with self._lock:
+                with open(self.trace_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except Exception as e:
+            print(f"트레이스 기록 실패: {e}")
+
+
+def _usage_callback():
+    """LLM 응답의 usage(프롬프트 캐시 토큰 포함)를 모으는 콜백 핸들러"""
+    from langchain_core.callbacks import BaseCallbackHandler
+    
+    class LLMUsageCallback(BaseCallbackHandler):
+        def __init__(self):
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.cached_tokens = 0
+        
+        def on_llm_end(self, response, **kwargs):
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            details = token_usage.get("prompt_tokens_details") or {}
+            self.prompt_tokens += token_usage.get("prompt_tokens") or 0
+            self.completion_tokens += token_usage.get("completion_tokens") or 0
+            self.cached_tokens += details.get("cached_tokens") or 0
+    
+    return LLMUsageCallback()
+
+
+def invoke_llm(llm, messages: list, estimated_tokens: int, stage: str = "generation"):
+    """공용 RateLimiter를 거쳐 LLM을 호출하고 지연 시간과 토큰 사용량 기록
+
+    토큰 수는 OpenAI 응답의 usage(prompt_tokens_details.cached_tokens 포함)를 사용하고,
+    없으면 글자 수로 추정합니다.
+    """
+    from services.rate_limiter import openai_rate_limiter
+    
+    usage = _usage_callback()
+    with metrics.span(f"llm_{stage}"):
+        result = openai_rate_limiter.call(
+            llm.invoke, messages, config={"callbacks": [usage]},
+            estimated_tokens=estimated_tokens
+        )
+    
+    if usage.prompt_tokens or usage.completion_tokens:
+        metrics.record_llm_usage(stage, usage.prompt_tokens, usage.completion_tokens, cached_tokens=usage.cached_tokens)
+    else:
+        metrics.record_llm_usage(
+            stage,
+            openai_rate_limiter.estimate_tokens(*(str(message.content) for message in messages)),
+            openai_rate_limiter.estimate_tokens(str(result.content)),
+            estimated=True
+        )
+    return result
+
+
+# 리뷰봇·응답 생성기·분류기가 함께 사용하는 공용 계측
+metrics = MetricsRegistry()
@@ -0,0 +1,204 @@
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from config import Config
+from models.review import Review, ReviewResponse
+from services.metrics import metrics
+
+if TYPE_CHECKING:
+    from services.review_bot import ReviewBot
+    from services.run_journal import RunJournal
+
+# 작업자 프로세스의 읽기 전용 ReviewBot (_init_worker에서 생성)
+_worker_bot: Optional["ReviewBot"] = None
+_worker_threads = 1
+
+def _init_worker(fused_mode: bool, threads: int, processes: int):
+    """작업자 프로세스 초기화 (디스크의 벡터 저장소·캐시에 읽기 전용으로 연결)"""
+    global _worker_bot, _worker_threads
+    from services.rate_limiter import openai_rate_limiter
+    from services.review_bot import ReviewBot
+    
+    # OpenAI 요청/토큰 한도와 동시 실행 수는 모든 작업자가 나눠 씀
+    openai_rate_limiter.configure(
+        requests_per_minute=max(1, Config.OPENAI_REQUESTS_PER_MINUTE // processes),
+        tokens_per_minute=max(1, Config.OPENAI_TOKENS_PER_MINUTE // processes),
+        max_concurrency=max(1, Config.OPENAI_MAX_CONCURRENCY // processes)
+    )
+    
+    bot = ReviewBot(fused_mode=fused_mode, read_only=True)
+    for country in Config.COUNTRIES:
+        bot.vector_store_service.load_existing_store(country.lower())
+    bot.response_generator  # 프롬프트 체인을 첫 리뷰 전에 생성
+    
+    _worker_bot = bot
+    _worker_threads = threads
+
+def _process_chunk(chunk: List[Tuple[int, Review]]) -> Tuple[List[Tuple[int, Optional[ReviewResponse], Optional[str]]], List[tuple], Tuple[List[str], List[List[float]]], Dict[str, int], Dict]:
+    """작업자 프로세스에서 리뷰 묶음 처리
+    
+    → (리뷰별 결과, 부모가 저장할 캐시 쓰기, 부모가 저장할 새 임베딩, 분류 단계별 처리량, 계측 값)
+    """
+    bot = _worker_bot
+    # 묶음마다 계측을 비우고 끝에 부모로 보냄 (작업자 프로세스는 한 번에 한 묶음만 처리)
+    metrics.reset()
+    
+    reviews = [review for _, review in chunk]
+    with metrics.span("retrieval_batch", reviews=len(reviews)):
+        contexts = bot._prefetch_contexts(reviews)
+    
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=_worker_threads) as executor:
+        futures = {
+            executor.submit(bot.process_review, review, contexts.get(j)): i
+            for j, (i, review) in enumerate(chunk)
+        }
+        for future in as_completed(futures):
+            try:
+                outcomes.append((futures[future], future.result(), None))
+            except Exception as e:
+                outcomes.append((futures[future], None, str(e)))
+    
+    tier_counts = bot._review_classifier.take_tier_counts() if bot._review_classifier is not None else {}
+    embeddings = bot.vector_store_service.embeddings.cache.take_pending()
+    return outcomes, bot.take_pending_writes(), embeddings, tier_counts, metrics.export_state()
+
+
+class ProcessPoolBatchRunner:
+    """프로세스 풀 일괄 처리기 (FAISS 검색·프롬프트 구성·JSON 처리 등 CPU 작업을 GIL 밖으로 분산)
+
+    - 작업자: 디스크의 벡터 저장소(IVF 인덱스는 메모리 매핑), 응답 캐시(SQLite mode=ro),
+      임베딩 캐시, 답변 예시 저장소, 유사 캐시에 읽기 전용으로 연결
+    - 부모: 작업자 시작 전 리뷰 임베딩을 한 번에 계산해 임베딩 캐시에 저장하고,
+      작업자가 돌려준 응답·새 임베딩을 응답 캐시·유사 캐시·임베딩 캐시·실행 저널에 혼자 기록 (단일 작성자)
+    - 리뷰는 묶음(BATCH_PROCESS_CHUNK_SIZE)으로 보내며, 작업자는 묶음 단위로 국가별 일괄 검색 후 스레드로 처리
+    - 응답 캐시 적중은 부모가 바로 처리하고, 같은 캐시 키의 리뷰는 한 번만 보내 그 응답을 재사용
+      (작업자는 부모의 미커밋 쓰기를 볼 수 없음)
+    실행 저널에는 응답 생성 완료/실패만 기록합니다 (분류 단계 기록은 단일 프로세스 모드에서만).
+    """
+    
+    def __init__(self, bot: "ReviewBot", processes: Optional[int] = None, threads_per_process: Optional[int] = None):
+        self.bot = bot
+        self.processes = processes or Config.BATCH_PROCESSES
+        self.threads_per_process = threads_per_process or Config.BATCH_MAX_WORKERS
+    
+    def run(self, reviews: List[Review], journal: Optional["RunJournal"] = None) -> List[Optional[ReviewResponse]]:
+        """입력 순서의 응답 목록 반환 (실패한 리뷰는 None)"""
+        results: List[Optional[ReviewResponse]] = [None] * len(reviews)
+        pending: List[Tuple[int, Review]] = []
+        duplicates: Dict[int, int] = {}  # 리뷰 인덱스 → 같은 캐시 키로 보낸 리뷰 인덱스
+        first_by_key: Dict[str, int] = {}
+        
+        for i, review in enumerate(reviews):
+            cache_key = self.bot._generate_cache_key(review)
+            if journal is not None:
+                from services.run_journal import GENERATED
+                
+                entry = journal.get(review.id, cache_key)
+                if entry is not None and entry["state"] == GENERATED:
+                    print(f"저널에 기록된 응답 사용: {review.id}")
+                    results[i] = ReviewResponse(**entry["response"])
+                    continue
+                if journal.is_exhausted(entry):
+                    print(f"리뷰 처리 오류 {review.id}: 재시도 한도 초과 ({entry['attempts']}회): {entry['error']}")
+                    continue
+            
+            if cache_key in first_by_key:
+                duplicates[i] = first_by_key[cache_key]
+                continue
+            if cache_key in self.bot.response_cache:
+                # 캐시 적중은 작업자를 거치지 않고 바로 처리
+                results[i] = self.bot.process_review(review, journal=journal)
+                continue
+            first_by_key[cache_key] = i
+            pending.append((i, review))
+        
+        if pending:
+            with metrics.span("process_pool_prepare", reviews=len(pending)):
+                self._prepare(pending)
+            self._run_pool(reviews, pending, results, journal)
+        
+        for i, first in duplicates.items():
+            review = reviews[i]
+            if results[first] is None:
+                if journal is not None:
+                    journal.mark_failed(review.id, self.bot._generate_cache_key(review), "같은 내용의 리뷰 처리 실패")
+                continue
+            metrics.increment("response_cache_hits_total")
+            metrics.increment("reviews_processed_total")
+            results[i] = ReviewResponse(**{**results[first].dict(), "review_id": review.id})
+            if journal is not None:
+                self._journal_response(journal, review, results[i])
+        
+        return results
+    
+    def _journal_response(self, journal: "RunJournal", review: Review, response: ReviewResponse):
+        """작업자가 돌려준 응답을 저널에 기록 (기본 응답은 실패로 기록하여 다음 실행에서 재시도)"""
+        content_key = self.bot._generate_cache_key(review)
+        if response.fallback:
+            journal.mark_failed(review.id, content_key, "응답 생성 실패 (기본 응답 반환)")
+        else:
+            journal.mark_generated(review.id, content_key, response.dict())
+    
+    def _merge_worker_state(self, embeddings: Tuple[List[str], List[List[float]]], tier_counts: Dict[str, int]):
+        """작업자가 새로 계산한 임베딩을 캐시에 저장하고 분류 단계별 처리량 합산"""
+        self.bot.vector_store_service.embeddings.cache.put_many(*embeddings)
+        if any(tier_counts.values()):
+            self.bot.review_classifier.merge_tier_counts(tier_counts)
+    
+    def _prepare(self, pending: List[Tuple[int, Review]]):
+        """작업자 시작 전 공유 상태를 디스크에 반영 (작업자는 읽기만 함)"""
+        bot = self.bot
+        # 캐시에 없는 리뷰 임베딩을 한 번에 요청 (작업자의 검색·유사 캐시 조회·로컬 분류가 임베딩 캐시에서 재사용)
+        bot.vector_store_service.embeddings.embed_documents([review.content for _, review in pending])
+        
+        # 답변 예시 저장소 갱신·유사 캐시 저장·응답 캐시 커밋
+        bot.example_store
+        if bot.semantic_cache is not None:
+            bot.semantic_cache.save()
+        bot.response_cache.flush()
+    
+    def _run_pool(self, reviews: List[Review], pending: List[Tuple[int, Review]],
+                  results: List[Optional[ReviewResponse]], journal: Optional["RunJournal"]):
+        # 작업자 수보다 묶음이 적어 노는 작업자가 없도록 묶음 크기 조정
+        chunk_size = max(1, min(Config.BATCH_PROCESS_CHUNK_SIZE, math.ceil(len(pending) / self.processes)))
+        chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+        done = 0
+        
+        with ProcessPoolExecutor(
+            max_workers=min(self.processes, len(chunks)),
+            mp_context=multiprocessing.get_context(Config.BATCH_PROCESS_START_METHOD),
+            initializer=_init_worker,
+            initargs=(self.bot.fused_mode, self.threads_per_process, self.processes)
+        ) as executor:
+            futures = {executor.submit(_process_chunk, chunk): chunk for chunk in chunks}
+            
+            # 캐시 쓰기는 배치 종료 시 한 번만 커밋
+            with self.bot.response_cache.batch():
+                for future in as_completed(futures):
+                    try:
+                        outcomes, writes, embeddings, tier_counts, state = future.result()
+                    except Exception as e:
+                        # 작업자 프로세스 종료 등 묶음 전체 실패
+                        outcomes = [(i, None, f"작업자 프로세스 오류: {e}") for i, _ in futures[future]]
+                        writes, embeddings, tier_counts, state = [], ([], []), {}, None
+                    
+                    if state is not None:
+                        metrics.merge_state(state)
+                    self._merge_worker_state(embeddings, tier_counts)
+                    for review, cache_key, cache_data, add_similar in writes:
+                        self.bot._store_response(review, cache_key, cache_data, add_similar=add_similar)
+                    
+                    for i, response, error in outcomes:
+                        review = reviews[i]
+                        done += 1
+                        if response is None:
+                            if journal is not None:
+                                journal.mark_failed(review.id, self.bot._generate_cache_key(review), error)
+                            print(f"리뷰 처리 오류 {review.id}: {error}")
+                            continue
+                        results[i] = response
+                        if journal is not None:
+                            self._journal_response(journal, review, response)
+                        print(f"처리 완료: {done}/{len(pending)} - {review.id}")
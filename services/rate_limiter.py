@@ -0,0 +1,220 @@
+import random
+import threading
+import time
+from typing import Callable, List, Optional
+from langchain_core.embeddings import Embeddings
+from config import Config
+
+class _TokenBucket:
+    """분당 한도를 초당 보충량으로 환산한 토큰 버킷"""
+    
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.refill_rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+    
+    def reserve(self, amount: float) -> float:
+        """amount만큼 예약하고 대기해야 할 시간(초)을 반환 (잔량은 음수가 될 수 있음)"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+        
+        # 버킷 용량보다 큰 요청도 통과할 수 있도록 용량으로 제한
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.refill_rate
+
+
+class RateLimiter:
+    """OpenAI 호출 공용 요청/토큰 예산 관리자
+
+    - 요청 수(RPM)·토큰 수(TPM) 토큰 버킷
+    - AIMD 방식 동시 실행 수 조절 (성공 시 가산 증가, 429 시 절반 감소)
+    - 재시도 가능한 오류는 지터가 적용된 지수 백오프로 재시도
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int,
+                 max_concurrency: int, min_concurrency: int = 1,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0):
+        self._request_bucket = _TokenBucket(requests_per_minute)
+        self._token_bucket = _TokenBucket(tokens_per_minute)
+        self._bucket_lock = threading.Lock()
+        
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self._limit = float(max_concurrency)
+        self._last_decrease = 0.0
+        
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        
+        self.stats = {"calls": 0, "rate_limited": 0, "retries": 0, "failures": 0}
+    
+    @classmethod
+    def from_config(cls) -> "RateLimiter":
+        return cls(
+            requests_per_minute=Config.OPENAI_REQUESTS_PER_MINUTE,
+            tokens_per_minute=Config.OPENAI_TOKENS_PER_MINUTE,
+            max_concurrency=Config.OPENAI_MAX_CONCURRENCY,
+            min_concurrency=Config.OPENAI_MIN_CONCURRENCY,
+            max_retries=Config.OPENAI_MAX_RETRIES
+        )
+    
+    def configure(self, requests_per_minute: int, tokens_per_minute: int, max_concurrency: int):
+        """한도 변경 (프로세스 풀 작업자가 공용 한도를 프로세스 수로 나눠 가질 때 사용)"""
+        with self._bucket_lock:
+            self._request_bucket = _TokenBucket(requests_per_minute)
+            self._token_bucket = _TokenBucket(tokens_per_minute)
+        with self._condition:
+            self.max_concurrency = max_concurrency
+            self.min_concurrency = min(self.min_concurrency, max_concurrency)
+            self._limit = float(max_concurrency)
+            self._condition.notify_all()
+    
+    @property
+    def concurrency_limit(self) -> int:
+        return max(self.min_concurrency, int(self._limit))
+    
+    @staticmethod
+    def estimate_tokens(*texts: str) -> int:
+        """대략적인 토큰 수 추정 (한글은 글자당 약 1토큰, 영문은 4글자당 약 1토큰)"""
+        total = 0
+        for text in texts:
+            if not text:
+                continue
+            non_ascii = sum(1 for ch in text if ord(ch) > 127)
+            total += non_ascii + (len(text) - non_ascii) // 4
+        return total
+    
+    def call(self, fn: Callable, *args, estimated_tokens: int = 0, **kwargs):
+        """예산 안에서 fn을 실행하고 재시도 가능한 오류는 백오프 후 재시도"""
+        attempt = 0
+        while True:
+            self._acquire(estimated_tokens)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._release()
+                rate_limited = self._is_rate_limit_error(e)
+                if rate_limited:
+                    self._on_rate_limited()
+                
+                if attempt >= self.max_retries or not (rate_limited or self._is_transient_error(e)):
+                    with self._condition:
+                        self.stats["failures"] += 1
+                    raise
+                
+                delay = self._backoff_delay(attempt, e)
+                attempt += 1
+                with self._condition:
+                    self.stats["retries"] += 1
+                print(f"OpenAI 호출 재시도 {attempt}/{self.max_retries} ({delay:.1f}초 후): {type(e).__name__}")
+                time.sleep(delay)
+                continue
+            
+            self._release(success=True)
+            return result
+    
+    def _acquire(self, estimated_tokens: int):
+        # 동시 실행 슬롯 확보
+        with self._condition:
+            while self._in_flight >= self.concurrency_limit:
+                self._condition.wait()
+            self._in_flight += 1
+            self.stats["calls"] += 1
+        
+        # 요청/토큰 버킷 예약 후 필요한 만큼 대기
+        with self._bucket_lock:
+            wait = max(
+                self._request_bucket.reserve(1),
+                self._token_bucket.reserve(estimated_tokens)
+            )
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _release(self, success: bool = False):
+        with self._condition:
+            self._in_flight -= 1
+            if success and self._limit < self.max_concurrency:
+                # 가산 증가: 현재 한도만큼 성공하면 슬롯 1개 증가
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+            self._condition.notify_all()
+    
+    def _on_rate_limited(self):
+        with self._condition:
+            self.stats["rate_limited"] += 1
+            now = time.monotonic()
+            # 동시에 도착한 429 여러 개로 한도가 연쇄적으로 줄지 않도록 1초에 한 번만 감소
+            if now - self._last_decrease >= 1.0:
+                self._limit = max(float(self.min_concurrency), self._limit / 2)
+                self._last_decrease = now
+    
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        retry_after = self._retry_after_seconds(error)
+        if retry_after is not None:
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        # Full jitter
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+    
+    @staticmethod
+    def _status_code(error: Exception) -> Optional[int]:
+        status = getattr(error, "status_code", None)
+        if status is None:
+            response = getattr(error, "response", None)
+            status = getattr(response, "status_code", None)
+        return status
+    
+    @classmethod
+    def _is_rate_limit_error(cls, error: Exception) -> bool:
+        if type(error).__name__ == "RateLimitError" or cls._status_code(error) == 429:
+            return True
+        message = str(error).lower()
+        return "rate limit" in message or "429" in message
+    
+    @classmethod
+    def _is_transient_error(cls, error: Exception) -> bool:
+        if type(error).__name__ in ("APIConnectionError", "APITimeoutError", "InternalServerError", "Timeout"):
+            return True
+        status = cls._status_code(error)
+        return status is not None and status >= 500
+    
+    @staticmethod
+    def _retry_after_seconds(error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+        try:
+            value = headers.get("retry-after")
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
+class RateLimitedEmbeddings(Embeddings):
+    """임베딩 호출을 공용 RateLimiter를 거쳐 실행하는 래퍼"""
+    
+    def __init__(self, embeddings: Embeddings, rate_limiter: RateLimiter):
+        self.embeddings = embeddings
+        self.rate_limiter = rate_limiter
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.rate_limiter.call(
+            self.embeddings.embed_documents, texts,
+            estimated_tokens=self.rate_limiter.estimate_tokens(*texts)
+        )
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.rate_limiter.call(
+            self.embeddings.embed_query, text,
+            estimated_tokens=self.rate_limiter.estimate_tokens(text)
+        )
+
+
+# 분류기·응답 생성기·임베딩이 함께 사용하는 공용 한도
+openai_rate_limiter = RateLimiter.from_config()
@@ -0,0 +1,343 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import Config
+
+# 증분 집계 차원 (응답 데이터 필드 → stats 테이블 dimension)
+STAT_FIELDS = {"country": "country", "platform": "platform", "category": "category"}
+
+# stats 테이블 스키마 버전 (변경 시 기존 응답에서 한 번 다시 집계)
+STATS_VERSION = "1"
+
+def _stat_deltas(data: Dict, sign: int) -> List[Tuple[str, str, int]]:
+    """응답 1건이 집계에 더하는(sign=1) / 빼는(sign=-1) 값 목록 (dimension, value, amount)"""
+    deltas = [("total", "responses", sign)]
+    deltas.extend(
+        (dimension, str(data.get(field) or "Unknown"), sign)
+        for field, dimension in STAT_FIELDS.items()
+    )
+    
+    generated_at = str(data.get("generated_at") or "")
+    if generated_at:
+        deltas.append(("daily", generated_at.split("T")[0], sign))
+    
+    response_text = data.get("response_text") or ""
+    if response_text:
+        deltas.append(("response_length", "chars", sign * len(response_text)))
+        deltas.append(("response_length", "responses", sign))
+    
+    return deltas
+
+class ResponseCacheStore:
+    """응답 캐시 저장소 (SQLite WAL 기반, dict 호환 인터페이스)
+
+    캐시 키(_generate_cache_key 해시) 단위로 행을 추가/갱신하므로
+    리뷰 1건 처리 시 전체 파일을 다시 쓰지 않으며, 조회는 필요한 키만 읽습니다.
+    국가/플랫폼/카테고리/일별 건수와 응답 길이 합계는 stats 테이블에 쓰기와 같은 트랜잭션으로
+    누적하므로 통계 조회 비용은 캐시 크기와 무관합니다.
+    운영자가 승인(approve)한 답변은 approvals 테이블에 기록되어 few-shot 예시로 사용됩니다.
+    read_only=True이면 다른 프로세스(단일 작성자)가 쓰는 저장소를 읽기 전용(mode=ro)으로 열어 조회만 합니다.
+    
+    batch()는 스레드 단위로 적용되므로, 배치 중에도 다른 스레드(데몬의 단건 요청 등)의 쓰기는 바로 커밋됩니다
+    (연결을 공유하므로 그 커밋에는 배치에서 대기 중인 쓰기도 함께 포함됩니다).
+    배치를 연 스레드가 만든 작업 스레드는 ThreadPoolExecutor(initializer=join_batch)로 배치에 참여시킵니다.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, legacy_json_path: Optional[str] = None,
+                 read_only: bool = False):
+        self.db_path = db_path or Config.RESPONSE_CACHE_PATH
+        self.legacy_json_path = legacy_json_path or Config.LEGACY_RESPONSE_CACHE_FILE
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        self._local = threading.local()  # 스레드별 배치 깊이
+        self._writes_since_compaction = 0
+        
+        if read_only:
+            # 스키마 생성·통계 집계·마이그레이션은 작성자 프로세스가 이미 마친 상태
+            self._conn = sqlite3.connect(
+                f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+            return
+        
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (dimension, value)
+            )
+        """)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS approvals (cache_key TEXT PRIMARY KEY, approved_at TEXT NOT NULL)")
+        self._conn.commit()
+        
+        self._backfill_stats()
+        self._migrate_legacy_json()
+    
+    # dict 호환 인터페이스
+    def __contains__(self, cache_key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return row is not None
+    
+    def __getitem__(self, cache_key: str) -> Dict:
+        value = self.get(cache_key)
+        if value is None:
+            raise KeyError(cache_key)
+        return value
+    
+    def __setitem__(self, cache_key: str, data: Dict):
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT data FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if previous is not None:
+                previous_data = json.loads(previous[0])
+                self._apply_stats(_stat_deltas(previous_data, -1))
+                # 답변이 바뀌면 이전 승인은 무효
+                if previous_data.get("response_text") != data.get("response_text"):
+                    self._conn.execute("DELETE FROM approvals WHERE cache_key = ?", (cache_key,))
+            self._apply_stats(_stat_deltas(json.loads(payload), 1))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (cache_key, data, updated_at) VALUES (?, ?, ?)",
+                (cache_key, payload, datetime.now().isoformat())
+            )
+            self._writes_since_compaction += 1
+            if not self.in_batch:
+                self._conn.commit()
+                self._maybe_compact()
+    
+    def __delitem__(self, cache_key: str):
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT data FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if previous is None:
+                raise KeyError(cache_key)
+            self._apply_stats(_stat_deltas(json.loads(previous[0]), -1))
+            self._conn.execute("DELETE FROM responses WHERE cache_key = ?", (cache_key,))
+            self._conn.execute("DELETE FROM approvals WHERE cache_key = ?", (cache_key,))
+            if not self.in_batch:
+                self._conn.commit()
+    
+    def __len__(self) -> int:
+        return self.stat_counts("total").get("responses", 0)
+    
+    def __bool__(self) -> bool:
+        return len(self) > 0
+    
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in self.items())
+    
+    def get(self, cache_key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0])
+    
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+    
+    def values(self) -> Iterator[Dict]:
+        return (data for _, data in self.items())
+    
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        """전체 항목 순회 (값은 순회 시점에 역직렬화)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT cache_key, data FROM responses").fetchall()
+        for cache_key, data in rows:
+            yield cache_key, json.loads(data)
+    
+    def recent(self, limit: int) -> List[Dict]:
+        """최근 갱신된 항목부터 최대 limit개 반환"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM responses ORDER BY updated_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+    
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM stats")
+            self._conn.execute("DELETE FROM approvals")
+            self._conn.commit()
+            self.compact()
+    
+    # 답변 승인 (few-shot 예시)
+    def approve(self, cache_key: str, approved: bool = True) -> bool:
+        """캐시된 답변 승인/승인 취소 (캐시에 없는 키는 False)"""
+        with self._lock:
+            if approved:
+                if cache_key not in self:
+                    return False
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO approvals (cache_key, approved_at) VALUES (?, ?)",
+                    (cache_key, datetime.now().isoformat())
+                )
+            else:
+                self._conn.execute("DELETE FROM approvals WHERE cache_key = ?", (cache_key,))
+            if not self.in_batch:
+                self._conn.commit()
+        return True
+    
+    def approved_keys(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT cache_key FROM approvals ORDER BY cache_key").fetchall()
+        return [cache_key for (cache_key,) in rows]
+    
+    def approved_values(self) -> Iterator[Dict]:
+        """승인된 답변 데이터 (승인 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.data FROM approvals a JOIN responses r ON r.cache_key = a.cache_key ORDER BY a.approved_at"
+            ).fetchall()
+        return (json.loads(data) for (data,) in rows)
+    
+    # 증분 집계
+    def stat_counts(self, dimension: str, limit: Optional[int] = None) -> Dict[str, int]:
+        """집계 차원별 값 → 건수 (limit 지정 시 값 내림차순 상위 limit개, 일별 최근 N일 조회용)"""
+        query = "SELECT value, count FROM stats WHERE dimension = ? AND count != 0 ORDER BY value DESC"
+        params = (dimension,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return dict(rows)
+    
+    def average_response_length(self) -> float:
+        """응답 텍스트가 있는 항목의 평균 길이"""
+        lengths = self.stat_counts("response_length")
+        responses = lengths.get("responses", 0)
+        return lengths.get("chars", 0) / responses if responses > 0 else 0.0
+    
+    def _apply_stats(self, deltas: List[Tuple[str, str, int]]):
+        self._conn.executemany(
+            """
+            INSERT INTO stats (dimension, value, count) VALUES (?, ?, ?)
+            ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count
+            """,
+            deltas
+        )
+    
+    def _backfill_stats(self):
+        """stats 테이블 도입 전 캐시(또는 스키마 버전 변경)는 기존 응답에서 한 번만 집계"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'stats_version'").fetchone()
+            if row is not None and row[0] == STATS_VERSION:
+                return
+            
+            self._conn.execute("DELETE FROM stats")
+            count = 0
+            for (data,) in self._conn.execute("SELECT data FROM responses"):
+                self._apply_stats(_stat_deltas(json.loads(data), 1))
+                count += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('stats_version', ?)", (STATS_VERSION,)
+            )
+            self._conn.commit()
+        
+        if count:
+            print(f"응답 캐시 통계 집계 완료: {count}개 항목")
+    
+    # 쓰기 제어
+    @contextmanager
+    def batch(self):
+        """현재 스레드의 블록 안 쓰기를 하나의 트랜잭션으로 묶어 마지막에 한 번만 커밋"""
+        self._local.depth = self._batch_depth + 1
+        try:
+            yield self
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                self.flush()
+    
+    def join_batch(self):
+        """작업 스레드를 진행 중인 배치에 참여 (배치 블록 안에서 만든 ThreadPoolExecutor의 initializer로 사용)"""
+        self._local.depth = self._batch_depth + 1
+    
+    @property
+    def _batch_depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+    
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+    
+    def flush(self):
+        """대기 중인 쓰기 커밋"""
+        with self._lock:
+            self._conn.commit()
+            self._maybe_compact()
+    
+    def compact(self):
+        """WAL 체크포인트 후 파일 재작성으로 빈 공간 회수"""
+        with self._lock:
+            self._conn.commit()
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("VACUUM")
+            self._writes_since_compaction = 0
+    
+    def _maybe_compact(self):
+        if self._writes_since_compaction >= Config.RESPONSE_CACHE_COMPACTION_INTERVAL:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._writes_since_compaction = 0
+    
+    def file_size(self) -> int:
+        """DB + WAL 파일 크기 (bytes)"""
+        total = 0
+        for path in (self.db_path, f"{self.db_path}-wal"):
+            if os.path.exists(path):
+                total += os.path.getsize(path)
+        return total
+    
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+    
+    def _migrate_legacy_json(self):
+        """기존 response_cache.json을 한 번만 가져오고 파일명을 변경"""
+        if not os.path.exists(self.legacy_json_path):
+            return
+        
+        try:
+            with open(self.legacy_json_path, 'r', encoding='utf-8') as f:
+                legacy_cache = json.load(f)
+        except Exception as e:
+            print(f"기존 캐시 마이그레이션 실패: {e}")
+            return
+        
+        with self.batch():
+            for cache_key, data in legacy_cache.items():
+                if cache_key not in self:
+                    self[cache_key] = data
+        
+        os.replace(self.legacy_json_path, f"{self.legacy_json_path}.migrated")
+        print(f"기존 캐시 {len(legacy_cache)}개 항목을 {self.db_path}로 이전했습니다.")
@@ -1,21 +1,74 @@
-from typing import List
+import json
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from datetime import datetime
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from config import Config
 from models.review import Review, ReviewResponse
 from services.vector_store import VectorStoreService
+from services.context_builder import ContextBuilder
+from services.rate_limiter import openai_rate_limiter
+from services.metrics import invoke_llm, metrics
+from services.review_classifier import CATEGORY_GUIDE
+from utils.review_cases import render_prompt_examples
+
+if TYPE_CHECKING:
+    from services.example_store import ExampleStore
+
+# 분류+응답 통합 모드에서 국가별 시스템 프롬프트 뒤에 추가되는 지시문
+FUSED_OUTPUT_INSTRUCTIONS = """추가 작업: 답변을 작성하기 전에 리뷰를 아래 카테고리 중 하나로 분류하세요.
+
+""" + CATEGORY_GUIDE + """
+
+결과는 반드시 아래 형식의 JSON 객체 하나로만 반환하세요:
+{{"category": "<카테고리명>", "response": "<리뷰 답변>"}}"""
+
+# 요청마다 달라지는 내용 (정적 시스템 프롬프트 뒤에 위치해야 프롬프트 캐시의 공통 접두사가 유지됨)
+KR_REQUEST_CONTEXT = """{few_shot_examples}답변 길이: {max_length}자 이내
+
+참고할 지식베이스:
+{knowledge_context}"""
+
+US_REQUEST_CONTEXT = """{few_shot_examples}Response length: within {max_length} characters
+
+Knowledge base for reference:
+{knowledge_context}"""
 
 class ResponseGenerator:
-    """리뷰 응답 생성 서비스"""
+    """리뷰 응답 생성 서비스
+
+    프롬프트는 [정적 시스템 프롬프트 → (통합 모드 지시문) → 요청별 컨텍스트 → 리뷰] 순서로 구성되어
+    같은 국가의 요청은 앞부분이 항상 같으므로 OpenAI 프롬프트 캐시(1024토큰 이상 공통 접두사)가 적용됩니다.
+    (국가, 플랫폼, 통합 모드)별 프롬프트·LLM 체인은 생성 시 한 번만 구성합니다.
+    답변 예시 저장소가 있으면 전체 답변 예시 대신 리뷰와 가장 가까운 예시 몇 개만 요청별 컨텍스트에 넣습니다.
+    """
     
-    def __init__(self, vector_store_service: VectorStoreService):
+    # 국가별 시스템 프롬프트의 대략적인 토큰 수
+    PROMPT_TOKEN_ESTIMATE = 1500
+    # 분류+응답 통합 지시문의 대략적인 토큰 수
+    FUSED_INSTRUCTIONS_TOKEN_ESTIMATE = 600
+    # RAG 검색 문서 수
+    RETRIEVAL_K = 3
+    
+    def __init__(self, vector_store_service: VectorStoreService, example_store: Optional["ExampleStore"] = None):
         self.llm = ChatOpenAI(
             model_name=Config.LLM_MODEL,
             api_key=Config.OPENAI_API_KEY,
-            temperature=0.3
+            base_url=Config.OPENAI_BASE_URL,
+            temperature=0.3,
+            max_retries=0  # 재시도는 공용 RateLimiter에서 처리
         )
         self.vector_store_service = vector_store_service
+        self.context_builder = ContextBuilder()
+        self.example_store = example_store
+        
+        # 답변 예시: 예시 저장소가 있으면 요청마다 유사한 예시만, 없으면 전체 예시를 시스템 프롬프트에 포함
+        if example_store is not None:
+            kr_examples = "실제 답변 예시:\n요청마다 이 리뷰와 비슷한 실제 리뷰와 답변 예시가 아래에 제공됩니다."
+            us_examples = "**Actual Response Examples:**\nSimilar real reviews and responses are provided with each request below."
+        else:
+            kr_examples = render_prompt_examples("KR")
+            us_examples = render_prompt_examples("US")
         
         # 국가별 프롬프트 템플릿
         self.kr_prompt = ChatPromptTemplate.from_messages([
@@ -31,25 +84,7 @@ class ResponseGenerator:
 5. "1:1 문의" 또는 "앱 내 1:1 문의"로 추가 도움 유도
 6. 마지막에 따뜻하고 인간적인 마무리 문장 (아래 예시 중 하나 활용)
 
-실제 답변 예시:
-
-현금 인출 관련:
-"더 나은 서비스를 제공하기 위한 기능 업데이트 과정에서 약 3~4일간 일시적으로 현금 인출 기능이 표시되지 않았을 수 있습니다. 현재는 정상적으로 이용 가능하오니 다시 한번 확인 부탁드립니다."
-
-문의 답변 지연:
-"문의 답변이 지연되어 불편을 드려 죄송합니다. 채팅 문의의 특성상 간혹 누락이 발생할 수 있으며, 이런 경우 기존 문의가 아닌 '새 문의'로 다시 남겨주시면 더욱 신속하게 확인하여 답변드리겠습니다."
-
-기능 변경:
-"기존 기능을 유지하는 것보다, 유저분들께 더욱 유용한 경험을 제공하기 위해 새로운 기능 개발에 집중하고 있습니다. 앞으로도 지속적인 개선을 통해 더 나은 서비스를 제공할 수 있도록 노력하겠습니다."
-
-상품 변경:
-"쿠폰의 경우 공급 상황에 따라 구성이 변경될 수 있으며, 더 많은 상품을 제공하기 위해 이번 선물샵 개편을 통해 300여 가지의 새로운 상품을 추가했습니다."
-
-문의 누락:
-"번거롭게 해드려 죄송합니다. 채팅 상담 특성상 유저님의 문의가 누락되었을 가능성이 있습니다. 정말 죄송하지만, 다시 한 번 상담을 남겨주시면 저희가 바로 확인하여 도움을 드리겠습니다."
-
-일반적인 불편사항:
-"이용 중 불편을 겪으셨다니 죄송한 마음입니다. 정확한 확인을 위해 앱 내 1:1 문의를 남겨주시면 신속하게 도움을 드리겠습니다. 유저분들의 피드백을 소중하게 생각하며, 더 나은 서비스 제공을 위해 지속적으로 개선하겠습니다."
+""" + kr_examples + """
 
 작성 가이드라인:
 - 공식적이고 정중한 톤 유지
@@ -61,10 +96,9 @@ class ResponseGenerator:
   * 긍정적 피드백: 감사와 격려 (예: "소중한 의견 감사합니다", "앞으로도 함께해 주세요")
   * 일반적 상황: 따뜻하고 자연스러운 인사 (예: "오늘도 건강한 하루 되세요", "좋은 하루 보내시길 바랍니다")
 - 매번 다른 표현을 사용하여 자연스럽게 작성
-- {max_length}자 이내로 작성
-
-참고할 지식베이스:
-{knowledge_context}"""),
+- 안내된 답변 길이 이내로 작성
+- 아래에 제공되는 지식베이스를 참고하여 작성"""),
+            ("system", KR_REQUEST_CONTEXT),
             ("user", """작성자: {author}
 국가: {country}
 리뷰 카테고리: {category}
@@ -78,12 +112,7 @@ class ResponseGenerator:
 
 Please refer to these actual response examples to write natural and helpful responses:
 
-**Actual Response Examples:**
-- Step Tracking Error: "Hi [Name], sorry for the confusion! Step data may sync differently depending on your phone's motion settings. Please check if the app has motion permission enabled in Settings."
-- Accessibility: "Hi [Name], thank you for your feedback and for using VoiceOver. We're aware of this issue and working to improve accessibility. Your input truly helps us build a better experience."
-- Reward Delays: "Hi [Name], sorry to hear that. Gift card delivery may take some time depending on provider. If you still haven't received it, please contact us through the in-app Help Center."
-- Points Decrease: "Hi [Name], thanks for your feedback. Point amounts may change over time based on app events and level progress. We appreciate your continued support!"
-- Inquiry Missing: "We sincerely apologize for the inconvenience. Due to the nature of our chat system, it's possible that your previous message was missed. We're truly sorry about that. Could you please send your message again? Also, to help us locate your previous inquiry faster, please include your nickname in the new message. Thank you so much for your patience!"
+""" + us_examples + """
 
 **Response Guidelines:**
 1. Start with personalized greeting: "Hi [Name]" (only if name is appropriate)
@@ -95,10 +124,9 @@ Please refer to these actual response examples to write natural and helpful resp
    * For positive feedback: Gratitude and encouragement (e.g., "Thanks for your support!", "We're glad you're enjoying the app")
    * For general situations: Warm and natural closing (e.g., "Have a great day!", "Take care and happy walking!")
 6. Use different expressions each time to keep responses natural
-7. Keep within {max_length} characters
-
-Knowledge base for reference:
-{knowledge_context}"""),
+7. Keep within the response length given below
+8. Refer to the knowledge base provided below"""),
+            ("system", US_REQUEST_CONTEXT),
             ("user", """Author: {author}
 Country: {country}
 Review Category: {category}
@@ -106,69 +134,209 @@ Review Content: "{review_content}"
 
 Please write a natural and helpful English response to the above review.""")
         ])
+        
+        # 분류+응답 통합 프롬프트 (국가별 시스템 프롬프트 재사용)
+        self.kr_fused_prompt = ChatPromptTemplate.from_messages([
+            self.kr_prompt.messages[0],
+            ("system", FUSED_OUTPUT_INSTRUCTIONS),
+            ("system", KR_REQUEST_CONTEXT),
+            ("user", """작성자: {author}
+국가: {country}
+리뷰 내용: "{review_content}"
+
+위 리뷰를 분류하고 머니워크 운영팀 공식 스타일의 한국어 답변을 작성해주세요.""")
+        ])
+        
+        self.us_fused_prompt = ChatPromptTemplate.from_messages([
+            self.us_prompt.messages[0],
+            ("system", FUSED_OUTPUT_INSTRUCTIONS),
+            ("system", US_REQUEST_CONTEXT),
+            ("user", """Author: {author}
+Country: {country}
+Review Content: "{review_content}"
+
+Classify the above review and write a natural and helpful English response.""")
+        ])
+        
+        # JSON 모드 LLM (통합 모드 전용)
+        self.json_llm = self.llm.bind(response_format={"type": "json_object"})
+        
+        # (국가, 플랫폼, 통합 모드) → (답변 길이가 채워진 프롬프트, LLM)
+        self._chains: Dict[Tuple[str, str, bool], Tuple[ChatPromptTemplate, object]] = {}
+        for country in Config.COUNTRIES:
+            for platform in Config.MAX_RESPONSE_LENGTH:
+                for fused in (False, True):
+                    self._get_chain(country, platform, fused)
     
-    def generate_response(self, review: Review, category: str) -> ReviewResponse:
-        """리뷰에 대한 응답 생성"""
+    def _get_chain(self, country: str, platform: str, fused: bool) -> Tuple[ChatPromptTemplate, object]:
+        """미리 구성한 프롬프트·LLM 체인 (설정에 없는 국가·플랫폼은 처음 요청될 때 구성)"""
+        key = (country.upper(), platform, fused)
+        chain = self._chains.get(key)
+        if chain is None:
+            if key[0] == "KR":
+                prompt = self.kr_fused_prompt if fused else self.kr_prompt
+            else:
+                prompt = self.us_fused_prompt if fused else self.us_prompt
+            max_length = Config.MAX_RESPONSE_LENGTH.get(platform, 350)
+            chain = (prompt.partial(max_length=str(max_length)), self.json_llm if fused else self.llm)
+            self._chains[key] = chain
+        return chain
+    
+    def generate_response(self, review: Review, category: str, relevant_docs: Optional[List] = None) -> ReviewResponse:
+        """리뷰에 대한 응답 생성 (relevant_docs가 주어지면 RAG 검색 생략)"""
         try:
-            # RAG 검색으로 관련 문서 검색
-            relevant_docs = self.vector_store_service.similarity_search(
-                review.content, 
-                review.country.lower(), 
-                k=3
-            )
-            
-            # 지식베이스 컨텍스트 구성
-            knowledge_context = "\n\n".join([
-                f"문서 {i+1}: {doc.page_content}" 
-                for i, doc in enumerate(relevant_docs)
-            ])
+            relevant_docs, knowledge_context, context_tokens = self._retrieve_context(review, relevant_docs)
             
             # 응답 길이 제한 설정
             max_length = Config.MAX_RESPONSE_LENGTH.get(review.platform, 350)
             
-            # 국가별 프롬프트 선택
-            if review.country.upper() == "KR":
-                prompt = self.kr_prompt
-            else:
-                prompt = self.us_prompt
+            # 국가·플랫폼별 프롬프트 선택
+            prompt, llm = self._get_chain(review.country, review.platform, fused=False)
             
             # 사용자명 처리 (짧고 적절한 경우만 사용)
             author_name = self._process_author_name(review.author)
             
-            # 응답 생성
-            chain = prompt | self.llm
-            result = chain.invoke({
-                "author": author_name,
-                "country": review.country,
-                "category": category,
-                "review_content": review.content,
-                "knowledge_context": knowledge_context,
-                "max_length": max_length
-            })
-            
-            response_text = result.content.strip()
-            
-            # 길이 제한 확인 및 조정
-            if len(response_text) > max_length:
-                response_text = self._truncate_response(response_text, max_length)
-            
-            # 사용된 소스 추출
-            used_sources = [doc.metadata.get('source', '') for doc in relevant_docs]
+            few_shot_examples = self._few_shot_examples(review)
+            with metrics.span("prompt_build"):
+                messages = prompt.format_messages(
+                    author=author_name,
+                    country=review.country,
+                    category=category,
+                    review_content=review.content,
+                    knowledge_context=knowledge_context,
+                    few_shot_examples=few_shot_examples
+                )
             
-            return ReviewResponse(
-                review_id=review.id,
-                response_text=response_text,
-                generated_at=datetime.now(),
-                country=review.country,
-                platform=review.platform,
-                used_sources=used_sources
+            # 응답 생성
+            result = invoke_llm(
+                llm,
+                messages,
+                estimated_tokens=(
+                    self.PROMPT_TOKEN_ESTIMATE
+                    + context_tokens
+                    + openai_rate_limiter.estimate_tokens(review.content, few_shot_examples)
+                    + max_length
+                )
             )
             
+            return self._build_response(review, result.content, relevant_docs, max_length)
+        
         except Exception as e:
             print(f"응답 생성 오류: {e}")
             # 기본 응답 반환
             return self._generate_fallback_response(review, category)
     
+    def generate_response_with_category(self, review: Review, relevant_docs: Optional[List] = None) -> Tuple[str, ReviewResponse]:
+        """분류와 응답 생성을 한 번의 LLM 호출로 처리 (카테고리, 응답) 반환"""
+        try:
+            relevant_docs, knowledge_context, context_tokens = self._retrieve_context(review, relevant_docs)
+            max_length = Config.MAX_RESPONSE_LENGTH.get(review.platform, 350)
+            prompt, llm = self._get_chain(review.country, review.platform, fused=True)
+            
+            few_shot_examples = self._few_shot_examples(review)
+            with metrics.span("prompt_build"):
+                messages = prompt.format_messages(
+                    author=self._process_author_name(review.author),
+                    country=review.country,
+                    review_content=review.content,
+                    knowledge_context=knowledge_context,
+                    few_shot_examples=few_shot_examples
+                )
+            
+            result = invoke_llm(
+                llm,
+                messages,
+                estimated_tokens=(
+                    self.PROMPT_TOKEN_ESTIMATE
+                    + self.FUSED_INSTRUCTIONS_TOKEN_ESTIMATE
+                    + context_tokens
+                    + openai_rate_limiter.estimate_tokens(review.content, few_shot_examples)
+                    + max_length
+                ),
+                stage="fused_generation"
+            )
+            
+            output = json.loads(result.content)
+            
+            # 유효한 카테고리인지 확인
+            category = str(output.get("category", "")).strip()
+            if category not in Config.REVIEW_CATEGORIES:
+                category = "기타"
+            
+            response_text = str(output.get("response", "")).strip()
+            if not response_text:
+                raise ValueError("응답 텍스트가 비어 있습니다.")
+            
+            return category, self._build_response(review, response_text, relevant_docs, max_length)
+        
+        except Exception as e:
+            print(f"분류+응답 통합 생성 오류: {e}")
+            return "기타", self._generate_fallback_response(review, "기타")
+    
+    def _retrieve_context(self, review: Review, relevant_docs: Optional[List] = None) -> Tuple[List, str, int]:
+        """RAG 검색으로 (컨텍스트에 포함된 문서, 지식베이스 컨텍스트, 컨텍스트 토큰 수) 구성
+
+        미리 검색한 문서가 있으면 재사용하고, 플랫폼별 토큰 예산에 맞춰 ContextBuilder로 담습니다.
+        """
+        if relevant_docs is None:
+            with metrics.span("retrieval"):
+                relevant_docs = self.vector_store_service.similarity_search(
+                    review.content, 
+                    review.country.lower(), 
+                    k=self.RETRIEVAL_K
+                )
+        
+        with metrics.span("context_build"):
+            return self.context_builder.build(relevant_docs, review.platform)
+    
+    def _few_shot_examples(self, review: Review) -> str:
+        """리뷰와 가장 가까운 답변 예시 블록 (예시 저장소가 없거나 찾지 못하면 빈 문자열)"""
+        if self.example_store is None:
+            return ""
+        
+        try:
+            with metrics.span("few_shot_search"):
+                examples = self.example_store.search(review)
+        except Exception as e:
+            print(f"답변 예시 검색 오류: {e}")
+            return ""
+        if not examples:
+            return ""
+        
+        korean = review.country.upper() == "KR"
+        lines = ["유사 리뷰 답변 예시 (표현을 그대로 복사하지 말고 안내 방식과 말투만 참고):" if korean
+                 else "Similar review response examples (follow the approach and tone, do not copy verbatim):"]
+        for example in examples:
+            if example["review"]:
+                lines.append(f"{'리뷰' if korean else 'Review'}: \"{example['review']}\"")
+            else:
+                lines.append(f"{'케이스' if korean else 'Case'}: {example['case']}")
+            lines.append(f"{'답변' if korean else 'Response'}: \"{example['response']}\"")
+        metrics.increment("few_shot_examples_total", len(examples))
+        return "\n".join(lines) + "\n\n"
+    
+    def _build_response(self, review: Review, response_text: str, relevant_docs: List, max_length: int) -> ReviewResponse:
+        """LLM 출력으로 ReviewResponse 생성 (길이 제한 적용)"""
+        response_text = response_text.strip()
+        
+        # 길이 제한 확인 및 조정
+        if len(response_text) > max_length:
+            with metrics.span("truncation"):
+                response_text = self._truncate_response(response_text, max_length)
+            metrics.increment("responses_truncated_total")
+        
+        # 사용된 소스 추출
+        used_sources = [doc.metadata.get('source', '') for doc in relevant_docs]
+        
+        return ReviewResponse(
+            review_id=review.id,
+            response_text=response_text,
+            generated_at=datetime.now(),
+            country=review.country,
+            platform=review.platform,
+            used_sources=used_sources
+        )
+    
     def _process_author_name(self, author: str) -> str:
         """작성자명 처리 (길거나 부적절한 이름 필터링)"""
         if not author or len(author) > 10 or any(char in author for char in ['@', '#', '$', '%']):
@@ -197,7 +365,8 @@ Please write a natural and helpful English response to the above review.""")
         return truncated.strip()
     
     def _generate_fallback_response(self, review: Review, category: str) -> ReviewResponse:
-        """기본 응답 생성 (오류 발생 시)"""
+        """기본 응답 생성 (오류 발생 시, fallback=True로 표시하여 캐시에 저장하지 않고 저널에는 실패로 기록)"""
+        metrics.increment("responses_fallback_total")
         if review.country.upper() == "KR":
             response_text = """**안녕하세요, 머니워크 운영팀입니다.**
 
@@ -215,5 +384,6 @@ Please write a natural and helpful English response to the above review.""")
             generated_at=datetime.now(),
             country=review.country,
             platform=review.platform,
-            used_sources=[]
+            used_sources=[],
+            fallback=True
         ) 
\ No newline at end of file
@@ -1,26 +1,119 @@
 import json
 import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Tuple
 from models.review import Review, ReviewResponse
-from services.vector_store import VectorStoreService
-from services.review_classifier import ReviewClassifier
-from services.response_generator import ResponseGenerator
-from utils.document_loader import DocumentLoader
+from services.response_cache import ResponseCacheStore
+from services.metrics import metrics
+from utils.vector_store_paths import resolve_store_path
 from config import Config
 
+if TYPE_CHECKING:
+    from services.vector_store import VectorStoreService
+    from services.review_classifier import ReviewClassifier
+    from services.response_generator import ResponseGenerator
+    from services.semantic_cache import SemanticResponseCache
+    from services.example_store import ExampleStore
+    from services.run_journal import RunJournal
+    from utils.document_loader import DocumentLoader
+
 class ReviewBot:
-    """리뷰봇 메인 서비스"""
+    """리뷰봇 메인 서비스
+    
+    langchain/FAISS/BeautifulSoup을 사용하는 서비스는 처음 사용할 때 생성합니다.
+    (통계 조회·캐시 초기화는 응답 캐시만 열고 바로 실행)
+    
+    read_only=True이면 프로세스 풀 작업자용으로 응답 캐시·임베딩 캐시·답변 예시 저장소를 읽기 전용으로 열고,
+    생성한 응답은 pending_writes에 모아 부모 프로세스(단일 작성자)가 저장하도록 넘깁니다.
+    """
     
-    def __init__(self):
-        self.document_loader = DocumentLoader()
-        self.vector_store_service = VectorStoreService()
-        self.review_classifier = ReviewClassifier()
-        self.response_generator = ResponseGenerator(self.vector_store_service)
+    def __init__(self, fused_mode: Optional[bool] = None, read_only: bool = False):
+        self._init_lock = threading.RLock()
+        self.kb_update_lock = threading.Lock()  # 지식베이스 업데이트는 한 번에 하나만 (스케줄러·데몬 API 공용)
+        self._document_loader = None
+        self._vector_store_service = None
+        self._response_generator = None
+        self._semantic_cache = None
+        self._example_store = None
+        self._review_classifier = None
+        
+        # 분류+응답 통합 모드 (None이면 설정값 사용, 2단계 방식과 비교 가능)
+        self.fused_mode = Config.FUSED_CLASSIFY_RESPOND if fused_mode is None else fused_mode
         
         # 캐시 저장소
+        self.read_only = read_only
         self.response_cache = self._load_response_cache()
-        
+        self._pending_lock = threading.Lock()
+        self.pending_writes: List[Tuple[Review, str, Dict, bool]] = []  # (리뷰, 캐시 키, 응답 데이터, 유사 캐시 추가 여부)
+    
+    def _get_or_create(self, name: str, factory: Callable):
+        """서비스를 처음 사용할 때 한 번만 생성 (여러 스레드에서 동시에 접근해도 안전)"""
+        service = getattr(self, name)
+        if service is None:
+            with self._init_lock:
+                service = getattr(self, name)
+                if service is None:
+                    service = factory()
+                    setattr(self, name, service)
+        return service
+    
+    @property
+    def document_loader(self) -> "DocumentLoader":
+        def create():
+            from utils.document_loader import DocumentLoader
+            return DocumentLoader()
+        return self._get_or_create("_document_loader", create)
+    
+    @property
+    def vector_store_service(self) -> "VectorStoreService":
+        def create():
+            from services.vector_store import VectorStoreService
+            return VectorStoreService(read_only=self.read_only)
+        return self._get_or_create("_vector_store_service", create)
+    
+    @property
+    def response_generator(self) -> "ResponseGenerator":
+        def create():
+            from services.response_generator import ResponseGenerator
+            return ResponseGenerator(self.vector_store_service, self.example_store)
+        return self._get_or_create("_response_generator", create)
+    
+    @property
+    def example_store(self) -> Optional["ExampleStore"]:
+        """few-shot 답변 예시 저장소 (비활성화 시 None)"""
+        if not Config.FEW_SHOT_ENABLED:
+            return None
+        
+        def create():
+            from services.example_store import ExampleStore
+            return ExampleStore(self.vector_store_service.embeddings, self.response_cache, read_only=self.read_only)
+        return self._get_or_create("_example_store", create)
+    
+    @property
+    def semantic_cache(self) -> Optional["SemanticResponseCache"]:
+        """유사 중복 응답 캐시 (2단계 캐시, 비활성화 시 None)"""
+        if not Config.SEMANTIC_CACHE_ENABLED:
+            return None
+        
+        def create():
+            from services.semantic_cache import SemanticResponseCache
+            return SemanticResponseCache(self.vector_store_service.embeddings)
+        return self._get_or_create("_semantic_cache", create)
+    
+    @property
+    def review_classifier(self) -> "ReviewClassifier":
+        """분류기 (캐시된 분류 결과를 로컬 분류기 시드로 사용)"""
+        def create():
+            from services.review_classifier import ReviewClassifier
+            return ReviewClassifier(
+                embeddings=self.vector_store_service.embeddings,
+                seed_examples=self._load_classifier_seeds()
+            )
+        return self._get_or_create("_review_classifier", create)
+    
     def initialize_knowledge_base(self, force_update: bool = False):
         """지식베이스 초기화 (기존 저장소가 있으면 재사용)"""
         print("지식베이스 초기화 시작...")
@@ -60,116 +153,322 @@ class ReviewBot:
             return existing_stores
         
         for country in Config.COUNTRIES:
-            store_path = f"{Config.VECTOR_STORE_PATH}/{country.lower()}_faiss"
-            if os.path.exists(store_path):
+            if resolve_store_path(country.lower()):
                 existing_stores.append(country.lower())
         
         return existing_stores
     
-    def process_review(self, review: Review) -> ReviewResponse:
-        """단일 리뷰 처리"""
+    def process_review(self, review: Review, relevant_docs: Optional[List] = None,
+                       journal: Optional["RunJournal"] = None) -> ReviewResponse:
+        """단일 리뷰 처리 (relevant_docs: 일괄 처리에서 미리 검색한 RAG 문서, journal: 실행 저널)"""
+        entry = None
+        if journal is not None:
+            from services.run_journal import GENERATED, RunRetriesExceeded
+            
+            content_key = self._generate_cache_key(review)
+            entry = journal.get(review.id, content_key)
+            if entry is not None and entry["state"] == GENERATED:
+                print(f"저널에 기록된 응답 사용: {review.id}")
+                return ReviewResponse(**entry["response"])
+            if journal.is_exhausted(entry):
+                raise RunRetriesExceeded(f"재시도 한도 초과 ({entry['attempts']}회): {entry['error']}")
+        
+        try:
+            with metrics.span("review_total", review_id=review.id):
+                response = self._process_review(review, relevant_docs, journal, entry)
+        except Exception as e:
+            if journal is not None:
+                journal.mark_failed(review.id, content_key, str(e))
+            raise
+        
+        if journal is not None:
+            if response.fallback:
+                # 기본 응답은 완료로 기록하지 않아 다음 실행에서 재시도 한도까지 다시 생성
+                journal.mark_failed(review.id, content_key, "응답 생성 실패 (기본 응답 반환)")
+            else:
+                journal.mark_generated(review.id, content_key, response.dict())
+        metrics.increment("reviews_processed_total")
+        return response
+    
+    def _process_review(self, review: Review, relevant_docs: Optional[List],
+                        journal: Optional["RunJournal"] = None, entry: Optional[Dict] = None) -> ReviewResponse:
         # 캐시 확인
         cache_key = self._generate_cache_key(review)
-        if cache_key in self.response_cache:
+        with metrics.span("cache_lookup", review_id=review.id):
+            cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            metrics.increment("response_cache_hits_total")
             print(f"캐시된 응답 사용: {review.id}")
-            cached_response = self.response_cache[cache_key]
-            # 캐시된 데이터를 ReviewResponse 객체로 변환
-            return ReviewResponse(**cached_response)
-        
-        # 리뷰 분류
-        category = self.review_classifier.classify_review(review)
-        review.category = category
+            # 캐시된 데이터를 ReviewResponse 객체로 변환 (같은 내용의 다른 리뷰일 수 있으므로 ID는 현재 리뷰 기준)
+            return ReviewResponse(**{**cached_response, "review_id": review.id})
+        metrics.increment("response_cache_misses_total")
         
-        print(f"리뷰 분류: {review.id} -> {category}")
+        # 유사 중복 캐시 확인 (임베딩 코사인 유사도)
+        review_vector = None
+        if self.semantic_cache is not None:
+            try:
+                with metrics.span("semantic_cache_lookup", review_id=review.id):
+                    similar, review_vector = self.semantic_cache.lookup(review)
+                response = self._response_from_similar(review, cache_key, similar) if similar is not None else None
+                metrics.increment("semantic_cache_hits_total" if response is not None else "semantic_cache_misses_total")
+                if response is not None:
+                    print(f"유사 캐시 응답 사용: {review.id} (유사도 {similar['similarity']:.3f})")
+                    return response
+            except Exception as e:
+                print(f"유사 캐시 조회 오류: {e}")
+        
+        if self.fused_mode:
+            # 분류와 응답 생성을 한 번의 호출로 처리
+            category, response = self.response_generator.generate_response_with_category(review, relevant_docs)
+            review.category = category
+            print(f"리뷰 분류: {review.id} -> {category}")
+        else:
+            # 리뷰 분류 (이전 실행에서 분류까지 마쳤으면 저널의 결과 사용)
+            category = entry["category"] if entry is not None and entry["category"] else None
+            if category is None:
+                with metrics.span("classification", review_id=review.id):
+                    category = self.review_classifier.classify_review(review)
+                if journal is not None:
+                    journal.mark_classified(review.id, cache_key, category)
+            review.category = category
+            
+            print(f"리뷰 분류: {review.id} -> {category}")
+            
+            # 응답 생성
+            response = self.response_generator.generate_response(review, category, relevant_docs)
         
-        # 응답 생성
-        response = self.response_generator.generate_response(review, category)
+        if response.fallback:
+            # 생성 실패 시의 기본 응답은 정확 일치·유사 캐시에 저장하지 않음 (다음 요청에서 다시 생성)
+            return response
         
         # 캐시에 저장 (카테고리 정보 포함)
         cache_data = response.dict()
         cache_data['category'] = category  # 카테고리 정보 추가
-        self.response_cache[cache_key] = cache_data
-        self._save_response_cache()
+        cache_data['review_content'] = review.content  # 로컬 분류기 시드용 원문
+        self._store_response(review, cache_key, cache_data, review_vector=review_vector)
         
         return response
     
-    def process_reviews_batch(self, reviews: List[Review]) -> List[ReviewResponse]:
-        """여러 리뷰 일괄 처리"""
-        responses = []
+    def _store_response(self, review: Review, cache_key: str, cache_data: Dict,
+                        add_similar: bool = True, review_vector: Optional[list] = None):
+        """응답 캐시(add_similar이면 유사 캐시에도) 저장 (읽기 전용이면 부모 프로세스가 저장하도록 보관)"""
+        if self.read_only:
+            with self._pending_lock:
+                self.pending_writes.append((review, cache_key, cache_data, add_similar))
+            return
         
-        print(f"{len(reviews)}개 리뷰 처리 시작...")
+        self.response_cache[cache_key] = cache_data  # 배치 처리 중이 아니면 즉시 커밋됨
         
-        for i, review in enumerate(reviews, 1):
-            print(f"처리 중: {i}/{len(reviews)} - {review.id}")
-            
+        if add_similar and self.semantic_cache is not None:
             try:
-                response = self.process_review(review)
-                responses.append(response)
+                author = self.response_generator._process_author_name(review.author)
+                self.semantic_cache.add(review, cache_data, author, review_vector)
+                if not self.response_cache.in_batch:
+                    self.semantic_cache.save()
             except Exception as e:
-                print(f"리뷰 처리 오류 {review.id}: {e}")
-                continue
+                print(f"유사 캐시 저장 오류: {e}")
+    
+    def take_pending_writes(self) -> List[Tuple[Review, str, Dict, bool]]:
+        """읽기 전용 모드에서 보관한 캐시 쓰기를 꺼내고 비움"""
+        with self._pending_lock:
+            writes, self.pending_writes = self.pending_writes, []
+        return writes
+    
+    def _response_from_similar(self, review: Review, cache_key: str, similar: Dict) -> Optional[ReviewResponse]:
+        """유사 캐시 항목으로 응답 생성 (작성자명 재개인화 후 정확 일치 캐시에도 저장)
+        
+        이전 작성자명이 응답에 남는 경우(재개인화 불가·비활성화)에는 None을 반환하여 미스로 처리합니다.
+        """
+        from services.semantic_cache import mentions_author, personalize_response
+        
+        response_text = similar['response_text']
+        old_author = similar.get('cached_author', '')
+        new_author = self.response_generator._process_author_name(review.author)
+        if Config.SEMANTIC_CACHE_PERSONALIZE:
+            response_text = personalize_response(response_text, old_author, new_author)
+        elif old_author != new_author and mentions_author(response_text, old_author):
+            response_text = None
+        if response_text is None:
+            print(f"유사 캐시 응답에 이전 작성자명이 남아 사용하지 않음: {review.id}")
+            return None
+        
+        response = ReviewResponse(
+            review_id=review.id,
+            response_text=response_text,
+            generated_at=datetime.now(),
+            country=review.country,
+            platform=review.platform,
+            used_sources=similar.get('used_sources', [])
+        )
+        review.category = similar.get('category')
         
+        cache_data = response.dict()
+        cache_data['category'] = review.category
+        cache_data['review_content'] = review.content
+        self._store_response(review, cache_key, cache_data, add_similar=False)
+        
+        return response
+    
+    def process_reviews_batch(self, reviews: List[Review], max_workers: Optional[int] = None,
+                              run_id: Optional[str] = None, processes: Optional[int] = None) -> List[ReviewResponse]:
+        """여러 리뷰 일괄 처리 (스레드 풀 동시 처리, 입력 순서 유지)
+        
+        처리 상태는 실행 저널에 리뷰마다 기록되므로, 중단된 배치를 같은 리뷰 목록(또는 같은 run_id)으로
+        다시 실행하면 완료된 리뷰는 LLM 호출 없이 건너뛰고 실패한 리뷰만 재시도 한도까지 다시 처리합니다.
+        processes(기본: BATCH_PROCESSES)가 2 이상이면 프로세스 풀로 처리하며, 이때 max_workers는
+        프로세스당 동시 처리 수입니다.
+        """
+        max_workers = max_workers or Config.BATCH_MAX_WORKERS
+        processes = Config.BATCH_PROCESSES if processes is None else processes
+        results: List[Optional[ReviewResponse]] = [None] * len(reviews)
+        journal = self._open_run_journal(run_id, reviews)
+        
+        if processes > 1:
+            from services.process_pool import ProcessPoolBatchRunner
+            
+            print(f"{len(reviews)}개 리뷰 처리 시작... (프로세스 {processes}개 × 동시 처리 {max_workers}개)")
+            results = ProcessPoolBatchRunner(self, processes, max_workers).run(reviews, journal)
+        else:
+            print(f"{len(reviews)}개 리뷰 처리 시작... (동시 처리 {max_workers}개)")
+            
+            # 캐시에 없는 리뷰의 RAG 문서를 국가별로 한 번에 검색
+            with metrics.span("retrieval_batch", reviews=len(reviews)):
+                contexts = self._prefetch_contexts(reviews, journal)
+            
+            # 캐시 쓰기는 배치 종료 시 한 번만 커밋
+            with self.response_cache.batch():
+                with ThreadPoolExecutor(max_workers=max_workers, initializer=self.response_cache.join_batch) as executor:
+                    futures = {
+                        executor.submit(self.process_review, review, contexts.get(i), journal): i
+                        for i, review in enumerate(reviews)
+                    }
+                    
+                    for done, future in enumerate(as_completed(futures), 1):
+                        i = futures[future]
+                        review = reviews[i]
+                        try:
+                            results[i] = future.result()
+                            print(f"처리 완료: {done}/{len(reviews)} - {review.id}")
+                        except Exception as e:
+                            print(f"리뷰 처리 오류 {review.id}: {e}")
+        
+        if self._semantic_cache is not None:
+            self._semantic_cache.save()
+        
+        responses = [response for response in results if response is not None]
         print(f"총 {len(responses)}개 응답 생성 완료")
+        if journal is not None:
+            print(f"실행 저널 {journal.run_id}: {journal.summary()}")
+            journal.close()
+        
+        try:
+            metrics.write_prometheus()
+        except Exception as e:
+            print(f"계측 파일 저장 오류: {e}")
         return responses
     
+    def process_review_file(self, input_path: str, output_path: Optional[str] = None, resume: bool = True,
+                            max_workers: Optional[int] = None) -> Dict:
+        """CSV/JSONL 리뷰 파일 스트림 처리 (일정한 메모리, 응답은 JSONL로 출력, 중단 시 체크포인트에서 재개)"""
+        from services.review_stream import ReviewStreamProcessor
+        
+        try:
+            return ReviewStreamProcessor(self).process_file(
+                input_path, output_path, resume=resume, max_workers=max_workers
+            )
+        finally:
+            if self._semantic_cache is not None:
+                self._semantic_cache.save()
+            try:
+                metrics.write_prometheus()
+            except Exception as e:
+                print(f"계측 파일 저장 오류: {e}")
+    
+    def _open_run_journal(self, run_id: Optional[str], reviews: List[Review]) -> Optional["RunJournal"]:
+        """실행 저널 열기 및 리뷰 등록 (비활성화 시 None, 내용 키는 응답 캐시 키)"""
+        if not Config.RUN_JOURNAL_ENABLED:
+            return None
+        
+        from services.run_journal import RunJournal
+        
+        entries = [(review.id, self._generate_cache_key(review)) for review in reviews]
+        journal = RunJournal(run_id or RunJournal.run_id_for(f"{review_id}:{content_key}" for review_id, content_key in entries))
+        journal.register(entries)
+        return journal
+    
+    def _prefetch_contexts(self, reviews: List[Review], journal: Optional["RunJournal"] = None) -> Dict[int, List]:
+        """캐시에 없는 리뷰의 RAG 문서를 국가별 일괄 검색 (리뷰 인덱스 → 문서 목록)
+        
+        리뷰 임베딩이 임베딩 캐시에 저장되므로 이후 유사 캐시 조회·로컬 분류도 API 호출 없이 처리됩니다.
+        """
+        by_country: Dict[str, List[int]] = {}
+        for i, review in enumerate(reviews):
+            cache_key = self._generate_cache_key(review)
+            if journal is not None and (journal.get(review.id, cache_key) or {}).get("response"):
+                continue
+            if cache_key not in self.response_cache:
+                by_country.setdefault(review.country.lower(), []).append(i)
+        
+        # 유사 캐시 조회가 어차피 리뷰를 임베딩하므로 미리 한 번에 임베딩 (BM25 결과가 확실해도 하이브리드 검색)
+        if self.semantic_cache is not None:
+            pending = [reviews[i].content for indices in by_country.values() for i in indices]
+            if pending:
+                try:
+                    self.vector_store_service.embeddings.embed_documents(pending)
+                except Exception as e:
+                    print(f"리뷰 임베딩 오류: {e}")
+        
+        contexts = {}
+        for country, indices in by_country.items():
+            if country not in self.vector_store_service.vector_stores:
+                continue
+            results = self.vector_store_service.similarity_search_many(
+                [reviews[i].content for i in indices], country, k=self.response_generator.RETRIEVAL_K
+            )
+            # 검색 실패·빈 결과는 개별 처리 시 다시 검색
+            contexts.update((i, docs) for i, docs in zip(indices, results) if docs)
+        
+        return contexts
+    
     def update_knowledge_base(self):
-        """지식베이스 강제 업데이트"""
-        print("지식베이스 강제 업데이트 시작...")
+        """지식베이스 증분 업데이트 (변경된 청크만 재임베딩)"""
+        with self.kb_update_lock:
+            self._update_knowledge_base()
+    
+    def _update_knowledge_base(self):
+        print("지식베이스 업데이트 시작...")
         
         try:
-            # 기존 벡터 저장소 삭제
-            if os.path.exists(Config.VECTOR_STORE_PATH):
-                import shutil
-                shutil.rmtree(Config.VECTOR_STORE_PATH)
+            # 웹 문서 수집
+            documents = self.document_loader.load_web_documents(Config.KNOWLEDGE_BASE_URLS)
+            print(f"총 {len(documents)}개 문서 청크 수집됨")
             
-            # 새로운 지식베이스 생성
-            self.initialize_knowledge_base(force_update=True)
-            print("지식베이스 강제 업데이트 완료")
+            # 국가별 증분 갱신 (수집 실패한 국가는 기존 저장소 유지)
+            for country in Config.COUNTRIES:
+                self.vector_store_service.refresh_vector_store(
+                    documents, country.lower(), resolved_sources=self.document_loader.resolved_urls
+                )
             
+            print("지식베이스 업데이트 완료")
+        
         except Exception as e:
             print(f"지식베이스 업데이트 오류: {e}")
     
+    def rollback_knowledge_base(self, country: Optional[str] = None) -> Dict[str, bool]:
+        """지식베이스를 직전 버전으로 되돌림 (country가 없으면 모든 국가)"""
+        countries = [country.lower()] if country else [c.lower() for c in Config.COUNTRIES]
+        with self.kb_update_lock:
+            return {c: self.vector_store_service.rollback(c) for c in countries}
+    
     def get_statistics(self) -> Dict:
-        """처리 통계 조회"""
+        """처리 통계 조회 (응답 캐시의 증분 집계를 읽으므로 캐시 크기와 무관)"""
         total_responses = len(self.response_cache)
         
-        # 국가별 통계
-        country_stats = {}
-        category_stats = {}
-        platform_stats = {}
-        daily_stats = {}
-        response_times = []
-        
-        for cache_key, response_data in self.response_cache.items():
-            country = response_data.get('country', 'Unknown')
-            platform = response_data.get('platform', 'Unknown')
-            category = response_data.get('category', 'Unknown')
-            generated_at = response_data.get('generated_at', '')
-            
-            # 국가별 통계
-            if country not in country_stats:
-                country_stats[country] = 0
-            country_stats[country] += 1
-            
-            # 카테고리별 통계
-            if category not in category_stats:
-                category_stats[category] = 0
-            category_stats[category] += 1
-            
-            # 플랫폼별 통계
-            if platform not in platform_stats:
-                platform_stats[platform] = 0
-            platform_stats[platform] += 1
-            
-            # 일별 통계 (최근 7일)
-            if generated_at:
-                try:
-                    date_str = generated_at.split('T')[0]  # YYYY-MM-DD 형태로 추출
-                    if date_str not in daily_stats:
-                        daily_stats[date_str] = 0
-                    daily_stats[date_str] += 1
-                except:
-                    pass
+        # 국가별 / 카테고리별 / 플랫폼별 / 일별(최근 7일) 통계
+        country_stats = self.response_cache.stat_counts("country")
+        category_stats = self.response_cache.stat_counts("category")
+        platform_stats = self.response_cache.stat_counts("platform")
+        daily_stats = self.response_cache.stat_counts("daily", limit=7)
         
         # 벡터 저장소 상태 및 문서 수
         vector_store_info = {}
@@ -177,25 +476,32 @@ class ReviewBot:
         
         for store in existing_stores:
             try:
-                # 벡터 저장소 로드하여 문서 수 확인
-                if hasattr(self.vector_store_service, 'get_document_count'):
-                    doc_count = self.vector_store_service.get_document_count(store)
+                if self._vector_store_service is not None and store in self._vector_store_service.vector_stores:
+                    vector_store_info[store] = {
+                        "loaded": True,
+                        "document_count": self._vector_store_service.get_document_count(store)
+                    }
                 else:
-                    doc_count = "Unknown"
-                
-                vector_store_info[store] = {
-                    "loaded": True,
-                    "document_count": doc_count
-                }
+                    # 저장소를 로드하지 않고 매니페스트의 문서 수 사용
+                    vector_store_info[store] = {
+                        "loaded": False,
+                        "document_count": self._manifest_document_count(store)
+                    }
             except:
                 vector_store_info[store] = {
                     "loaded": False,
                     "document_count": 0
                 }
         
-        # 성능 통계
+        # 성능 통계 (적중률은 이 프로세스에서 조회한 리뷰 기준, 유사 캐시 적중 포함)
+        counters = metrics.summary()["counters"]
+        exact_hits = counters.get("response_cache_hits_total", 0)
+        lookups = exact_hits + counters.get("response_cache_misses_total", 0)
+        semantic_hit_rate = metrics.hit_rate("semantic_cache")
         performance_stats = {
-            "cache_hit_rate": f"{(len(self.response_cache) / max(total_responses, 1) * 100):.1f}%" if total_responses > 0 else "0%",
+            "cache_hit_rate": f"{(exact_hits + counters.get('semantic_cache_hits_total', 0)) / lookups * 100:.1f}%" if lookups else "N/A",
+            "exact_cache_hit_rate": f"{exact_hits / lookups * 100:.1f}%" if lookups else "N/A",
+            "semantic_cache_hit_rate": f"{semantic_hit_rate * 100:.1f}%" if semantic_hit_rate is not None else "N/A",
             "avg_response_length": self._calculate_avg_response_length(),
             "total_cache_size": f"{self._get_cache_file_size():.2f} MB"
         }
@@ -205,41 +511,63 @@ class ReviewBot:
             "국가별 분포": country_stats,
             "카테고리별 분포": category_stats,
             "플랫폼별 분포": platform_stats,
-            "일별 처리량 (최근)": dict(sorted(daily_stats.items(), reverse=True)[:7]),
+            "일별 처리량 (최근)": daily_stats,
             "벡터 저장소 상태": vector_store_info,
             "성능 지표": performance_stats,
+            "분류 단계별 처리량": dict(self._review_classifier.tier_counts) if self._review_classifier is not None else {},
+            "단계별 지연 시간 (ms)": metrics.summary()["stages"],
+            "토큰 사용량": {
+                "LLM 호출 수": counters.get("llm_calls_total", 0),
+                "프롬프트 토큰": counters.get("llm_prompt_tokens_total", 0),
+                "프롬프트 캐시 토큰": counters.get("llm_prompt_cached_tokens_total", 0),
+                "프롬프트 캐시 비율": f"{metrics.cached_prompt_ratio() * 100:.1f}%" if metrics.cached_prompt_ratio() is not None else "N/A",
+                "완성 토큰": counters.get("llm_completion_tokens_total", 0),
+                "추정값 사용 호출 수": counters.get("llm_usage_estimated_total", 0)
+            },
+            "RAG 컨텍스트 토큰": self._context_token_stats(),
             "마지막 업데이트": datetime.now().isoformat(),
             "시스템 상태": {
-                "캐시 파일 존재": os.path.exists("response_cache.json"),
+                "캐시 파일 존재": os.path.exists(Config.RESPONSE_CACHE_PATH),
                 "벡터 저장소 경로": Config.VECTOR_STORE_PATH,
                 "지원 국가": Config.COUNTRIES,
                 "지원 카테고리": Config.REVIEW_CATEGORIES
             }
         }
     
+    def _context_token_stats(self) -> Dict:
+        """토큰 예산 적용 전(검색 결과 전체 연결) 대비 RAG 컨텍스트 토큰 절감량"""
+        from services.context_builder import ContextBuilder
+        
+        savings = ContextBuilder.savings()
+        if savings is None:
+            return {}
+        return {
+            "구성 횟수": savings["builds"],
+            "사용 토큰": savings["context_tokens"],
+            "기존 방식 토큰": savings["baseline_tokens"],
+            "절감 토큰": savings["saved_tokens"],
+            "절감률": f"{savings['saved_ratio'] * 100:.1f}%"
+        }
+    
     def _calculate_avg_response_length(self) -> float:
         """평균 응답 길이 계산"""
-        if not self.response_cache:
-            return 0.0
-        
-        total_length = 0
-        count = 0
-        
-        for response_data in self.response_cache.values():
-            response_text = response_data.get('response_text', '')
-            if response_text:
-                total_length += len(response_text)
-                count += 1
-        
-        return total_length / count if count > 0 else 0.0
+        return self.response_cache.average_response_length()
     
     def _get_cache_file_size(self) -> float:
         """캐시 파일 크기 (MB)"""
-        cache_file = "response_cache.json"
-        if os.path.exists(cache_file):
-            size_bytes = os.path.getsize(cache_file)
-            return size_bytes / (1024 * 1024)  # MB로 변환
-        return 0.0
+        return self.response_cache.file_size() / (1024 * 1024)  # MB로 변환
+    
+    def _manifest_document_count(self, country: str) -> int:
+        """벡터 저장소 매니페스트에 기록된 문서 수 (매니페스트가 없으면 0)"""
+        store_path = resolve_store_path(country)
+        if store_path is None:
+            return 0
+        manifest_path = os.path.join(store_path, "manifest.json")
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("document_count", 0)
+        except Exception:
+            return 0
     
     def _generate_cache_key(self, review: Review) -> str:
         """캐시 키 생성"""
@@ -248,34 +576,50 @@ class ReviewBot:
         content = f"{review.content}_{review.country}_{review.platform}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    def _load_response_cache(self) -> Dict:
-        """응답 캐시 로드"""
-        cache_file = "response_cache.json"
-        
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"캐시 로드 오류: {e}")
-                return {}
-        
-        return {}
+    def _load_classifier_seeds(self) -> List[tuple]:
+        """응답 캐시에서 (리뷰 원문, 카테고리) 시드 추출"""
+        try:
+            return [
+                (data['review_content'], data['category'])
+                for data in self.response_cache.recent(Config.LOCAL_CLASSIFIER_MAX_CACHE_SEEDS)
+                if data.get('review_content') and data.get('category')
+            ]
+        except Exception as e:
+            print(f"분류기 시드 로드 오류: {e}")
+            return []
     
-    def _save_response_cache(self):
-        """응답 캐시 저장"""
-        cache_file = "response_cache.json"
-        
+    def _load_response_cache(self) -> ResponseCacheStore:
+        """응답 캐시 로드 (기존 JSON 캐시는 최초 1회 자동 이전, 읽기 전용 모드는 mode=ro로 연결)"""
+        return ResponseCacheStore(Config.RESPONSE_CACHE_PATH, Config.LEGACY_RESPONSE_CACHE_FILE, read_only=self.read_only)
+    
+    def compact_cache(self):
+        """캐시 저장소 압축"""
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.response_cache, f, ensure_ascii=False, indent=2, default=str)
+            self.response_cache.compact()
         except Exception as e:
-            print(f"캐시 저장 오류: {e}")
+            print(f"캐시 압축 오류: {e}")
+    
+    def approve_response(self, review: Review, approved: bool = True) -> bool:
+        """리뷰에 대해 캐시된 답변을 승인(few-shot 예시로 사용)하거나 승인 취소 (캐시에 없으면 False)"""
+        if not self.response_cache.approve(self._generate_cache_key(review), approved):
+            return False
+        if self._example_store is not None:
+            self._example_store.refresh()
+        return True
     
     def clear_cache(self):
         """캐시 초기화"""
-        self.response_cache = {}
-        cache_file = "response_cache.json"
-        if os.path.exists(cache_file):
-            os.remove(cache_file)
+        self.response_cache.clear()
+        if self._example_store is not None:
+            # 승인된 답변 예시도 함께 삭제됨
+            self._example_store.refresh()
+        if self._semantic_cache is not None:
+            self._semantic_cache.clear()
+        elif os.path.exists(Config.SEMANTIC_CACHE_PATH):
+            # 유사 캐시를 생성하지 않고 저장 파일만 삭제
+            shutil.rmtree(Config.SEMANTIC_CACHE_PATH)
+        # 실행 저널의 기록된 응답도 함께 삭제
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(Config.RUN_JOURNAL_PATH + suffix):
+                os.remove(Config.RUN_JOURNAL_PATH + suffix)
         print("캐시가 초기화되었습니다.") 
\ No newline at end of file
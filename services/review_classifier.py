@@ -1,24 +1,17 @@
-from typing import Dict
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
+from langchain_core.embeddings import Embeddings
 from langchain_core.prompts import ChatPromptTemplate
 from config import Config
 from models.review import Review
+from services.rate_limiter import openai_rate_limiter
+from services.metrics import invoke_llm
+from utils.review_cases import load_review_cases
 
-class ReviewClassifier:
-    """리뷰 분류 서비스"""
-    
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model_name=Config.LLM_MODEL,
-            api_key=Config.OPENAI_API_KEY,
-            temperature=0
-        )
-        
-        self.classification_prompt = ChatPromptTemplate.from_messages([
-            ("system", """당신은 모바일 앱 리뷰를 분류하는 전문가입니다.
-주어진 리뷰를 다음 카테고리 중 하나로 분류해주세요:
-
-**카테고리 및 예시:**
+# 카테고리 정의 및 예시 (분류 프롬프트와 분류+응답 통합 프롬프트에서 공용)
+CATEGORY_GUIDE = """**카테고리 및 예시:**
 - 포인트_관련: 포인트 미지급, 포인트 감소, 포인트 적립 문제
   예시: "광고보고 포인트 지급 안됨", "포인트가 줄어들었어요"
   
@@ -43,17 +36,257 @@ class ReviewClassifier:
 - 칭찬: 긍정적 피드백, 만족 표현, 감사 인사
   예시: "앱이 좋아요", "도움이 많이 돼요", "감사합니다"
   
-- 기타: 위 카테고리에 해당하지 않는 경우
+- 기타: 위 카테고리에 해당하지 않는 경우"""
+
+
+# 카테고리별 키워드 규칙 (한국어/영어)
+KEYWORD_RULES = {
+    "포인트_관련": [r"포인트", r"적립", r"\bpoints?\b"],
+    "광고_관련": [r"광고", r"\bads?\b", r"advert"],
+    "기능_오류": [r"수면\s*모드", r"잠자기", r"걸음\s*수", r"오류|버그|튕|꺼져|멈춰", r"\bsteps?\b", r"crash", r"\bbugs?\b", r"not working|doesn'?t work"],
+    "접근성": [r"voice\s*over", r"시각\s*장애", r"접근성", r"low vision", r"\bblind\b", r"accessib"],
+    "상품_교환": [r"기프트\s*카드", r"교환", r"gift\s*card", r"redeem|redemption|cash(ing)?\s*out"],
+    "친구_초대": [r"초대\s*코드", r"친구\s*초대", r"\binvit", r"referral"],
+    "문의_누락": [r"문의.*(답변|연락|응답).*(없|안)", r"채널톡", r"no (one )?(reply|replied|response)", r"(haven'?t|never) (received|got(ten)?) (any )?(reply|response)", r"contacted support"],
+    "칭찬": [r"좋아요|최고|감사합니다|재미있|만족", r"\b(great|love|awesome|excellent|thanks?)\b"]
+}
+
+# 매칭 바로 앞의 부정어 ("안 좋아요", "못 받았어요", "not great", "isn't very good")
+NEGATION_BEFORE = re.compile(r"(?:(?:^|\s)(?:안|못)\s*|\b(?:not|never|no)\s+(?:\w+\s+)?|n't\s+(?:\w+\s+)?)$", re.IGNORECASE)
+
+# 부정·역접 표현 (리뷰에 있으면 칭찬 매칭을 신뢰하지 않음, 예: "I love how it never pays")
+NEGATION_OR_CONTRAST = re.compile(
+    r"(?:^|\s)(?:안|못)\s|않|없|지만|는데|그런데|근데|\b(?:not|never|no|but|however)\b|n't",
+    re.IGNORECASE
+)
+
+class LocalReviewClassifier:
+    """로컬 경량 분류기 (키워드 규칙 + 임베딩 중심점 최근접 분류)
+
+    - 규칙: 정규식 매칭, 마이크로초 단위
+    - 중심점: 시드 예시 임베딩의 카테고리별 평균 벡터와 코사인 유사도 비교
+    시드는 CATEGORY_GUIDE 예시, KR/US 케이스 CSV, 응답 캐시의 분류 결과에서 가져옵니다.
+    """
+    
+    # 규칙 신뢰도가 최대가 되는 매칭 키워드 수 (약한 매칭 하나로는 확정하지 않음)
+    STRONG_MATCH_HITS = 2
+    
+    def __init__(self, embeddings: Optional[Embeddings] = None, seed_examples: Optional[List[Tuple[str, str]]] = None):
+        self.embeddings = embeddings
+        self.seed_examples = seed_examples or []
+        self.rules = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for category, patterns in KEYWORD_RULES.items()
+        }
+        self._centroids = None  # (카테고리 목록, 정규화된 중심점 행렬)
+        self._centroid_lock = threading.Lock()
+    
+    def classify_by_rules(self, text: str) -> Tuple[Optional[str], float]:
+        """키워드 규칙 분류 (카테고리, 신뢰도)
+        
+        신뢰도 = 매칭 강도(서로 다른 매칭 키워드 수 / STRONG_MATCH_HITS, 최대 1) × 2위 대비 차이 비율이므로
+        약한 매칭 하나만 있거나 두 카테고리가 비슷하게 매칭되면 임계값에 못 미쳐 중심점/LLM 단계로 넘어갑니다.
+        부정어 바로 뒤의 매칭은 세지 않고, 부정·역접 표현이 있는 리뷰의 칭찬 매칭은 무시합니다.
+        """
+        negated = NEGATION_OR_CONTRAST.search(text) is not None
+        scores = {}
+        for category, patterns in self.rules.items():
+            if category == "칭찬" and negated:
+                continue
+            hits = len(set().union(*(self._matched_terms(pattern, text) for pattern in patterns)))
+            if hits:
+                scores[category] = hits
+        
+        if not scores:
+            return None, 0.0
+        
+        category = max(scores, key=scores.get)
+        top = scores[category]
+        runner_up = max((hits for other, hits in scores.items() if other != category), default=0)
+        strength = min(top, self.STRONG_MATCH_HITS) / self.STRONG_MATCH_HITS
+        return category, strength * (top - runner_up) / top
+    
+    @staticmethod
+    def _matched_terms(pattern: "re.Pattern", text: str) -> set:
+        """부정어 바로 뒤가 아닌 매칭 문자열 집합 (소문자)"""
+        return {
+            match.group(0).lower() for match in pattern.finditer(text)
+            if not NEGATION_BEFORE.search(text[:match.start()])
+        }
+    
+    def classify_by_centroid(self, text: str) -> Tuple[Optional[str], float]:
+        """중심점 최근접 분류 (카테고리, 신뢰도) - 신뢰도는 유사도 softmax 확률
+        
+        softmax는 중심점 사이의 상대 비교이므로, 어느 카테고리와도 멀거나(LOCAL_CLASSIFIER_MIN_SIMILARITY 미만)
+        1·2위 차이가 작으면(LOCAL_CLASSIFIER_MIN_MARGIN 미만) 범위 밖 리뷰(기타 후보)로 보고 LLM 단계로 넘깁니다.
+        리뷰 임베딩이 캐시에 없으면(유사 캐시 조회·검색 사전 임베딩 전) API를 호출하지 않고 넘깁니다.
+        """
+        centroids = self._get_centroids()
+        if centroids is None:
+            return None, 0.0
+        
+        is_cached = getattr(self.embeddings, "is_cached", None)
+        if not Config.LOCAL_CLASSIFIER_EMBED_ON_MISS and is_cached is not None and not is_cached([text])[0]:
+            return None, 0.0
+        
+        import numpy as np
+        
+        categories, matrix = centroids
+        query = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None, 0.0
+        
+        similarities = matrix @ (query / norm)
+        ranked = np.sort(similarities)[::-1]
+        runner_up = ranked[1] if len(ranked) > 1 else -1.0
+        if ranked[0] < Config.LOCAL_CLASSIFIER_MIN_SIMILARITY or ranked[0] - runner_up < Config.LOCAL_CLASSIFIER_MIN_MARGIN:
+            return None, 0.0
+        
+        logits = (similarities - similarities.max()) / Config.LOCAL_CLASSIFIER_TEMPERATURE
+        probabilities = np.exp(logits) / np.exp(logits).sum()
+        best = int(np.argmax(probabilities))
+        return categories[best], float(probabilities[best])
+    
+    def _get_centroids(self):
+        if self.embeddings is None:
+            return None
+        
+        with self._centroid_lock:
+            if self._centroids is None:
+                self._centroids = self._build_centroids()
+        
+        return self._centroids or None
+    
+    def _build_centroids(self):
+        """시드 예시를 한 번에 임베딩하여 카테고리별 중심점 계산"""
+        import numpy as np
+        
+        examples = self._collect_seed_examples()
+        if not examples:
+            return ()
+        
+        try:
+            vectors = np.asarray(
+                self.embeddings.embed_documents([text for text, _ in examples]),
+                dtype=np.float32
+            )
+        except Exception as e:
+            print(f"로컬 분류기 중심점 생성 실패: {e}")
+            return ()
+        
+        categories = sorted({category for _, category in examples})
+        rows = []
+        for category in categories:
+            members = vectors[[i for i, (_, c) in enumerate(examples) if c == category]]
+            centroid = members.mean(axis=0)
+            rows.append(centroid / max(np.linalg.norm(centroid), 1e-12))
+        
+        print(f"로컬 분류기 중심점 생성 완료: {len(examples)}개 예시, {len(categories)}개 카테고리")
+        return categories, np.vstack(rows)
+    
+    def _collect_seed_examples(self) -> List[Tuple[str, str]]:
+        examples = []
+        
+        # 카테고리 가이드의 예시 문구
+        current = None
+        for line in CATEGORY_GUIDE.splitlines():
+            header = re.match(r"- (\S+):", line.strip())
+            if header and header.group(1) in Config.REVIEW_CATEGORIES:
+                current = header.group(1)
+            elif current and line.strip().startswith("예시:"):
+                examples.extend((phrase, current) for phrase in re.findall(r'"([^"]+)"', line))
+        
+        # KR/US 케이스 CSV
+        examples.extend(
+            (case["review"], case["category"])
+            for case in load_review_cases() if case["category"]
+        )
+        
+        # 응답 캐시 등 외부에서 전달된 (리뷰, 카테고리) 예시
+        examples.extend(
+            (text, category) for text, category in self.seed_examples
+            if text and category in Config.REVIEW_CATEGORIES
+        )
+        
+        return examples
+
+class ReviewClassifier:
+    """리뷰 분류 서비스"""
+    
+    # 분류 프롬프트 + 카테고리명 응답의 대략적인 토큰 수
+    CLASSIFICATION_TOKEN_ESTIMATE = 700
+    
+    def __init__(self, embeddings: Optional[Embeddings] = None, seed_examples: Optional[List[Tuple[str, str]]] = None):
+        self.llm = ChatOpenAI(
+            model_name=Config.LLM_MODEL,
+            api_key=Config.OPENAI_API_KEY,
+            base_url=Config.OPENAI_BASE_URL,
+            temperature=0,
+            max_retries=0  # 재시도는 공용 RateLimiter에서 처리
+        )
+        
+        self.classification_prompt = ChatPromptTemplate.from_messages([
+            ("system", """당신은 모바일 앱 리뷰를 분류하는 전문가입니다.
+주어진 리뷰를 다음 카테고리 중 하나로 분류해주세요:
+
+""" + CATEGORY_GUIDE + """
 
 오직 카테고리명만 반환해주세요."""),
             ("user", "리뷰 내용: {review_content}")
         ])
+        
+        # 로컬 분류 단계 (신뢰도가 낮을 때만 LLM 사용)
+        self.local_classifier = LocalReviewClassifier(embeddings, seed_examples) if Config.LOCAL_CLASSIFIER_ENABLED else None
+        self.tier_counts = {"rules": 0, "centroid": 0, "llm": 0}
+        self._tier_lock = threading.Lock()
     
     def classify_review(self, review: Review) -> str:
-        """리뷰 분류"""
+        """리뷰 분류 (규칙 → 중심점 → LLM 순으로 신뢰도가 충분한 단계에서 결정)"""
+        if self.local_classifier is not None:
+            threshold = Config.LOCAL_CLASSIFIER_CONFIDENCE_THRESHOLD
+            
+            category, confidence = self.local_classifier.classify_by_rules(review.content)
+            if category and confidence >= threshold:
+                self._count_tier("rules")
+                return category
+            
+            try:
+                category, confidence = self.local_classifier.classify_by_centroid(review.content)
+                if category and confidence >= threshold:
+                    self._count_tier("centroid")
+                    return category
+            except Exception as e:
+                print(f"로컬 분류 오류: {e}")
+        
+        self._count_tier("llm")
+        return self._classify_with_llm(review)
+    
+    def _count_tier(self, tier: str):
+        with self._tier_lock:
+            self.tier_counts[tier] += 1
+    
+    def take_tier_counts(self) -> Dict[str, int]:
+        """단계별 처리량을 꺼내고 0으로 초기화 (프로세스 풀 작업자 → 부모 전달용)"""
+        with self._tier_lock:
+            counts, self.tier_counts = self.tier_counts, dict.fromkeys(self.tier_counts, 0)
+        return counts
+    
+    def merge_tier_counts(self, counts: Dict[str, int]):
+        """작업자 프로세스의 단계별 처리량 합산"""
+        with self._tier_lock:
+            for tier, count in counts.items():
+                self.tier_counts[tier] = self.tier_counts.get(tier, 0) + count
+    
+    def _classify_with_llm(self, review: Review) -> str:
+        """LLM 프롬프트 분류"""
         try:
-            chain = self.classification_prompt | self.llm
-            result = chain.invoke({"review_content": review.content})
+            result = invoke_llm(
+                self.llm,
+                self.classification_prompt.format_messages(review_content=review.content),
+                estimated_tokens=self.CLASSIFICATION_TOKEN_ESTIMATE + openai_rate_limiter.estimate_tokens(review.content),
+                stage="classification"
+            )
             
             category = result.content.strip()
             
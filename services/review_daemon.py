@@ -0,0 +1,309 @@
+import asyncio
+import json
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from config import Config
+from models.review import Review
+
+if TYPE_CHECKING:
+    from services.review_bot import ReviewBot
+
+# HTTP 상태 코드 → 사유 문구
+STATUS_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                  405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+                  431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class ReviewDaemon:
+    """리뷰봇 데몬 (asyncio 기반 로컬 HTTP API)
+
+    ReviewBot과 벡터 저장소를 한 번만 로드하고 요청마다 재사용합니다.
+    - POST /reviews: 리뷰 1건(객체) 또는 여러 건({"reviews": [...]} 또는 배열) 처리
+    - POST /reviews/approve: 리뷰에 대해 캐시된 답변 승인 (few-shot 예시로 사용, {"approved": false}면 승인 취소)
+    - GET /stats: 처리 통계 + 데몬 상태
+    - POST /kb/refresh: 지식베이스 증분 업데이트를 백그라운드로 시작 (진행 중이면 409)
+    - POST /kb/rollback: 지식베이스를 직전 버전으로 되돌림 ({"country": "kr"}로 국가 지정 가능)
+    내용·국가·플랫폼이 같은 리뷰(같은 응답 캐시 키)가 동시에 들어오면 한 번만 처리하고 결과를 공유합니다.
+    UpdateScheduler도 같은 프로세스에서 실행됩니다.
+    """
+    
+    def __init__(self, bot: "ReviewBot", host: Optional[str] = None, port: Optional[int] = None,
+                 max_workers: Optional[int] = None, run_scheduler: bool = True):
+        self.bot = bot
+        self.host = host or Config.DAEMON_HOST
+        self.port = port or Config.DAEMON_PORT
+        self.run_scheduler = run_scheduler
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or Config.BATCH_MAX_WORKERS)
+        
+        self._in_flight: Dict[str, asyncio.Future] = {}  # 응답 캐시 키 → 처리 중인 결과
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._last_refresh: Optional[Dict] = None
+        self._started_at = time.monotonic()
+        self.counters = {"requests": 0, "reviews": 0, "coalesced": 0, "errors": 0}
+    
+    def serve_forever(self):
+        """지식베이스 로드 후 종료 신호(SIGINT/SIGTERM)까지 요청 처리"""
+        asyncio.run(self._serve())
+    
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.bot.initialize_knowledge_base, False)
+        
+        scheduler = None
+        if self.run_scheduler:
+            from schedulers.update_scheduler import UpdateScheduler
+            
+            scheduler = UpdateScheduler(self.bot)
+            scheduler.setup_schedule()
+            scheduler.start_scheduler()
+        
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # 메인 스레드가 아니거나 지원하지 않는 플랫폼
+        
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"리뷰봇 데몬 시작: http://{self.host}:{self.port}")
+        
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            print("리뷰봇 데몬 종료 중...")
+            if scheduler is not None:
+                scheduler.stop_scheduler()
+            if self._refresh_task is not None:
+                await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self.executor.shutdown(wait=True)
+    
+    # HTTP 처리
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, version, headers, body = request
+                
+                try:
+                    status, payload = await self._dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    self.counters["errors"] += 1
+                    print(f"데몬 요청 처리 오류 {method} {path}: {e}")
+                    status, payload = 500, {"error": str(e)}
+                
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            await self._write_response(writer, e.status, {"error": str(e)}, False)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+        request_line = await self._read_line(reader)
+        if not request_line.strip():
+            return None
+        
+        try:
+            method, target, version = request_line.decode('latin-1').strip().split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "잘못된 요청 줄입니다.")
+        
+        headers = {}
+        while True:
+            line = await self._read_line(reader)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HttpError(400, "Content-Length 헤더가 올바르지 않습니다.")
+        if length > Config.DAEMON_MAX_BODY_BYTES:
+            raise HttpError(413, f"요청 본문은 {Config.DAEMON_MAX_BODY_BYTES} bytes 이하여야 합니다.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?")[0].rstrip("/") or "/", version.upper(), headers, body
+    
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader) -> bytes:
+        """요청 줄/헤더 한 줄 읽기 (StreamReader 한도를 넘는 줄은 431)"""
+        try:
+            return await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError):
+            raise HttpError(431, "요청 줄 또는 헤더가 너무 깁니다.")
+    
+    async def _write_response(self, writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+    
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        self.counters["requests"] += 1
+        routes = {
+            "/reviews": ("POST", self._post_reviews),
+            "/reviews/approve": ("POST", self._post_review_approve),
+            "/stats": ("GET", self._get_stats),
+            "/kb/refresh": ("POST", self._post_kb_refresh),
+            "/kb/rollback": ("POST", self._post_kb_rollback)
+        }
+        if path not in routes:
+            raise HttpError(404, f"알 수 없는 경로입니다: {path}")
+        expected_method, handler = routes[path]
+        if method != expected_method:
+            raise HttpError(405, f"{path}는 {expected_method}만 지원합니다.")
+        return await handler(body)
+    
+    # API
+    async def _post_reviews(self, body: bytes) -> Tuple[int, Dict]:
+        from utils.review_reader import parse_review
+        
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            raise HttpError(400, "요청 본문이 올바른 JSON이 아닙니다.")
+        
+        single = isinstance(data, dict) and "reviews" not in data
+        rows = [data] if single else (data.get("reviews") if isinstance(data, dict) else data)
+        if not isinstance(rows, list) or not rows:
+            raise HttpError(400, "리뷰 객체 또는 {\"reviews\": [...]} 형식이어야 합니다.")
+        
+        received = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        reviews = []
+        for i, row in enumerate(rows):
+            review = parse_review(row, f"api_{received}_{i}") if isinstance(row, dict) else None
+            if review is None:
+                raise HttpError(400, f"{i}번째 리뷰에 내용(content)이 없습니다.")
+            reviews.append(review)
+        
+        results = await asyncio.gather(*(self._process(review) for review in reviews), return_exceptions=True)
+        responses, failed = [], []
+        for review, result in zip(reviews, results):
+            if isinstance(result, Exception):
+                failed.append({"review_id": review.id, "error": str(result)})
+            else:
+                responses.append(result)
+        
+        if single:
+            if failed:
+                raise HttpError(500, failed[0]["error"])
+            return 200, responses[0]
+        return 200, {"responses": responses, "failed": failed}
+    
+    async def _post_review_approve(self, body: bytes) -> Tuple[int, Dict]:
+        from utils.review_reader import parse_review
+        
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            raise HttpError(400, "요청 본문이 올바른 JSON이 아닙니다.")
+        review = parse_review(data, "approve") if isinstance(data, dict) else None
+        if review is None:
+            raise HttpError(400, "승인할 리뷰의 내용(content)이 없습니다.")
+        
+        approved = bool(data.get("approved", True))
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(self.executor, self.bot.approve_response, review, approved):
+            raise HttpError(404, "이 리뷰에 대해 캐시된 답변이 없습니다.")
+        return 200, {"approved": approved}
+    
+    async def _process(self, review: Review) -> Dict:
+        """리뷰 1건 처리 (같은 캐시 키의 요청이 처리 중이면 그 결과를 기다려 공유)"""
+        self.counters["reviews"] += 1
+        key = self.bot._generate_cache_key(review)
+        future = self._in_flight.get(key)
+        
+        if future is not None:
+            self.counters["coalesced"] += 1
+            response = await asyncio.shield(future)
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, self.bot.process_review, review)
+            self._in_flight[key] = future
+            try:
+                response = await asyncio.shield(future)
+            finally:
+                self._in_flight.pop(key, None)
+        
+        return {**response.dict(), "review_id": review.id}
+    
+    async def _get_stats(self, body: bytes) -> Tuple[int, Dict]:
+        loop = asyncio.get_running_loop()
+        stats = await loop.run_in_executor(self.executor, self.bot.get_statistics)
+        stats["데몬 상태"] = {
+            "uptime_seconds": round(time.monotonic() - self._started_at, 1),
+            "in_flight": len(self._in_flight),
+            "kb_refresh_running": self._kb_update_running(),
+            "last_kb_refresh": self._last_refresh,
+            **self.counters
+        }
+        return 200, stats
+    
+    async def _post_kb_refresh(self, body: bytes) -> Tuple[int, Dict]:
+        if self._kb_update_running():
+            raise HttpError(409, "지식베이스 업데이트가 이미 진행 중입니다.")
+        
+        self._refresh_task = asyncio.create_task(self._refresh_knowledge_base())
+        return 202, {"status": "started", "started_at": datetime.now().isoformat()}
+    
+    async def _post_kb_rollback(self, body: bytes) -> Tuple[int, Dict]:
+        if self._kb_update_running():
+            raise HttpError(409, "지식베이스 업데이트가 진행 중입니다.")
+        
+        try:
+            country = (json.loads(body) if body else {}).get("country")
+        except (ValueError, AttributeError):
+            raise HttpError(400, "요청 본문은 {\"country\": \"kr\"} 형식이어야 합니다.")
+        
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, self.bot.rollback_knowledge_base, country)
+        return 200, {"rolled_back": results}
+    
+    def _kb_update_running(self) -> bool:
+        """데몬이 시작한 업데이트 작업(실행 스레드가 아직 잠금을 잡기 전 포함) 또는 스케줄러 업데이트가 진행 중인지"""
+        return (self._refresh_task is not None and not self._refresh_task.done()) or self.bot.kb_update_lock.locked()
+    
+    async def _refresh_knowledge_base(self):
+        loop = asyncio.get_running_loop()
+        started = datetime.now()
+        try:
+            await loop.run_in_executor(None, self.bot.update_knowledge_base)
+            status = "completed"
+        except Exception as e:
+            print(f"지식베이스 업데이트 오류: {e}")
+            status = f"failed: {e}"
+        self._last_refresh = {
+            "status": status,
+            "started_at": started.isoformat(),
+            "finished_at": datetime.now().isoformat()
+        }
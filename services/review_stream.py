@@ -0,0 +1,171 @@
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+from config import Config
+from models.review import Review
+
+if TYPE_CHECKING:
+    from services.review_bot import ReviewBot
+
+class ReviewStreamProcessor:
+    """리뷰 스트림 처리기 (제한된 처리 창 + 입력 순서 JSONL 출력 + 체크포인트 재개)
+
+    - 처리 창: 출력되지 않은 리뷰가 window_size개에 이르면 입력 읽기를 멈춤 (메모리 일정)
+    - 출력: 완료 순서와 관계없이 입력 순서대로 ReviewResponse를 JSONL에 한 줄씩 추가
+    - 체크포인트: 연속으로 출력을 마친 입력 수와 출력 파일 오프셋을 기록하고,
+      재개 시 출력 파일을 그 오프셋으로 잘라낸 뒤 다음 입력부터 처리 (중복·누락 없음)
+    """
+    
+    def __init__(self, bot: "ReviewBot", window_size: Optional[int] = None, checkpoint_interval: Optional[int] = None):
+        self.bot = bot
+        self.window_size = window_size or Config.STREAM_WINDOW_SIZE
+        self.checkpoint_interval = checkpoint_interval or Config.STREAM_CHECKPOINT_INTERVAL
+    
+    def process_file(self, input_path: str, output_path: Optional[str] = None, resume: bool = True,
+                     max_workers: Optional[int] = None, country: Optional[str] = None,
+                     platform: Optional[str] = None) -> Dict:
+        """CSV/JSONL 리뷰 파일을 스트림 처리 (체크포인트는 출력 파일 옆 .checkpoint.json)"""
+        from utils.review_reader import read_reviews
+        
+        output_path = output_path or Config.STREAM_OUTPUT_PATH
+        source = {
+            "path": os.path.abspath(input_path),
+            "size": os.path.getsize(input_path),
+            "mtime": os.path.getmtime(input_path)
+        }
+        return self.process(
+            read_reviews(input_path, country=country, platform=platform),
+            output_path, source=source, resume=resume, max_workers=max_workers
+        )
+    
+    def process(self, reviews: Iterable[Review], output_path: str, source: Optional[Dict] = None,
+                resume: bool = True, max_workers: Optional[int] = None) -> Dict:
+        """리뷰 이터러블을 스트림 처리하고 요약(입력 수, 응답 수, 실패 수 등) 반환"""
+        max_workers = max_workers or Config.BATCH_MAX_WORKERS
+        checkpoint_path = f"{output_path}.checkpoint.json"
+        checkpoint = self._load_checkpoint(checkpoint_path, source) if resume else None
+        # 체크포인트 이후 이미 응답까지 생성된 리뷰는 실행 저널에서 바로 가져옴
+        journal = None
+        if Config.RUN_JOURNAL_ENABLED:
+            from services.run_journal import RunJournal
+            
+            run_key = json.dumps(source, sort_keys=True) if source else os.path.abspath(output_path)
+            journal = RunJournal(RunJournal.run_id_for([run_key], prefix="stream"))
+            if not resume:
+                journal.reset()
+        
+        state = {
+            "source": source,
+            "records": 0,      # 연속으로 출력까지 마친 입력 수
+            "sink_offset": 0,  # 그 시점의 출력 파일 크기
+            "responses": 0,
+            "failed": 0
+        }
+        if checkpoint:
+            state.update({key: checkpoint[key] for key in ("records", "sink_offset", "responses", "failed")})
+            print(f"체크포인트에서 재개: 입력 {state['records']:,}개 처리 완료")
+        
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        sink = open(output_path, 'a+b')
+        sink.truncate(state["sink_offset"])
+        sink.seek(0, os.SEEK_END)
+        
+        completed: Dict[int, Optional[dict]] = {}  # 입력 순번 → 출력할 응답 (실패 시 None)
+        pending: Dict[Future, Tuple[int, Review]] = {}  # 처리 중인 리뷰 → (입력 순번, 리뷰)
+        next_write = state["records"]
+        submitted = state["records"]
+        started = datetime.now()
+        
+        def collect(block: bool):
+            """완료된 리뷰를 모아 입력 순서대로 이어지는 부분만 출력 (출력·체크포인트는 이 스레드에서만)"""
+            nonlocal next_write
+            done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                seq, review = pending.pop(future)
+                try:
+                    completed[seq] = future.result().dict()
+                except Exception as e:
+                    print(f"리뷰 처리 오류 {review.id}: {e}")
+                    completed[seq] = None
+            
+            while next_write in completed:
+                line = completed.pop(next_write)
+                if line is None:
+                    state["failed"] += 1
+                else:
+                    sink.write((json.dumps(line, ensure_ascii=False, default=str) + "\n").encode('utf-8'))
+                    state["responses"] += 1
+                next_write += 1
+                if next_write % self.checkpoint_interval == 0:
+                    self._save_checkpoint(checkpoint_path, sink, state, next_write)
+        
+        print(f"리뷰 스트림 처리 시작... (동시 처리 {max_workers}개, 처리 창 {self.window_size}개)")
+        try:
+            with self.bot.response_cache.batch():
+                with ThreadPoolExecutor(max_workers=max_workers, initializer=self.bot.response_cache.join_batch) as executor:
+                    for review in islice(reviews, state["records"], None):
+                        # 백프레셔: 출력되지 않은 리뷰가 처리 창을 채우면 완료를 기다리며 출력
+                        while submitted - next_write >= self.window_size:
+                            collect(block=True)
+                        
+                        pending[executor.submit(self.bot.process_review, review, None, journal)] = (submitted, review)
+                        submitted += 1
+                        collect(block=False)
+                    
+                    while pending:
+                        collect(block=True)
+            
+            self._save_checkpoint(checkpoint_path, sink, state, next_write)
+        finally:
+            sink.close()
+            if journal is not None:
+                journal.close()
+        
+        elapsed = (datetime.now() - started).total_seconds()
+        summary = {
+            "input_records": state["records"],
+            "responses": state["responses"],
+            "failed": state["failed"],
+            "output_path": output_path,
+            "checkpoint_path": checkpoint_path,
+            "elapsed_seconds": round(elapsed, 2)
+        }
+        print(f"리뷰 스트림 처리 완료: 입력 {summary['input_records']:,}개, 응답 {summary['responses']:,}개, 실패 {summary['failed']:,}개")
+        return summary
+    
+    def _save_checkpoint(self, checkpoint_path: str, sink, state: Dict, records: int):
+        """출력 파일과 응답 캐시를 디스크에 반영한 뒤 체크포인트 기록 (제출 스레드에서 호출)"""
+        sink.flush()
+        os.fsync(sink.fileno())
+        self.bot.response_cache.flush()
+        
+        state["records"] = records
+        state["sink_offset"] = sink.tell()
+        state["updated_at"] = datetime.now().isoformat()
+        
+        temp_path = f"{checkpoint_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, checkpoint_path)
+    
+    def _load_checkpoint(self, checkpoint_path: str, source: Optional[Dict]) -> Optional[Dict]:
+        """같은 입력에 대한 체크포인트만 사용 (입력 파일이 바뀌었으면 처음부터)"""
+        if not os.path.exists(checkpoint_path):
+            return None
+        
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except Exception as e:
+            print(f"체크포인트 로드 실패: {e}")
+            return None
+        
+        if checkpoint.get("source") != source:
+            print("입력이 체크포인트와 달라 처음부터 처리합니다.")
+            return None
+        return checkpoint
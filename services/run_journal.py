@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from config import Config
+
+# 리뷰 처리 상태
+PENDING = "pending"
+CLASSIFIED = "classified"
+GENERATED = "generated"
+FAILED = "failed"
+
+class RunRetriesExceeded(Exception):
+    """재시도 한도를 넘겨 이번 실행에서 건너뛰는 리뷰"""
+
+class RunJournal:
+    """실행 저널 (SQLite WAL, 실행 ID + 리뷰 ID 단위 처리 상태)
+
+    항목마다 리뷰 내용 키(응답 캐시 키)를 함께 기록하고, 조회 시 내용 키가 다르면 없는 항목으로 봅니다
+    (같은 리뷰 ID라도 내용이 바뀌면 저장된 분류·응답을 쓰지 않고 새로 처리).
+    상태 변경은 리뷰마다 즉시 커밋하므로 배치가 중간에 종료되어도 같은 실행 ID로 다시 시작하면
+    응답까지 생성된 리뷰는 저장된 응답을 그대로 쓰고, 분류까지 마친 리뷰는 분류를 건너뛰며,
+    실패한 리뷰는 RUN_MAX_RETRIES회까지만 다시 시도합니다.
+    """
+    
+    # 새 항목 추가, 내용 키가 바뀐 항목은 pending으로 초기화
+    _UPSERT = """
+        INSERT INTO reviews (run_id, review_id, content_key, state, updated_at) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (run_id, review_id) DO UPDATE SET
+            content_key = excluded.content_key, state = excluded.state, attempts = 0,
+            category = NULL, response = NULL, error = NULL, updated_at = excluded.updated_at
+        WHERE content_key IS NOT excluded.content_key
+    """
+    
+    def __init__(self, run_id: str, db_path: Optional[str] = None, max_retries: Optional[int] = None):
+        self.run_id = run_id
+        self.db_path = db_path or Config.RUN_JOURNAL_PATH
+        self.max_retries = max_retries if max_retries is not None else Config.RUN_MAX_RETRIES
+        self._lock = threading.Lock()
+        
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                run_id TEXT NOT NULL,
+                review_id TEXT NOT NULL,
+                content_key TEXT,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                category TEXT,
+                response TEXT,
+                error TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, review_id)
+            )
+        """)
+        # 내용 키 이전의 저널 (기존 항목은 내용 키가 없으므로 모두 새로 처리)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(reviews)")}
+        if "content_key" not in columns:
+            self._conn.execute("ALTER TABLE reviews ADD COLUMN content_key TEXT")
+        self._conn.commit()
+    
+    @staticmethod
+    def run_id_for(keys: Iterable[str], prefix: str = "batch") -> str:
+        """리뷰 ID·내용 키 목록으로 실행 ID 생성 (같은 리뷰 목록을 다시 처리하면 같은 실행으로 이어짐)"""
+        digest = hashlib.sha256("\n".join(keys).encode('utf-8')).hexdigest()[:16]
+        return f"{prefix}_{digest}"
+    
+    def register(self, entries: Iterable[Tuple[str, str]]):
+        """처리할 (리뷰 ID, 내용 키)를 pending으로 등록 (내용 키가 같은 리뷰는 상태 유지)"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.executemany(
+                self._UPSERT,
+                ((self.run_id, review_id, content_key, PENDING, now) for review_id, content_key in entries)
+            )
+            self._conn.commit()
+    
+    def get(self, review_id: str, content_key: str) -> Optional[Dict]:
+        """리뷰의 처리 상태 (기록이 없거나 내용 키가 다르면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_key, state, attempts, category, response, error FROM reviews WHERE run_id = ? AND review_id = ?",
+                (self.run_id, review_id)
+            ).fetchone()
+        if row is None or row[0] != content_key:
+            return None
+        
+        _, state, attempts, category, response, error = row
+        return {
+            "state": state,
+            "attempts": attempts,
+            "category": category,
+            "response": json.loads(response) if response else None,
+            "error": error
+        }
+    
+    def is_exhausted(self, entry: Optional[Dict]) -> bool:
+        """실패 횟수가 재시도 한도에 도달했는지"""
+        return entry is not None and entry["state"] == FAILED and entry["attempts"] >= self.max_retries
+    
+    def mark_classified(self, review_id: str, content_key: str, category: str):
+        self._update(review_id, content_key, "state = ?, category = ?", (CLASSIFIED, category))
+    
+    def mark_generated(self, review_id: str, content_key: str, response: Dict):
+        self._update(
+            review_id, content_key, "state = ?, response = ?, error = NULL",
+            (GENERATED, json.dumps(response, ensure_ascii=False, default=str))
+        )
+    
+    def mark_failed(self, review_id: str, content_key: str, error: str):
+        self._update(review_id, content_key, "state = ?, attempts = attempts + 1, error = ?", (FAILED, error[:1000]))
+    
+    def summary(self) -> Dict[str, int]:
+        """상태별 리뷰 수 (재시도 한도 초과는 exhausted로 별도 집계)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, attempts >= ?, COUNT(*) FROM reviews WHERE run_id = ? GROUP BY state, attempts >= ?",
+                (self.max_retries, self.run_id, self.max_retries)
+            ).fetchall()
+        
+        counts = {PENDING: 0, CLASSIFIED: 0, GENERATED: 0, FAILED: 0, "exhausted": 0}
+        for state, exhausted, count in rows:
+            counts["exhausted" if state == FAILED and exhausted else state] += count
+        return counts
+    
+    def reset(self):
+        """이 실행의 기록 삭제 (처음부터 다시 처리)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM reviews WHERE run_id = ?", (self.run_id,))
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def _update(self, review_id: str, content_key: str, assignments: str, params: tuple):
+        """상태 변경 1건을 즉시 커밋 (등록되지 않았거나 내용 키가 바뀐 리뷰는 새 항목으로 시작)"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(self._UPSERT, (self.run_id, review_id, content_key, PENDING, now))
+            self._conn.execute(
+                f"UPDATE reviews SET {assignments}, updated_at = ? WHERE run_id = ? AND review_id = ?",
+                params + (now, self.run_id, review_id)
+            )
+            self._conn.commit()
@@ -0,0 +1,211 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+from config import Config
+from models.review import Review
+
+def _author_pattern(author: str) -> "re.Pattern":
+    """단어 경계(한글 포함)로 둘러싸인 작성자명 (한국어 호칭 '님'은 뒤에 붙어도 허용)"""
+    return re.compile(rf"(?<![0-9A-Za-z가-힣_]){re.escape(author)}(?=님|[^0-9A-Za-z가-힣_]|$)")
+
+def mentions_author(text: str, author: str) -> bool:
+    """응답에 작성자명이 단어로 들어 있는지"""
+    return bool(author) and _author_pattern(author).search(text) is not None
+
+def personalize_response(response_text: str, old_author: str, new_author: str) -> Optional[str]:
+    """캐시된 응답의 작성자명을 모두 새 리뷰 작성자명으로 교체 (이전 작성자명이 남으면 None)
+
+    다른 단어에 포함된 같은 문자열("Al" → "All")은 바꾸지 않습니다.
+    새 작성자명이 없으면 호칭으로 쓰인 이름("Hi Al," / "김민수님!")만 지우고, 문장 안의 이름이 남으면
+    None을 반환합니다 (이전 고객 이름 노출 방지, 호출 측은 유사 캐시 미스로 처리).
+    """
+    if not old_author:
+        return response_text
+    pattern = _author_pattern(old_author)
+    if new_author:
+        return pattern.sub(lambda _: new_author, response_text)
+    # "Hi Mare," → "Hi," 처럼 호칭으로 쓰인 이름(과 앞 쉼표·공백, 뒤 호칭)만 제거
+    removed = re.sub(rf"(?:,?\s)?{pattern.pattern}님?(?=[,.!?~]|\s*$)", "", response_text)
+    if removed != response_text:
+        removed = removed.lstrip(" ,")
+    return None if pattern.search(removed) else removed
+
+class SemanticResponseCache:
+    """리뷰 임베딩 기반 유사 중복 응답 캐시
+
+    정확히 같은 문자열이 아니어도 코사인 유사도가 카테고리별 임계값 이상이면
+    캐시된 응답을 재사용합니다. 별도의 소형 FAISS 인덱스(내적, 정규화 벡터)에
+    저장하며 LRU(최대 항목 수)와 TTL로 오래된 항목을 제거합니다.
+    """
+    
+    def __init__(self, embeddings: Embeddings, store_path: Optional[str] = None,
+                 max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.embeddings = embeddings
+        self.store_path = store_path or Config.SEMANTIC_CACHE_PATH
+        self.max_entries = max_entries or Config.SEMANTIC_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or Config.SEMANTIC_CACHE_TTL_SECONDS
+        
+        self._lock = threading.RLock()
+        self._index = None
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()  # LRU 순서 (오래된 항목이 앞)
+        self._next_id = 0
+        self._unsaved_adds = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def lookup(self, review: Review) -> Tuple[Optional[Dict], Optional[list]]:
+        """유사 리뷰의 캐시 데이터를 찾아 (캐시 데이터 또는 None, 리뷰 임베딩) 반환"""
+        import numpy as np
+        
+        vector = self._normalize(self.embeddings.embed_query(review.content))
+        
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                self.stats["misses"] += 1
+                return None, vector
+            
+            k = min(Config.SEMANTIC_CACHE_SEARCH_K, self._index.ntotal)
+            similarities, ids = self._index.search(np.asarray([vector], dtype=np.float32), k)
+            now = time.time()
+            
+            for similarity, entry_id in zip(similarities[0], ids[0]):
+                entry = self._entries.get(int(entry_id))
+                if entry is None:
+                    continue
+                if now - entry["created_at"] > self.ttl_seconds:
+                    self._evict(int(entry_id))
+                    continue
+                if entry["country"] != review.country or entry["platform"] != review.platform:
+                    continue
+                if similarity < self._threshold(entry["data"].get("category")):
+                    continue
+                
+                self._entries.move_to_end(int(entry_id))
+                self.stats["hits"] += 1
+                return dict(entry["data"], cached_author=entry["author"], similarity=float(similarity)), vector
+            
+            self.stats["misses"] += 1
+            return None, vector
+    
+    def add(self, review: Review, data: Dict, author: str, vector: Optional[list] = None):
+        """응답 데이터를 리뷰 임베딩과 함께 저장 (author는 응답에 사용된 작성자명)"""
+        import numpy as np
+        
+        if vector is None:
+            vector = self._normalize(self.embeddings.embed_query(review.content))
+        
+        with self._lock:
+            self._ensure_index(len(vector))
+            entry_id = self._next_id
+            self._next_id += 1
+            
+            self._index.add_with_ids(
+                np.asarray([vector], dtype=np.float32),
+                np.asarray([entry_id], dtype=np.int64)
+            )
+            self._entries[entry_id] = {
+                "country": review.country,
+                "platform": review.platform,
+                "author": author,
+                "created_at": time.time(),
+                "data": data
+            }
+            
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+            
+            self._unsaved_adds += 1
+            if self._unsaved_adds >= Config.SEMANTIC_CACHE_SAVE_INTERVAL:
+                self.save()
+    
+    def save(self):
+        """인덱스와 항목 메타데이터를 임시 파일에 쓴 뒤 교체"""
+        import faiss
+        
+        with self._lock:
+            if self._index is None or (not self._unsaved_adds and os.path.exists(self._entries_path)):
+                return
+            
+            os.makedirs(self.store_path, exist_ok=True)
+            faiss.write_index(self._index, f"{self._index_path}.tmp")
+            with open(f"{self._entries_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump({
+                    "next_id": self._next_id,
+                    "entries": [[entry_id, entry] for entry_id, entry in self._entries.items()]
+                }, f, ensure_ascii=False, default=str)
+            
+            os.replace(f"{self._index_path}.tmp", self._index_path)
+            os.replace(f"{self._entries_path}.tmp", self._entries_path)
+            self._unsaved_adds = 0
+    
+    def clear(self):
+        with self._lock:
+            self._index = None
+            self._entries.clear()
+            self._unsaved_adds = 0
+            for path in (self._index_path, self._entries_path):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.store_path, "index.faiss")
+    
+    @property
+    def _entries_path(self) -> str:
+        return os.path.join(self.store_path, "entries.json")
+    
+    def _threshold(self, category: Optional[str]) -> float:
+        thresholds = Config.SEMANTIC_CACHE_THRESHOLDS
+        return thresholds.get(category, thresholds["default"])
+    
+    def _ensure_index(self, dimension: int):
+        if self._index is None:
+            import faiss
+            self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+    
+    def _evict(self, entry_id: int):
+        import numpy as np
+        
+        self._entries.pop(entry_id, None)
+        self._index.remove_ids(np.asarray([entry_id], dtype=np.int64))
+        self.stats["evictions"] += 1
+        self._unsaved_adds += 1
+    
+    @staticmethod
+    def _normalize(vector) -> list:
+        import numpy as np
+        
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return (array / norm if norm else array).tolist()
+    
+    def _load(self):
+        if not (os.path.exists(self._index_path) and os.path.exists(self._entries_path)):
+            return
+        
+        try:
+            import faiss
+            
+            with open(self._entries_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            self._index = faiss.read_index(self._index_path)
+            self._next_id = saved["next_id"]
+            now = time.time()
+            for entry_id, entry in saved["entries"]:
+                self._entries[int(entry_id)] = entry
+                if now - entry["created_at"] > self.ttl_seconds:
+                    self._evict(int(entry_id))
+        except Exception as e:
+            print(f"유사 응답 캐시 로드 실패: {e}")
+            self._index = None
+            self._entries.clear()
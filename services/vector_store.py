@@ -1,126 +1,654 @@
+import hashlib
+import json
+import math
 import os
 import pickle
-from typing import List, Optional
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
 from langchain.docstore.document import Document
 from config import Config
+from services.rate_limiter import RateLimitedEmbeddings, openai_rate_limiter
+from services.embedding_cache import CachedEmbeddings, EmbeddingCache
+from services.lexical_index import LexicalIndex
+from services.metrics import metrics
+from utils.vector_store_paths import (
+    list_store_versions, new_version_path, prune_store_versions, resolve_store_path, set_current_version
+)
+
+# 인덱스 생성 시 flat 대비 재현율을 측정하는 검색 개수
+RECALL_K = 10
+
+class RawTextOpenAIEmbeddings(OpenAIEmbeddings):
+    """tiktoken 토큰화·길이 분할 없이 원문을 그대로 요청하는 OpenAIEmbeddings
+    
+    문서 청크(CHUNK_SIZE)와 리뷰는 임베딩 모델 입력 한도보다 훨씬 짧으므로 분할이 필요 없고,
+    tiktoken 인코딩 파일을 내려받을 수 없는 환경(오프라인 벤치마크 등)에서도 동작합니다.
+    """
+    
+    def embed_documents(self, texts: List[str], chunk_size: Optional[int] = 0) -> List[List[float]]:
+        batch_size = chunk_size or self.chunk_size
+        embeddings = []
+        for i in range(0, len(texts), batch_size):
+            response = self.client.create(input=texts[i:i + batch_size], **self._invocation_params)
+            if not isinstance(response, dict):
+                response = response.dict()
+            embeddings.extend(item["embedding"] for item in response["data"])
+        return embeddings
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
 
 class VectorStoreService:
-    """벡터 저장소 관리 서비스"""
+    """벡터 저장소 관리 서비스
     
-    def __init__(self):
-        self.embeddings = OpenAIEmbeddings(
-            model=Config.EMBEDDING_MODEL,
-            api_key=Config.OPENAI_API_KEY
+    저장소는 변경할 때마다 새 버전 디렉터리({country}_faiss.v<시각>)에 만들고 검증한 뒤
+    {country}_current 포인터와 메모리의 저장소를 함께 교체합니다. 검색 중인 저장소는 수정하지 않으며,
+    검증에 실패하면 기존 버전을 계속 사용하고, 직전 버전은 롤백용으로 남겨둡니다.
+    
+    각 버전에는 BM25 역색인(lexical_index.json)도 함께 저장하며, RETRIEVAL_MODE가 hybrid이면
+    BM25와 벡터 검색 순위를 RRF로 합치고, BM25 결과가 충분히 확실하면 임베딩 요청 없이 BM25 결과만 사용합니다.
+    
+    read_only=True(프로세스 풀 작업자)이면 임베딩 캐시를 읽기 전용으로 열고 기존 저장소 로드·검색만 사용합니다.
+    """
+    
+    def __init__(self, read_only: bool = False):
+        # 임베딩 캐시 → 공용 한도 → OpenAI 순으로 호출
+        # (지식베이스 재생성, 검색 쿼리, 로컬 분류기, 유사 캐시가 같은 벡터를 재사용)
+        self.embeddings = CachedEmbeddings(
+            RateLimitedEmbeddings(
+                (OpenAIEmbeddings if Config.EMBEDDING_CHECK_CTX_LENGTH else RawTextOpenAIEmbeddings)(
+                    model=Config.EMBEDDING_MODEL,
+                    api_key=Config.OPENAI_API_KEY,
+                    base_url=Config.OPENAI_BASE_URL,
+                    max_retries=0  # 재시도는 공용 RateLimiter에서 처리
+                ),
+                openai_rate_limiter
+            ),
+            EmbeddingCache(Config.EMBEDDING_MODEL, read_only=read_only)
         )
         self.vector_stores = {}  # 국가별 벡터 저장소
-        
+        self._mmap_countries = set()  # 인덱스를 메모리 매핑으로 로드한 국가
+        self._store_paths = {}  # 국가별 로드한 저장소 버전 경로
+        self.lexical_indexes: Dict[str, LexicalIndex] = {}  # 국가별 BM25 역색인 (저장소와 함께 교체)
+        self._swap_lock = threading.RLock()  # 포인터·메모리 저장소 교체
+    
     def load_existing_store(self, country: str) -> Optional[FAISS]:
         """기존 벡터 저장소 로드 (오류 처리 포함)"""
-        store_path = f"{Config.VECTOR_STORE_PATH}/{country}_faiss"
+        store_path = resolve_store_path(country)
         
-        if not os.path.exists(store_path):
+        if store_path is None:
             print(f"경고: {country} 벡터 저장소가 존재하지 않습니다.")
             return None
         
         try:
-            # 새로운 FAISS 버전 호환성을 위해 다양한 방법 시도
-            vector_store = FAISS.load_local(store_path, self.embeddings)
-            self.vector_stores[country] = vector_store
-            print(f"{country} 벡터 저장소 로드 성공")
+            vector_store, memory_mapped = self._load_version(store_path, country)
+            self._swap(country, vector_store, store_path, memory_mapped)
+            print(f"{country} 벡터 저장소 로드 성공 ({os.path.basename(store_path)})")
             return vector_store
-            
+        
         except Exception as e:
             print(f"벡터 저장소 로드 실패 ({country}): {e}")
             print(f"기존 저장소를 삭제하고 새로 생성이 필요합니다.")
             return None
-        
+    
     def create_or_load_vector_store(self, documents: List[Document], country: str) -> FAISS:
         """벡터 저장소 생성 또는 로드"""
-        store_path = f"{Config.VECTOR_STORE_PATH}/{country}_faiss"
-        
         # 먼저 기존 저장소 로드 시도
         existing_store = self.load_existing_store(country)
         if existing_store is not None:
             return existing_store
         
         # 기존 저장소 로드 실패 시 새로 생성
-        return self._create_new_vector_store(documents, country, store_path)
+        return self._create_new_vector_store(documents, country)
     
-    def _create_new_vector_store(self, documents: List[Document], country: str, store_path: str) -> FAISS:
+    def _create_new_vector_store(self, documents: List[Document], country: str) -> FAISS:
         """새로운 벡터 저장소 생성"""
         print(f"{country} 벡터 저장소 생성 중...")
         
-        # 국가별 문서 필터링
-        country_docs = [doc for doc in documents if doc.metadata.get('country') == country]
+        # 국가별 문서 필터링 (내용 해시 기준 중복 제거)
+        country_docs = self._unique_by_hash(
+            [doc for doc in documents if doc.metadata.get('country') == country]
+        )
         
         if not country_docs:
             print(f"경고: {country}에 대한 문서가 없습니다.")
             return None
-            
+        
         try:
-            vector_store = FAISS.from_documents(country_docs, self.embeddings)
+            vector_store, index_info = self._build_store(country_docs)
             
-            # 저장소 저장
-            os.makedirs(Config.VECTOR_STORE_PATH, exist_ok=True)
-            vector_store.save_local(store_path)
-            
-            self.vector_stores[country] = vector_store
-            print(f"{country} 벡터 저장소 생성 완료")
+            # 새 버전으로 저장 → 검증 → 교체
+            vector_store = self._publish(country, vector_store, {chunk_hash: chunk_hash for chunk_hash in country_docs}, index_info)
+            if vector_store is not None:
+                print(f"{country} 벡터 저장소 생성 완료")
             return vector_store
-            
+        
         except Exception as e:
             print(f"벡터 저장소 생성 실패 ({country}): {e}")
             return None
     
     def similarity_search(self, query: str, country: str, k: int = 3) -> List[Document]:
-        """유사도 검색"""
-        if country not in self.vector_stores:
-            print(f"경고: {country} 벡터 저장소가 없습니다.")
+        """유사도 검색 (RETRIEVAL_MODE에 따라 벡터 검색 또는 BM25+벡터 하이브리드)"""
+        return self.similarity_search_many([query], country, k)[0]
+    
+    def similarity_search_many(self, queries: List[str], country: str, k: int = 3) -> List[List[Document]]:
+        """여러 쿼리를 한 번의 임베딩 요청과 한 번의 인덱스 검색으로 처리 (쿼리 순서대로 결과 반환)
+        
+        하이브리드 모드에서는 BM25 신뢰도가 BM25_SKIP_CONFIDENCE 이상인 쿼리는 임베딩하지 않고 BM25 결과를 쓰고,
+        나머지는 BM25와 벡터 검색 순위를 RRF(Reciprocal Rank Fusion)로 합칩니다.
+        임베딩 캐시에 이미 있는 쿼리(유사 캐시 조회 등으로 임베딩된 리뷰)는 벡터 검색 비용이 인덱스 검색뿐이므로
+        건너뛰지 않고 항상 RRF로 합칩니다.
+        """
+        if not queries:
             return []
-            
-        vector_store = self.vector_stores[country]
+        with self._swap_lock:
+            vector_store = self.vector_stores.get(country)
+            lexical_index = self.lexical_indexes.get(country)
+        if vector_store is None:
+            print(f"경고: {country} 벡터 저장소가 없습니다.")
+            return [[] for _ in queries]
+        
         try:
-            results = vector_store.similarity_search(query, k=k)
+            hybrid = Config.RETRIEVAL_MODE.lower() == "hybrid" and lexical_index is not None and len(lexical_index) > 0
+            candidates = max(k, Config.HYBRID_CANDIDATES) if hybrid else k
+            ranked_ids: List[Optional[List[str]]] = [None] * len(queries)
+            lexical_results: List[List[Tuple[str, float]]] = [[] for _ in queries]
+            
+            if hybrid:
+                embedded = self.embeddings.is_cached(queries)
+                with metrics.span("retrieval_bm25", queries=len(queries)):
+                    for i, query in enumerate(queries):
+                        lexical_results[i] = lexical_index.search(query, candidates)
+                        if embedded[i]:
+                            continue
+                        if lexical_index.confidence(query, lexical_results[i]) >= Config.BM25_SKIP_CONFIDENCE:
+                            ranked_ids[i] = [doc_id for doc_id, _ in lexical_results[i]]
+                            metrics.increment("retrieval_dense_skipped_total")
+            
+            # BM25만으로 충분하지 않거나 이미 임베딩된 쿼리만 벡터 검색
+            dense_positions = [i for i, ids in enumerate(ranked_ids) if ids is None]
+            if dense_positions:
+                dense_ids = self._dense_search([queries[i] for i in dense_positions], vector_store, candidates)
+                for i, ids in zip(dense_positions, dense_ids):
+                    if hybrid:
+                        ids = self._reciprocal_rank_fusion([ids, [doc_id for doc_id, _ in lexical_results[i]]])
+                        metrics.increment("retrieval_hybrid_total")
+                    ranked_ids[i] = ids
+            
+            results = []
+            for ids in ranked_ids:
+                docs = []
+                for doc_id in ids:
+                    doc = vector_store.docstore.search(doc_id)
+                    if isinstance(doc, Document):
+                        docs.append(doc)
+                    if len(docs) >= k:
+                        break
+                results.append(docs)
             return results
         except Exception as e:
             print(f"유사도 검색 오류 ({country}): {e}")
-            return []
+            return [[] for _ in queries]
+    
+    def _dense_search(self, queries: List[str], vector_store: FAISS, k: int) -> List[List[str]]:
+        """벡터 검색 상위 k개 docstore ID (쿼리 임베딩은 한 번의 요청으로 처리)"""
+        import numpy as np
+        
+        vectors = np.asarray(self.embeddings.embed_documents(queries), dtype=np.float32)
+        _, indices = vector_store.index.search(vectors, k)
+        # 결과가 k개보다 적으면 -1
+        return [[vector_store.index_to_docstore_id[int(i)] for i in row if i != -1] for row in indices]
+    
+    @staticmethod
+    def _reciprocal_rank_fusion(rankings: List[List[str]]) -> List[str]:
+        """순위 목록들을 RRF 점수(Σ 1 / (HYBRID_RRF_K + 순위)) 순으로 합침"""
+        scores: Dict[str, float] = {}
+        for ranking in rankings:
+            for rank, doc_id in enumerate(ranking, 1):
+                scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (Config.HYBRID_RRF_K + rank)
+        return sorted(scores, key=scores.get, reverse=True)
     
     def update_vector_store(self, new_documents: List[Document], country: str):
-        """벡터 저장소 업데이트"""
-        country_docs = [doc for doc in new_documents if doc.metadata.get('country') == country]
+        """벡터 저장소 업데이트 (새 문서 추가, 이미 있는 청크는 건너뜀)"""
+        country_docs = self._unique_by_hash(
+            [doc for doc in new_documents if doc.metadata.get('country') == country]
+        )
         
         if not country_docs:
             return
-            
+        
         try:
-            if country in self.vector_stores:
-                # 기존 저장소에 문서 추가
-                self.vector_stores[country].add_documents(country_docs)
-            else:
-                # 새로운 저장소 생성
-                self.vector_stores[country] = FAISS.from_documents(country_docs, self.embeddings)
+            if country not in self.vector_stores:
+                self.load_existing_store(country)
             
-            # 저장
-            store_path = f"{Config.VECTOR_STORE_PATH}/{country}_faiss"
-            os.makedirs(Config.VECTOR_STORE_PATH, exist_ok=True)
-            self.vector_stores[country].save_local(store_path)
-            print(f"{country} 벡터 저장소 업데이트 완료")
+            index_info = None
+            if country in self.vector_stores and self._supports_in_place_update(country):
+                # 서비스 중인 저장소의 복사본에 새 청크만 추가
+                store = self._clone_store(self.vector_stores[country])
+                chunks = self._load_or_build_manifest(country, store)
+                new_hashes = [h for h in country_docs if h not in chunks]
+                if new_hashes:
+                    store.add_documents([country_docs[h] for h in new_hashes], ids=new_hashes)
+                chunks.update({h: h for h in new_hashes})
+            else:
+                # 새로운 저장소 생성 (IVF/HNSW/양자화 인덱스는 기존 청크를 합쳐 다시 생성)
+                if country in self.vector_stores:
+                    country_docs = {**self._store_documents(self.vector_stores[country]), **country_docs}
+                store, index_info = self._build_store(country_docs)
+                chunks = {h: h for h in country_docs}
             
+            # 새 버전으로 저장 → 검증 → 교체
+            if self._publish(country, store, chunks, index_info) is not None:
+                print(f"{country} 벡터 저장소 업데이트 완료")
+        
         except Exception as e:
             print(f"벡터 저장소 업데이트 오류 ({country}): {e}")
     
+    def refresh_vector_store(self, documents: List[Document], country: str,
+                             resolved_sources: Optional[Set[str]] = None) -> Dict[str, int]:
+        """증분 갱신: 새로/변경된 청크만 임베딩하고 사라진 청크는 ID로 삭제
+        
+        resolved_sources(이번 수집에서 상태를 확인한 URL)가 주어지면 그 밖의 출처(수집 실패·예산 초과로
+        방문하지 못한 페이지)의 기존 청크는 삭제하지 않고 유지합니다.
+        """
+        country_docs = self._unique_by_hash(
+            [doc for doc in documents if doc.metadata.get('country') == country]
+        )
+        
+        if not country_docs:
+            # 수집 실패 시 기존 저장소를 비우지 않고 유지
+            print(f"경고: {country}에 대한 문서가 없어 기존 저장소를 유지합니다.")
+            return {"added": 0, "removed": 0, "unchanged": 0}
+        
+        if country not in self.vector_stores:
+            self.load_existing_store(country)
+        
+        store = self.vector_stores.get(country)
+        if store is not None and resolved_sources is not None:
+            unresolved = {
+                h: doc for h, doc in self._store_documents(store).items()
+                if doc.metadata.get('source') not in resolved_sources and h not in country_docs
+            }
+            if unresolved:
+                print(f"{country}: 이번 수집에서 확인하지 못한 페이지의 기존 청크 {len(unresolved)}개 유지")
+                country_docs.update(unresolved)
+        
+        manifest = self._read_manifest(country)
+        if store is None or (manifest and (
+            manifest.get("embedding_model") != Config.EMBEDDING_MODEL
+            or manifest.get("index", {}).get("config", "flat/none") != self._index_config()
+        )):
+            # 저장소가 없거나 임베딩 모델/인덱스 설정이 바뀐 경우 전체 재생성
+            self._create_new_vector_store(list(country_docs.values()), country)
+            return {"added": len(country_docs), "removed": 0, "unchanged": 0}
+        
+        chunks = self._load_or_build_manifest(country, store)
+        
+        added = [h for h in country_docs if h not in chunks]
+        removed = [h for h in chunks if h not in country_docs]
+        
+        # 매니페스트에 없는 문서(기존 저장소의 중복 청크 등)도 함께 정리
+        tracked_ids = set(chunks.values())
+        orphan_ids = [doc_id for doc_id in store.index_to_docstore_id.values() if doc_id not in tracked_ids]
+        
+        delete_ids = [chunks[h] for h in removed] + orphan_ids
+        if (added or delete_ids) and not self._supports_in_place_update(country):
+            # IVF/HNSW/양자화 인덱스와 메모리 매핑 인덱스는 제자리 수정 대신 다시 생성
+            # (유지되는 청크의 임베딩은 임베딩 캐시에서 읽으므로 API 호출은 새 청크만 발생)
+            self._create_new_vector_store(list(country_docs.values()), country)
+            result = {"added": len(added), "removed": len(removed), "unchanged": len(country_docs) - len(added)}
+            print(f"{country} 벡터 저장소 재생성: 추가 {result['added']}개, 삭제 {result['removed']}개, 유지 {result['unchanged']}개")
+            return result
+        
+        if added or delete_ids or not manifest:
+            # 서비스 중인 저장소는 그대로 두고 복사본을 수정한 뒤 새 버전으로 교체
+            store = self._clone_store(store)
+            if delete_ids:
+                store.delete(delete_ids)
+            if added:
+                store.add_documents([country_docs[h] for h in added], ids=added)
+            
+            for h in removed:
+                del chunks[h]
+            chunks.update({h: h for h in added})
+            
+            if self._publish(country, store, chunks) is None:
+                return {"added": 0, "removed": 0, "unchanged": 0}
+        
+        result = {"added": len(added), "removed": len(removed), "unchanged": len(country_docs) - len(added)}
+        print(f"{country} 벡터 저장소 증분 갱신: 추가 {result['added']}개, 삭제 {result['removed']}개, 유지 {result['unchanged']}개")
+        return result
+    
+    @staticmethod
+    def chunk_hash(doc: Document) -> str:
+        """청크 내용 해시 (출처 URL + 본문)"""
+        if doc.metadata.get('content_hash'):
+            return doc.metadata['content_hash']
+        content = f"{doc.metadata.get('source', '')}\n{doc.page_content}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def _index_config(self) -> str:
+        """매니페스트에 기록하는 인덱스 설정 (바뀌면 전체 재생성)"""
+        return f"{Config.VECTOR_INDEX_TYPE.lower()}/{Config.VECTOR_INDEX_QUANTIZATION.lower()}"
+    
+    def _index_factory(self, count: int) -> str:
+        """설정과 문서 수에 맞는 faiss.index_factory 문자열"""
+        index_type, quantization = self._index_config().split("/")
+        codec = {"sq8": "SQ8", "pq": f"PQ{Config.VECTOR_PQ_M}"}.get(quantization, "Flat")
+        
+        if index_type == "ivf":
+            # 클러스터당 학습 벡터가 39개 이상 되도록 제한
+            nlist = Config.VECTOR_IVF_NLIST or max(1, min(int(4 * math.sqrt(count)), count // 39))
+            return f"IVF{nlist},{codec}"
+        if index_type == "hnsw":
+            return f"HNSW{Config.VECTOR_HNSW_M}" + ("" if codec == "Flat" else f"_{codec}")
+        return codec
+    
+    def _build_store(self, docs: Dict[str, Document]) -> Tuple[FAISS, Dict]:
+        """저장소 생성: flat 인덱스로 임베딩한 뒤 설정된 인덱스로 변환하고 flat 대비 재현율 측정
+        
+        청크 해시를 문서 ID로 사용하여 이후 증분 갱신 시 ID로 삭제 가능
+        """
+        hashes = list(docs.keys())
+        store = FAISS.from_documents(list(docs.values()), self.embeddings, ids=hashes)
+        index_info = {"config": self._index_config(), "factory": "Flat", "recall_at_k": 1.0}
+        
+        factory = self._index_factory(store.index.ntotal)
+        if factory == "Flat":
+            return store, index_info
+        
+        import faiss
+        
+        vectors = store.index.reconstruct_n(0, store.index.ntotal)
+        try:
+            index = faiss.index_factory(vectors.shape[1], factory)
+            index.train(vectors)
+            index.add(vectors)
+        except Exception as e:
+            # 문서 수가 학습에 부족한 경우 등
+            print(f"{factory} 인덱스 생성 실패, flat 인덱스 사용: {e}")
+            index_info["fallback"] = True
+            return store, index_info
+        
+        self._apply_search_params(index)
+        index_info.update(factory=factory, recall_at_k=self._measure_recall(store.index, index, vectors))
+        print(f"{factory} 인덱스 생성 (flat 대비 recall@{min(RECALL_K, len(vectors))}: {index_info['recall_at_k']:.3f})")
+        
+        store.index = index
+        return store, index_info
+    
+    @staticmethod
+    def _measure_recall(exact_index, index, vectors) -> float:
+        """저장된 벡터 일부를 질의로 사용해 flat 검색 대비 recall@k 측정"""
+        import numpy as np
+        
+        sample = min(Config.VECTOR_RECALL_SAMPLE, len(vectors))
+        k = min(RECALL_K, len(vectors))
+        queries = vectors[np.linspace(0, len(vectors) - 1, sample).astype(int)]
+        
+        _, expected = exact_index.search(queries, k)
+        _, actual = index.search(queries, k)
+        hits = sum(len(set(e) & set(a)) for e, a in zip(expected, actual))
+        return round(hits / (sample * k), 4)
+    
+    @staticmethod
+    def _apply_search_params(index):
+        """IVF nprobe / HNSW efSearch 설정"""
+        import faiss
+        
+        base = faiss.downcast_index(index)
+        if isinstance(base, faiss.IndexIVF):
+            base.nprobe = Config.VECTOR_IVF_NPROBE
+        elif isinstance(base, faiss.IndexHNSW):
+            base.hnsw.efSearch = Config.VECTOR_HNSW_EF_SEARCH
+    
+    def _load_version(self, store_path: str, country: str) -> Tuple[FAISS, bool]:
+        """저장소 버전 디렉터리 로드 (저장소, 메모리 매핑 여부) - 메모리 매핑 로드 실패 시 기본 로더 사용"""
+        try:
+            return self._load_local(store_path, country)
+        except Exception as e:
+            print(f"인덱스 직접 로드 실패, 기본 로더 사용 ({country}): {e}")
+            return FAISS.load_local(store_path, self.embeddings), False
+    
+    def _load_local(self, store_path: str, country: str) -> Tuple[FAISS, bool]:
+        """FAISS.load_local과 같은 파일(index.faiss, index.pkl)을 읽되 인덱스는 메모리 매핑으로 로드
+        
+        IVF 인덱스는 여러 프로세스가 같은 파일을 공유하며 거의 즉시 로드됩니다.
+        """
+        import faiss
+        
+        index_file = os.path.join(store_path, "index.faiss")
+        index = None
+        if Config.VECTOR_INDEX_MMAP:
+            try:
+                index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP)
+            except Exception as e:
+                print(f"메모리 매핑 로드 실패, 일반 로드로 전환 ({country}): {e}")
+        if index is None:
+            index = faiss.read_index(index_file)
+        
+        # faiss 1.7에서 메모리 매핑이 실제로 적용되는 것은 IVF 역색인 목록
+        memory_mapped = Config.VECTOR_INDEX_MMAP and isinstance(faiss.downcast_index(index), faiss.IndexIVF)
+        self._apply_search_params(index)
+        
+        with open(os.path.join(store_path, "index.pkl"), 'rb') as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        
+        return FAISS(self.embeddings, index, docstore, index_to_docstore_id), memory_mapped
+    
+    def _swap(self, country: str, store: FAISS, store_path: str, memory_mapped: bool, update_pointer: bool = False):
+        """메모리의 저장소·BM25 색인(과 현재 버전 포인터)을 한 번에 교체 - 검색 중인 요청은 이전 저장소로 끝까지 처리"""
+        lexical_index = self._load_lexical_index(store_path, store)
+        with self._swap_lock:
+            if update_pointer:
+                set_current_version(country, store_path)
+            self.vector_stores[country] = store
+            self.lexical_indexes[country] = lexical_index
+            self._store_paths[country] = store_path
+            if memory_mapped:
+                self._mmap_countries.add(country)
+            else:
+                self._mmap_countries.discard(country)
+    
+    def _load_lexical_index(self, store_path: str, store: FAISS) -> LexicalIndex:
+        """버전 디렉터리의 BM25 색인 로드 (색인 파일이 없는 이전 저장소는 docstore로 메모리에서 생성)"""
+        try:
+            lexical_index = LexicalIndex.load(store_path)
+            if lexical_index is not None and len(lexical_index) == len(store.index_to_docstore_id):
+                return lexical_index
+        except Exception as e:
+            print(f"BM25 색인 로드 실패, 다시 생성 ({os.path.basename(store_path)}): {e}")
+        return LexicalIndex.from_store(store)
+    
+    def _publish(self, country: str, store: FAISS, chunks: Dict[str, str], index_info: Optional[Dict] = None) -> Optional[FAISS]:
+        """새 버전 디렉터리에 저장 → 다시 로드해 검증 → 포인터·메모리 교체 (검증 실패 시 기존 버전 유지)"""
+        version_path = new_version_path(country)
+        try:
+            self._save_store(version_path, country, store, chunks, index_info)
+            published, memory_mapped = self._load_version(version_path, country)
+            current = self.vector_stores.get(country)
+            self._validate_store(published, len(chunks), current.index.ntotal if current is not None else None)
+        except Exception as e:
+            print(f"새 벡터 저장소 검증 실패, 기존 버전 유지 ({country}): {e}")
+            shutil.rmtree(version_path, ignore_errors=True)
+            return None
+        
+        self._swap(country, published, version_path, memory_mapped, update_pointer=True)
+        prune_store_versions(country)
+        print(f"{country} 벡터 저장소 교체: {os.path.basename(version_path)} (문서 {published.index.ntotal}개)")
+        return published
+    
+    def _validate_store(self, store: FAISS, expected_count: int, current_count: Optional[int] = None):
+        """문서 수와 표본 질의 검색 결과 확인 (표본은 저장된 청크 본문, 임베딩 캐시에서 읽음)
+        
+        current_count(서비스 중인 버전의 문서 수)가 주어지면 VECTOR_MAX_SHRINK_RATIO 넘게 줄어든 버전은 거부합니다.
+        """
+        import numpy as np
+        
+        count = store.index.ntotal
+        if count == 0 or count != expected_count or len(store.index_to_docstore_id) != count:
+            raise ValueError(f"문서 수 불일치 (인덱스 {count}, 문서 ID {len(store.index_to_docstore_id)}, 예상 {expected_count})")
+        if current_count and count < current_count * (1 - Config.VECTOR_MAX_SHRINK_RATIO):
+            raise ValueError(
+                f"문서 수가 {current_count}개 → {count}개로 {Config.VECTOR_MAX_SHRINK_RATIO:.0%} 넘게 줄었습니다 (부분 수집 의심)."
+            )
+        
+        positions = sorted(set(np.linspace(0, count - 1, min(Config.VECTOR_VALIDATION_QUERIES, count)).astype(int)))
+        doc_ids = [store.index_to_docstore_id[int(i)] for i in positions]
+        docs = [store.docstore.search(doc_id) for doc_id in doc_ids]
+        if not all(isinstance(doc, Document) for doc in docs):
+            raise ValueError("docstore에 없는 문서 ID가 있습니다.")
+        
+        vectors = np.asarray(self.embeddings.embed_documents([doc.page_content for doc in docs]), dtype=np.float32)
+        _, indices = store.index.search(vectors, min(RECALL_K, count))
+        if any((row == -1).all() for row in indices):
+            raise ValueError("검색 결과가 없는 표본 질의가 있습니다.")
+        
+        # 근사 인덱스도 자기 자신은 대부분 상위 k개 안에 찾아야 함
+        found = sum(1 for position, row in zip(positions, indices) if position in row)
+        if found < len(positions) / 2:
+            raise ValueError(f"표본 질의 {len(positions)}개 중 {found}개만 자기 문서를 찾았습니다.")
+    
+    def _clone_store(self, store: FAISS) -> FAISS:
+        """서비스 중인 저장소를 수정하지 않도록 인덱스·docstore 복사본 생성"""
+        import faiss
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        
+        return FAISS(
+            self.embeddings, faiss.clone_index(store.index),
+            InMemoryDocstore(dict(store.docstore._dict)), dict(store.index_to_docstore_id)
+        )
+    
+    def rollback(self, country: str) -> bool:
+        """현재 버전 직전의 저장소 버전으로 되돌림 (검증 후 교체)"""
+        versions = list_store_versions(country)
+        current = self._store_paths.get(country) or resolve_store_path(country)
+        if current not in versions or versions.index(current) == 0:
+            print(f"{country}: 되돌릴 이전 버전이 없습니다.")
+            return False
+        
+        previous = versions[versions.index(current) - 1]
+        try:
+            store, memory_mapped = self._load_version(previous, country)
+            manifest = self._read_manifest_at(previous) or {}
+            self._validate_store(store, manifest.get("document_count", store.index.ntotal))
+        except Exception as e:
+            print(f"{country} 이전 버전 검증 실패 ({os.path.basename(previous)}): {e}")
+            return False
+        
+        self._swap(country, store, previous, memory_mapped, update_pointer=True)
+        print(f"{country} 벡터 저장소 롤백: {os.path.basename(current)} → {os.path.basename(previous)}")
+        return True
+    
+    def _supports_in_place_update(self, country: str) -> bool:
+        """add/remove_ids로 제자리 수정이 가능한지 (메모리에 올린 flat 인덱스만 가능)
+        
+        메모리 매핑된 IVF 인덱스는 읽기 전용이라 수정 시 프로세스가 종료될 수 있고,
+        HNSW는 remove_ids를 지원하지 않으므로 다시 생성합니다.
+        설정된 인덱스 학습에 실패해 flat으로 만든 저장소(매니페스트 index.fallback)도 제자리 수정하며,
+        설정된 인덱스는 다음 전체 재생성 때 다시 시도합니다.
+        """
+        import faiss
+        
+        store = self.vector_stores.get(country)
+        if store is None:
+            return False
+        if self._index_config() != "flat/none" and not (self._read_manifest(country) or {}).get("index", {}).get("fallback"):
+            return False
+        return type(faiss.downcast_index(store.index)) in (faiss.IndexFlat, faiss.IndexFlatL2, faiss.IndexFlatIP)
+    
+    def _store_documents(self, store: FAISS) -> Dict[str, Document]:
+        """저장소에 들어 있는 문서를 청크 해시 기준으로 반환"""
+        docs = {}
+        for doc_id in store.index_to_docstore_id.values():
+            doc = store.docstore.search(doc_id)
+            if isinstance(doc, Document):
+                docs.setdefault(self.chunk_hash(doc), doc)
+        return docs
+    
+    def _unique_by_hash(self, documents: List[Document]) -> Dict[str, Document]:
+        unique = {}
+        for doc in documents:
+            unique.setdefault(self.chunk_hash(doc), doc)
+        return unique
+    
+    def _current_store_path(self, country: str) -> Optional[str]:
+        """로드한 저장소 버전 경로 (로드 전이면 현재 버전 포인터 기준)"""
+        return self._store_paths.get(country) or resolve_store_path(country)
+    
+    def _read_manifest(self, country: str) -> Optional[Dict]:
+        store_path = self._current_store_path(country)
+        return self._read_manifest_at(store_path) if store_path else None
+    
+    @staticmethod
+    def _read_manifest_at(store_path: str) -> Optional[Dict]:
+        manifest_path = os.path.join(store_path, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"매니페스트 로드 실패 ({store_path}): {e}")
+            return None
+    
+    def _load_or_build_manifest(self, country: str, store: FAISS) -> Dict[str, str]:
+        """청크 해시 → 문서 ID 매핑 (매니페스트가 없는 기존 저장소는 docstore에서 재구성)"""
+        manifest = self._read_manifest(country)
+        if manifest:
+            return dict(manifest["chunks"])
+        
+        chunks = {}
+        for doc_id in store.index_to_docstore_id.values():
+            doc = store.docstore.search(doc_id)
+            if isinstance(doc, Document):
+                chunks.setdefault(self.chunk_hash(doc), doc_id)
+        return chunks
+    
+    def _save_store(self, store_path: str, country: str, store: FAISS, chunks: Dict[str, str], index_info: Optional[Dict] = None):
+        """저장소를 버전 디렉터리에 저장 후 매니페스트를 임시 파일에 쓰고 교체 (index_info가 없으면 기존 인덱스 정보 유지)"""
+        os.makedirs(Config.VECTOR_STORE_PATH, exist_ok=True)
+        store.save_local(store_path)
+        LexicalIndex.from_store(store).save(store_path)
+        
+        if index_info is None:
+            previous = self._read_manifest(country) or {}
+            index_info = previous.get("index") or {"config": self._index_config(), "factory": "Flat", "recall_at_k": 1.0}
+        
+        manifest_path = os.path.join(store_path, "manifest.json")
+        with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({
+                "embedding_model": Config.EMBEDDING_MODEL,
+                "updated_at": datetime.now().isoformat(),
+                "document_count": store.index.ntotal,
+                "index": index_info,
+                "chunks": chunks
+            }, f, ensure_ascii=False)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+    
     def get_store_info(self) -> dict:
         """벡터 저장소 정보 조회"""
         info = {}
         for country, store in self.vector_stores.items():
             try:
                 doc_count = store.index.ntotal if hasattr(store, 'index') else 'Unknown'
+                index_info = (self._read_manifest(country) or {}).get("index", {})
+                store_path = self._current_store_path(country)
+                index_file = os.path.join(store_path, "index.faiss") if store_path else ""
                 info[country] = {
                     "loaded": True,
-                    "document_count": doc_count
+                    "version": os.path.basename(store_path) if store_path else None,
+                    "document_count": doc_count,
+                    "index_type": self._index_type_name(store.index),
+                    "index_factory": index_info.get("factory", "Flat"),
+                    "memory_mapped": country in self._mmap_countries,
+                    "index_file_bytes": os.path.getsize(index_file) if os.path.exists(index_file) else None,
+                    "index_memory_bytes": self._index_memory_bytes(country, store.index),
+                    "recall_vs_flat": index_info.get("recall_at_k", 1.0)
                 }
             except:
                 info[country] = {
@@ -129,6 +657,22 @@ class VectorStoreService:
                 }
         return info
     
+    def _index_memory_bytes(self, country: str, index) -> Optional[int]:
+        """인덱스가 프로세스 메모리에서 차지하는 크기 (직렬화 크기 기준)
+        
+        메모리 매핑된 IVF 인덱스의 역색인 목록은 프로세스 간 공유되는 페이지 캐시에 있으므로 None을 반환합니다.
+        """
+        import faiss
+        
+        if country in self._mmap_countries:
+            return None
+        return int(faiss.serialize_index(index).nbytes)
+    
+    @staticmethod
+    def _index_type_name(index) -> str:
+        import faiss
+        return type(faiss.downcast_index(index)).__name__
+    
     def get_document_count(self, country: str) -> int:
         """특정 국가의 벡터 저장소 문서 수 반환"""
         if country not in self.vector_stores:
@@ -164,14 +708,13 @@ class VectorStoreService:
             }
         
         # 파일 시스템에 있지만 로드되지 않은 저장소 확인
-        if os.path.exists(Config.VECTOR_STORE_PATH):
-            for item in os.listdir(Config.VECTOR_STORE_PATH):
-                if item.endswith('_faiss'):
-                    country = item.replace('_faiss', '')
-                    if country not in info:
-                        info[country] = {
-                            "loaded": False,
-                            "document_count": "Not loaded",
-                            "store_type": "FAISS",
-                            "embedding_model": Config.EMBEDDING_MODEL
-                        } 
\ No newline at end of file
+        for country in (c.lower() for c in Config.COUNTRIES):
+            if country not in info and resolve_store_path(country):
+                info[country] = {
+                    "loaded": False,
+                    "document_count": "Not loaded",
+                    "store_type": "FAISS",
+                    "embedding_model": Config.EMBEDDING_MODEL
+                } 
+        
+        return info
\ No newline at end of file
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 저장소 루트의 config/services/utils를 import할 수 있도록 경로 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
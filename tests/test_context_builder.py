@@ -0,0 +1,77 @@
+import pytest
+from langchain_core.documents import Document
+from config import Config
+from services.context_builder import ContextBuilder
+from services.metrics import metrics
+
+
+@pytest.fixture
+def builder(monkeypatch):
+    monkeypatch.setattr(Config, "CONTEXT_TOKEN_BUDGET", {"google_play": 30, "app_store": 1000})
+    metrics.reset()
+    builder = ContextBuilder()
+    # tiktoken 인코딩 대신 글자 수 추정 (한글 1글자 = 1토큰, "문서 N: " = 3토큰)
+    builder._encoding, builder._encoding_loaded = None, True
+    return builder
+
+
+def _doc(text, source="https://help.example/docs/출금"):
+    return Document(page_content=text, metadata={"source": source})
+
+
+def test_chunks_are_packed_in_relevance_order_within_budget(builder):
+    docs = [_doc("가" * 10, "a"), _doc("나" * 20, "b"), _doc("다" * 10, "c")]
+    
+    selected, context, tokens = builder.build(docs, "google_play")
+    
+    # 두 번째 청크는 예산을 넘어 건너뛰고, 더 짧은 세 번째 청크는 담음
+    assert selected == [docs[0], docs[2]]
+    assert context == f"문서 1: {'가' * 10}\n\n문서 2: {'다' * 10}"
+    assert tokens == 13 + 15
+    assert metrics.counters["context_chunks_over_budget_total"] == 1
+
+
+def test_most_relevant_chunk_is_truncated_to_budget(builder):
+    selected, context, tokens = builder.build([_doc("가" * 50), _doc("나" * 5)], "google_play")
+    
+    assert len(selected) == 1
+    assert context.startswith("문서 1: 가")
+    assert tokens <= 30
+
+
+def test_overlapping_and_contained_chunks_are_deduplicated(builder):
+    first = "출금 신청은 마이페이지에서 할 수 있으며 영업일 기준 3일 이내에 처리됩니다."
+    overlap = first[-25:]
+    second = overlap + " 처리 결과는 알림으로 안내됩니다."
+    contained = "마이페이지에서 할 수 있으며"
+    
+    selected, context, _ = builder.build([_doc(first), _doc(contained), _doc(second)], "app_store")
+    
+    assert selected == [_doc(first), _doc(second)]
+    assert context == f"문서 1: {first}\n\n문서 2: 처리 결과는 알림으로 안내됩니다."
+    assert metrics.counters["context_chunks_deduplicated_total"] == 1
+
+
+def test_chunk_token_counts_are_cached_by_chunk_id(builder, monkeypatch):
+    counted = []
+    count_tokens = builder.count_tokens
+    monkeypatch.setattr(builder, "count_tokens", lambda text: counted.append(text) or count_tokens(text))
+    docs = [_doc("출금 안내"), _doc("광고 안내", "b")]
+    
+    builder.build(docs, "app_store")
+    builder.build(docs, "app_store")
+    
+    assert counted.count("출금 안내") == 1
+    assert counted.count("광고 안내") == 1
+
+
+def test_savings_compare_against_joining_every_chunk(builder):
+    assert ContextBuilder.savings() is None
+    first = "출금 신청은 마이페이지에서 할 수 있으며 영업일 기준 3일 이내에 처리됩니다."
+    
+    _, _, tokens = builder.build([_doc(first), _doc(first[5:30])], "app_store")
+    
+    savings = ContextBuilder.savings()
+    assert savings["builds"] == 1
+    assert savings["context_tokens"] == tokens
+    assert savings["saved_tokens"] == savings["baseline_tokens"] - tokens > 0
@@ -0,0 +1,162 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from config import Config
+from utils.document_loader import DocumentLoader
+
+
+class FixtureSite:
+    """경로 → HTML 본문 고정 사이트 (robots.txt, sitemap.xml, ETag/304 지원, 요청 기록)"""
+    
+    def __init__(self):
+        self.pages = {}
+        self.errors = {}  # 경로 → 응답 상태 코드 (일시적 오류 재현)
+        self.requests = []  # (경로, If-None-Match 헤더)
+        self.lock = threading.Lock()
+        site = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+            
+            def do_GET(self):
+                with site.lock:
+                    site.requests.append((self.path, self.headers.get("If-None-Match")))
+                host = self.headers.get("Host")
+                if self.path == "/robots.txt":
+                    return self._send(f"User-agent: *\nDisallow: /docs/private\nSitemap: http://{host}/sitemap.xml\n", "text/plain")
+                if self.path == "/sitemap.xml":
+                    locs = "".join(f"<url><loc>http://{host}{path}</loc></url>" for path in ("/docs/from-sitemap", "/other/outside"))
+                    return self._send(f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>', "application/xml")
+                status = site.errors.get(self.path.split("?")[0])
+                body = site.pages.get(self.path.split("?")[0])
+                if status is not None or body is None:
+                    self.send_response(status or 404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self._send(body, "text/html")
+            
+            def _send(self, body: str, content_type: str):
+                encoded = body.encode('utf-8')
+                etag = '"' + hashlib.md5(encoded).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(encoded)
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def requested_paths(self):
+        with self.lock:
+            return [path for path, _ in self.requests]
+
+
+def _html(title: str, *links: str) -> str:
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><body><nav>{anchors}</nav><h1>{title}</h1><p>{title} 본문입니다.</p></body></html>"
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "CRAWL_CACHE_PATH", str(tmp_path / "crawl_cache.json"))
+    monkeypatch.setattr(Config, "CRAWL_TIMEOUT", 5)
+    
+    fixture = FixtureSite()
+    fixture.pages = {
+        "/docs": _html(
+            "시작",
+            "/docs/a", "/docs/a?utm_source=mail", "/docs/a#top",  # 정규화 후 같은 URL
+            "/docs/private/secret",                             # robots.txt 금지
+            "/other/page", "http://example.invalid/docs/x",     # 범위 밖 (경로·호스트)
+            "/docs/logo.png"                                    # 수집하지 않는 확장자
+        ),
+        "/docs/a": _html("문서 A", "/docs/b"),
+        "/docs/b": _html("문서 B"),
+        "/docs/from-sitemap": _html("사이트맵 문서"),
+        "/docs/private/secret": _html("비공개"),
+        "/other/page": _html("다른 경로"),
+    }
+    thread = threading.Thread(target=fixture.server.serve_forever, daemon=True)
+    thread.start()
+    yield fixture
+    fixture.server.shutdown()
+    fixture.server.server_close()
+
+
+def _crawl(site):
+    loader = DocumentLoader()
+    documents = loader.load_web_documents({"kr": f"{site.base}/docs"})
+    return loader, documents
+
+
+def test_crawl_respects_robots_sitemap_and_scope(site):
+    _, documents = _crawl(site)
+    
+    sources = {doc.metadata["source"].replace(site.base, "") for doc in documents}
+    assert sources == {"/docs", "/docs/a", "/docs/b", "/docs/from-sitemap"}
+    
+    paths = site.requested_paths()
+    for path in ("/docs/private/secret", "/other/page", "/other/outside", "/docs/logo.png"):
+        assert path not in paths
+    # 추적 파라미터·프래그먼트가 달라도 한 번만 요청
+    page_requests = [path for path in paths if path.startswith("/docs")]
+    assert sorted(page_requests) == sorted(set(page_requests))
+
+
+def test_recrawl_uses_conditional_get(site):
+    _crawl(site)
+    site.requests.clear()
+    site.pages["/docs/b"] = _html("문서 B 수정됨")
+    
+    loader, documents = _crawl(site)
+    
+    conditional = {path for path, etag in site.requests if etag}
+    assert {"/docs", "/docs/a", "/docs/b", "/docs/from-sitemap"} <= conditional
+    assert loader.stats == {"fetched": 1, "not_modified": 3, "failed": 0}
+    # 304 응답은 캐시된 본문으로, 바뀐 페이지는 새 본문으로 문서 생성
+    contents = {doc.metadata["source"].replace(site.base, ""): doc.page_content for doc in documents}
+    assert "문서 B 수정됨" in contents["/docs/b"]
+    assert "문서 A" in contents["/docs/a"]
+
+
+def test_failed_fetch_uses_cached_page(site):
+    _crawl(site)
+    site.errors["/docs/a"] = 503
+    del site.pages["/docs/b"]
+    
+    loader, documents = _crawl(site)
+    
+    contents = {doc.metadata["source"].replace(site.base, ""): doc.page_content for doc in documents}
+    # 일시적 오류는 캐시된 본문으로 대체하고, 삭제된 페이지(404)만 빠짐
+    assert "문서 A" in contents["/docs/a"]
+    assert "/docs/b" not in contents
+    resolved = {url.replace(site.base, "") for url in loader.resolved_urls}
+    assert {"/docs", "/docs/a", "/docs/b", "/docs/from-sitemap", "/docs/private/secret"} <= resolved
+
+
+def test_failed_fetch_without_cache_is_unresolved(site):
+    site.errors["/docs/a"] = 503
+    
+    loader, documents = _crawl(site)
+    
+    # 처음 받는 페이지가 실패하면 확인하지 못한 페이지로 남아 기존 청크가 유지됨
+    assert f"{site.base}/docs/a" not in loader.resolved_urls
+    assert f"{site.base}/docs" in loader.resolved_urls
+
+
+def test_normalize_url():
+    assert DocumentLoader._normalize_url("HTTP://Example.com:80/a//b/?utm_source=x&b=2&a=1#frag") == "http://example.com/a/b?a=1&b=2"
+    assert DocumentLoader._in_scope("http://h/docs", "http://h/docs/x")
+    assert not DocumentLoader._in_scope("http://h/docs", "http://h/docs-other")
+    assert not DocumentLoader._in_scope("http://h/docs", "http://h/docs/x.pdf")
@@ -0,0 +1,61 @@
+import multiprocessing
+from services.embedding_cache import EmbeddingCache
+
+
+def _vector(seed: int) -> list:
+    return [float(seed), float(seed) + 0.5, -float(seed)]
+
+
+def _write_many(cache_path: str, prefix: str, count: int):
+    cache = EmbeddingCache("test-model", cache_path)
+    for i in range(count):
+        cache.put_many([f"{prefix}{i}"], [_vector(hash((prefix, i)) % 1000)])
+
+
+def test_second_writer_sees_rows_added_by_first(tmp_path):
+    first = EmbeddingCache("test-model", str(tmp_path))
+    second = EmbeddingCache("test-model", str(tmp_path))
+    
+    first.put_many(["a"], [_vector(1)])
+    second.put_many(["b"], [_vector(2)])
+    
+    # 두 번째 인스턴스는 첫 번째가 추가한 행 다음 위치에 써야 함
+    assert second.get_many(["b"]) == {"b": _vector(2)}
+    reopened = EmbeddingCache("test-model", str(tmp_path))
+    assert reopened.get_many(["a", "b"]) == {"a": _vector(1), "b": _vector(2)}
+
+
+def test_concurrent_processes_keep_vectors_and_keys_aligned(tmp_path):
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_write_many, args=(str(tmp_path), prefix, 50))
+        for prefix in ("p", "q", "r")
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    
+    cache = EmbeddingCache("test-model", str(tmp_path))
+    assert len(cache) == 150
+    for prefix in ("p", "q", "r"):
+        for i in range(50):
+            assert cache.get_many([f"{prefix}{i}"])[f"{prefix}{i}"] == _vector(hash((prefix, i)) % 1000)
+
+
+def test_read_only_cache_hands_new_vectors_to_parent(tmp_path):
+    parent = EmbeddingCache("test-model", str(tmp_path))
+    parent.put_many(["a"], [_vector(1)])
+    worker = EmbeddingCache("test-model", str(tmp_path), read_only=True)
+    
+    worker.put_many(["a", "b"], [_vector(1), _vector(2)])
+    # 작업자는 파일에 쓰지 않지만 자신이 계산한 벡터는 다시 조회할 수 있음
+    assert worker.get_many(["a", "b"]) == {"a": _vector(1), "b": _vector(2)}
+    assert EmbeddingCache("test-model", str(tmp_path)).get_many(["b"]) == {}
+    
+    hashes, vectors = worker.take_pending()
+    assert hashes == ["b"]
+    assert worker.take_pending() == ([], [])
+    parent.put_many(hashes, vectors)
+    assert EmbeddingCache("test-model", str(tmp_path)).get_many(["b"]) == {"b": _vector(2)}
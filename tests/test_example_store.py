@@ -0,0 +1,60 @@
+from datetime import datetime
+import pytest
+from langchain_core.embeddings import Embeddings
+from models.review import Review
+from services.example_store import ExampleStore
+
+
+class FakeEmbeddings(Embeddings):
+    """글자 빈도 벡터 임베딩 (offline=True면 API 연결 오류처럼 실패)"""
+    
+    def __init__(self, offline=False):
+        self.offline = offline
+        self.calls = 0
+    
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.offline:
+            raise ConnectionError("Connection error.")
+        return [self._vector(text) for text in texts]
+    
+    def embed_query(self, text):
+        self.calls += 1
+        if self.offline:
+            raise ConnectionError("Connection error.")
+        return self._vector(text)
+    
+    @staticmethod
+    def _vector(text):
+        vector = [0.0] * 16
+        for char in text:
+            vector[ord(char) % 16] += 1.0
+        return vector
+
+
+@pytest.fixture
+def review():
+    return Review(id="1", author="사용자", rating=1, content="출금이 안 돼요",
+                  created_at=datetime(2024, 1, 1), country="KR", platform="google_play")
+
+
+def test_embedding_failure_falls_back_to_no_examples(tmp_path, review):
+    embeddings = FakeEmbeddings(offline=True)
+    store = ExampleStore(embeddings, store_path=str(tmp_path / "examples"))
+    
+    assert len(store) == 0
+    assert "Connection error" in store.refresh_error
+    # 실패를 기억하고 리뷰마다 임베딩을 다시 요청하지 않음
+    calls = embeddings.calls
+    assert store.search(review) == []
+    assert store.search(review) == []
+    assert embeddings.calls == calls
+
+
+def test_store_recovers_on_next_start(tmp_path, review):
+    ExampleStore(FakeEmbeddings(offline=True), store_path=str(tmp_path / "examples"))
+    
+    # 실패한 갱신은 지문을 저장하지 않으므로 다음 시작 때 다시 임베딩
+    store = ExampleStore(FakeEmbeddings(), store_path=str(tmp_path / "examples"))
+    assert len(store) > 0
+    assert store.refresh_error is None
@@ -0,0 +1,95 @@
+import json
+from langchain_core.messages import AIMessage, HumanMessage
+from services import metrics as metrics_module
+from services.metrics import MetricsRegistry, invoke_llm
+
+
+def test_percentiles_use_nearest_rank():
+    registry = MetricsRegistry(max_samples=1000)
+    for ms in range(1, 101):
+        registry.observe("generation", ms / 1000)
+    
+    assert registry.percentiles("generation") == {"count": 100, "p50": 50.0, "p95": 95.0, "p99": 99.0, "mean": 50.5}
+    assert registry.percentiles("unknown") == {"count": 0}
+
+
+def test_sample_window_is_bounded_but_totals_are_not():
+    registry = MetricsRegistry(max_samples=10)
+    for ms in range(1, 101):
+        registry.observe("retrieval", ms / 1000)
+    
+    stats = registry.percentiles("retrieval")
+    # 분위수는 최근 10개(91~100ms), 횟수·평균은 전체 누적
+    assert (stats["count"], stats["p50"], stats["mean"]) == (100, 95.0, 50.5)
+
+
+def test_hit_rate_counts_hits_and_misses():
+    registry = MetricsRegistry()
+    assert registry.hit_rate("response_cache") is None
+    
+    registry.increment("response_cache_hits_total")
+    registry.increment("response_cache_misses_total", 3)
+    assert registry.hit_rate("response_cache") == 0.25
+
+
+def test_llm_usage_and_cached_prompt_ratio():
+    registry = MetricsRegistry()
+    registry.record_llm_usage("generation", 1000, 200, cached_tokens=768)
+    registry.record_llm_usage("classification", 500, 5, estimated=True)
+    
+    assert registry.counters["llm_calls_total"] == 2
+    assert registry.counters["llm_generation_prompt_tokens_total"] == 1000
+    assert registry.counters["llm_prompt_cache_hits_total"] == 1
+    assert registry.counters["llm_usage_estimated_total"] == 1
+    assert registry.cached_prompt_ratio() == 768 / 1500
+
+
+def test_worker_state_merges_into_parent():
+    parent, worker = MetricsRegistry(), MetricsRegistry()
+    parent.observe("generation", 0.1)
+    worker.observe("generation", 0.3)
+    worker.increment("reviews_processed_total", 2)
+    
+    parent.merge_state(json.loads(json.dumps(worker.export_state())))
+    
+    assert parent.percentiles("generation")["count"] == 2
+    assert parent.percentiles("generation")["mean"] == 200.0
+    assert parent.counters["reviews_processed_total"] == 2
+
+
+def test_prometheus_and_trace_exports(tmp_path):
+    trace_path = tmp_path / "trace.jsonl"
+    registry = MetricsRegistry(trace_path=str(trace_path))
+    registry.observe("generation", 0.25, review_id="1")
+    registry.increment("llm_calls_total")
+    
+    prom_path = tmp_path / "metrics" / "reviewbot.prom"
+    registry.write_prometheus(str(prom_path))
+    lines = prom_path.read_text(encoding='utf-8').splitlines()
+    
+    assert 'reviewbot_stage_duration_seconds{stage="generation",quantile="0.95"} 0.250000' in lines
+    assert 'reviewbot_stage_duration_seconds_count{stage="generation"} 1' in lines
+    assert "reviewbot_llm_calls_total 1" in lines
+    
+    record = json.loads(trace_path.read_text(encoding='utf-8'))
+    assert (record["stage"], record["duration_ms"], record["review_id"]) == ("generation", 250.0, "1")
+
+
+class NoUsageLLM:
+    """usage를 돌려주지 않는 LLM (호환 서버 등)"""
+    
+    def invoke(self, messages, config=None):
+        return AIMessage(content="감사합니다")
+
+
+def test_invoke_llm_estimates_tokens_without_usage(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_module, "metrics", registry)
+    
+    result = invoke_llm(NoUsageLLM(), [HumanMessage(content="앱이 꺼져요")], estimated_tokens=10, stage="generation")
+    
+    assert result.content == "감사합니다"
+    assert registry.counters["llm_usage_estimated_total"] == 1
+    assert registry.counters["llm_generation_prompt_tokens_total"] == 5  # 한글 5자 (공백 제외)
+    assert registry.counters["llm_generation_completion_tokens_total"] == 5
+    assert registry.percentiles("llm_generation")["count"] == 1
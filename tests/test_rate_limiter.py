@@ -0,0 +1,153 @@
+import pytest
+import services.rate_limiter as rate_limiter_module
+from services.rate_limiter import RateLimiter, _TokenBucket
+
+
+class FakeClock:
+    """sleep이 실제로 기다리지 않고 시각만 진행하는 시계"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FullJitter:
+    """지터 구간의 상한을 돌려주는 random 대체"""
+    
+    @staticmethod
+    def uniform(low, high):
+        return high
+
+
+class RateLimitError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("Error code: 429")
+        self.status_code = 429
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+class Flaky:
+    """errors를 차례로 발생시킨 뒤 성공하는 호출"""
+    
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, "time", clock)
+    monkeypatch.setattr(rate_limiter_module, "random", FullJitter)
+    return clock
+
+
+def _limiter(**kwargs):
+    options = dict(requests_per_minute=6000, tokens_per_minute=10_000_000, max_concurrency=8,
+                   max_retries=3, base_delay=1.0, max_delay=30.0)
+    options.update(kwargs)
+    return RateLimiter(**options)
+
+
+def test_rate_limit_backs_off_exponentially_and_halves_concurrency(clock):
+    limiter = _limiter()
+    fn = Flaky(RateLimitError(), RateLimitError())
+    
+    assert limiter.call(fn) == "ok"
+    
+    assert clock.sleeps == [1.0, 2.0]
+    assert limiter.stats == {"calls": 3, "rate_limited": 2, "retries": 2, "failures": 0}
+    # 1초 이상 떨어진 429마다 절반 감소(8 → 4 → 2) 후 성공으로 1/한도만큼 가산 증가
+    assert limiter._limit == 2.5
+    assert limiter.concurrency_limit == 2
+
+
+def test_burst_of_rate_limits_halves_once_per_second(clock):
+    limiter = _limiter()
+    for _ in range(3):
+        limiter._on_rate_limited()
+    assert limiter.concurrency_limit == 4
+    
+    clock.now += 1.0
+    limiter._on_rate_limited()
+    assert limiter.concurrency_limit == 2
+
+
+def test_retry_after_header_is_honoured_and_capped(clock):
+    limiter = _limiter(max_delay=10.0)
+    
+    limiter.call(Flaky(RateLimitError(retry_after="3"), RateLimitError(retry_after="120")))
+    
+    # retry-after(최대 max_delay) + 최대 base_delay 지터
+    assert clock.sleeps == [4.0, 11.0]
+
+
+def test_exponential_delay_is_capped_and_retries_are_bounded(clock):
+    limiter = _limiter(max_retries=3, base_delay=4.0, max_delay=10.0)
+    fn = Flaky(*[APIConnectionError("reset") for _ in range(5)])
+    
+    with pytest.raises(APIConnectionError):
+        limiter.call(fn)
+    
+    assert clock.sleeps == [4.0, 8.0, 10.0]
+    assert fn.calls == 4
+    assert limiter.stats["failures"] == 1
+    # 연결 오류는 동시 실행 수를 줄이지 않음
+    assert limiter.concurrency_limit == 8
+
+
+def test_non_retryable_error_is_raised_without_waiting(clock):
+    limiter = _limiter()
+    fn = Flaky(ValueError("bad request"))
+    
+    with pytest.raises(ValueError):
+        limiter.call(fn)
+    assert clock.sleeps == []
+    assert fn.calls == 1
+
+
+def test_concurrency_recovers_additively_to_max(clock):
+    limiter = _limiter(max_concurrency=4)
+    limiter._on_rate_limited()
+    clock.now += 1.0
+    limiter._on_rate_limited()
+    assert limiter.concurrency_limit == 1
+    
+    limits = []
+    for _ in range(8):
+        limiter.call(lambda: None)
+        limits.append(limiter.concurrency_limit)
+    
+    # 한도 1 → 2 → 2.5 → 2.9 → ... (현재 한도만큼 성공해야 1 증가), 최대값에서 멈춤
+    assert limits == [2, 2, 2, 3, 3, 3, 4, 4]
+    assert limiter._limit == 4
+
+
+def test_token_bucket_waits_for_refill(clock):
+    bucket = _TokenBucket(60)  # 초당 1개 보충
+    
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == 1.0
+    clock.now += 1.0
+    assert bucket.reserve(1) == 1.0
+    clock.now += 10.0
+    assert bucket.reserve(1) == 0.0
+    # 용량보다 큰 요청은 용량만큼만 차감
+    assert bucket.reserve(1000) == pytest.approx(52.0)
@@ -0,0 +1,147 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from services.response_cache import ResponseCacheStore
+
+
+def _data(country, category, text, generated_at="2024-01-01T09:00:00"):
+    return {"country": country, "platform": "google_play", "category": category,
+            "response_text": text, "generated_at": generated_at}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCacheStore(str(tmp_path / "cache.db"), legacy_json_path=str(tmp_path / "cache.json"))
+    yield cache
+    cache.close()
+
+
+def test_overwrite_moves_stats_to_new_values(cache):
+    cache["a"] = _data("KR", "포인트_관련", "답변입니다")
+    cache["a"] = _data("US", "기타", "Thanks!", generated_at="2024-01-02T09:00:00")
+    
+    assert len(cache) == 1
+    assert cache.stat_counts("country") == {"US": 1}
+    assert cache.stat_counts("category") == {"기타": 1}
+    assert cache.stat_counts("daily") == {"2024-01-02": 1}
+    assert cache.average_response_length() == len("Thanks!")
+
+
+def test_delete_removes_stats_and_approval(cache):
+    cache["a"] = _data("KR", "포인트_관련", "답변입니다")
+    cache["b"] = _data("KR", "기타", "감사합니다")
+    cache.approve("a")
+    
+    del cache["a"]
+    
+    assert len(cache) == 1
+    assert cache.stat_counts("category") == {"기타": 1}
+    assert cache.stat_counts("response_length") == {"chars": len("감사합니다"), "responses": 1}
+    assert cache.approved_keys() == []
+    with pytest.raises(KeyError):
+        del cache["a"]
+
+
+def test_legacy_json_is_migrated_once(tmp_path):
+    legacy_path = tmp_path / "cache.json"
+    legacy_path.write_text(json.dumps({
+        "a": _data("KR", "포인트_관련", "답변입니다"),
+        "b": _data("US", "기타", "Thanks!")
+    }), encoding='utf-8')
+    
+    cache = ResponseCacheStore(str(tmp_path / "cache.db"), legacy_json_path=str(legacy_path))
+    assert cache["a"]["response_text"] == "답변입니다"
+    assert cache.stat_counts("country") == {"US": 1, "KR": 1}
+    assert not legacy_path.exists()
+    assert (tmp_path / "cache.json.migrated").exists()
+    cache.close()
+    
+    # 다시 열어도 중복 집계하지 않음
+    reopened = ResponseCacheStore(str(tmp_path / "cache.db"), legacy_json_path=str(legacy_path))
+    assert len(reopened) == 2
+    reopened.close()
+
+
+def test_batch_only_defers_writes_of_joined_threads(cache):
+    reader = ResponseCacheStore(cache.db_path, read_only=True)
+    
+    with cache.batch():
+        with ThreadPoolExecutor(max_workers=2, initializer=cache.join_batch) as executor:
+            executor.submit(cache.__setitem__, "batched", _data("KR", "기타", "배치 답변")).result()
+        assert "batched" not in reader
+        
+        # 배치에 참여하지 않은 스레드(데몬의 단건 요청 등)의 쓰기는 바로 커밋
+        single = threading.Thread(target=cache.__setitem__, args=("single", _data("KR", "기타", "단건 답변")))
+        single.start()
+        single.join()
+        assert "single" in reader
+    
+    assert "batched" in reader
+    reader.close()
+
+
+def _recount(cache, field):
+    counts = {}
+    for data in cache.values():
+        value = str(data.get(field) or "Unknown")
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def test_incremental_stats_match_full_recount(cache):
+    countries, categories = ["KR", "US"], ["포인트_관련", "기타", "기능_오류"]
+    with cache.batch():
+        for i in range(60):
+            key = f"key-{i % 25}"
+            if i % 7 == 6 and key in cache:
+                del cache[key]
+            else:
+                cache[key] = _data(countries[i % 2], categories[i % 3], "답변" * (i % 5), f"2024-01-{i % 9 + 1:02d}T09:00:00")
+    
+    assert len(cache) == len(list(cache.keys()))
+    assert cache.stat_counts("country") == _recount(cache, "country")
+    assert cache.stat_counts("category") == _recount(cache, "category")
+    texts = [data["response_text"] for data in cache.values() if data["response_text"]]
+    assert cache.average_response_length() == sum(map(len, texts)) / len(texts)
+
+
+def test_cache_without_stats_is_aggregated_once(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = ResponseCacheStore(db_path, legacy_json_path=str(tmp_path / "cache.json"))
+    cache["a"] = _data("KR", "기타", "답변")
+    cache["b"] = _data("US", "기타", "Thanks")
+    # stats 테이블 도입 전 캐시처럼 집계와 버전 표시를 지움
+    cache._conn.execute("DELETE FROM stats")
+    cache._conn.execute("DELETE FROM meta")
+    cache.close()
+    
+    reopened = ResponseCacheStore(db_path, legacy_json_path=str(tmp_path / "cache.json"))
+    assert len(reopened) == 2
+    assert reopened.stat_counts("country") == {"US": 1, "KR": 1}
+    reopened.close()
+
+
+def test_statistics_do_not_scan_cache_or_load_stores(tmp_path, monkeypatch):
+    from config import Config
+    from services.review_bot import ReviewBot
+    from utils.vector_store_paths import set_current_version
+    
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_PATH", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(Config, "LEGACY_RESPONSE_CACHE_FILE", str(tmp_path / "cache.json"))
+    monkeypatch.setattr(Config, "VECTOR_STORE_PATH", str(tmp_path / "vector_stores"))
+    version_path = tmp_path / "vector_stores" / "kr_faiss.v1"
+    version_path.mkdir(parents=True)
+    (version_path / "manifest.json").write_text(json.dumps({"document_count": 42}), encoding='utf-8')
+    set_current_version("kr", str(version_path))
+    
+    bot = ReviewBot(fused_mode=False)
+    bot.response_cache["a"] = _data("KR", "기타", "답변")
+    monkeypatch.setattr(bot.response_cache, "items", lambda: pytest.fail("전체 캐시를 순회함"))
+    
+    stats = bot.get_statistics()
+    
+    assert stats["총 생성된 응답"] == 1
+    assert stats["국가별 분포"] == {"KR": 1}
+    assert stats["벡터 저장소 상태"]["kr"] == {"loaded": False, "document_count": 42}
+    assert bot._vector_store_service is None
@@ -0,0 +1,125 @@
+from datetime import datetime
+import pytest
+from langchain_core.embeddings import Embeddings
+from config import Config
+from models.review import Review
+from services.review_classifier import LocalReviewClassifier, ReviewClassifier
+
+
+@pytest.fixture
+def classifier():
+    return LocalReviewClassifier()
+
+
+@pytest.mark.parametrize("text", ["앱이 안 좋아요", "I love how it never pays", "not great, not awesome"])
+def test_negated_or_contrasted_praise_is_not_praise(classifier, text):
+    category, confidence = classifier.classify_by_rules(text)
+    assert category != "칭찬"
+    assert confidence < 0.75
+
+
+def test_single_weak_hit_falls_through(classifier):
+    category, confidence = classifier.classify_by_rules("교환 어떻게 하나요")
+    assert category == "상품_교환"
+    assert confidence < 0.75
+
+
+def test_tied_categories_fall_through(classifier):
+    # 광고·포인트가 한 번씩 매칭되면 어느 쪽도 확정하지 않음
+    _, confidence = classifier.classify_by_rules("광고 보고 포인트 지급 안됨")
+    assert confidence == 0.0
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("앱이 좋아요 최고 감사합니다", "칭찬"),
+    ("Great app, love it, thanks", "칭찬"),
+    ("포인트 적립이 안 돼요", "포인트_관련"),
+    ("앱이 계속 꺼져요 오류 나요", "기능_오류"),
+])
+def test_strong_matches_are_confident(classifier, text, expected):
+    assert classifier.classify_by_rules(text) == (expected, 1.0)
+
+
+def test_no_match(classifier):
+    assert classifier.classify_by_rules("음") == (None, 0.0)
+
+
+class TableEmbeddings(Embeddings):
+    """텍스트별로 정해둔 벡터를 돌려주는 임베딩 (cached에 있는 텍스트만 캐시된 것으로 취급)"""
+    
+    def __init__(self, table, cached=None):
+        self.table = table
+        self.cached = set(table) if cached is None else set(cached)
+        self.requested = []
+    
+    def embed_documents(self, texts):
+        self.requested.extend(texts)
+        return [self.table[text] for text in texts]
+    
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+    
+    def is_cached(self, texts):
+        return [text in self.cached for text in texts]
+
+
+SEEDS = [("포인트가 안 들어와요", "포인트_관련"), ("광고가 안 나와요", "광고_관련"), ("앱이 멈춰요", "기능_오류")]
+VECTORS = {
+    "포인트가 안 들어와요": [1.0, 0.0, 0.0, 0.0],
+    "광고가 안 나와요": [0.0, 1.0, 0.0, 0.0],
+    "앱이 멈춰요": [0.0, 0.0, 1.0, 0.0],
+    "리워드가 안 쌓여요": [1.0, 0.1, 0.0, 0.2],
+    # 어느 중심점과도 멀지만 포인트 쪽으로 조금 치우친 리뷰 (softmax만 보면 확신)
+    "오늘 점심 메뉴 추천해주세요": [0.2, 0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def centroid_classifier(monkeypatch):
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(LocalReviewClassifier, "_collect_seed_examples", lambda self: list(SEEDS))
+    
+    classifier = ReviewClassifier(embeddings=TableEmbeddings(VECTORS))
+    classifier.llm_calls = []
+    classifier._classify_with_llm = lambda review: classifier.llm_calls.append(review.content) or "기타"
+    return classifier
+
+
+def _review(content):
+    return Review(id="1", author="사용자", rating=3, content=content,
+                  created_at=datetime(2024, 1, 1), country="KR", platform="google_play")
+
+
+def test_in_domain_review_is_classified_by_centroid(centroid_classifier):
+    assert centroid_classifier.classify_review(_review("리워드가 안 쌓여요")) == "포인트_관련"
+    assert centroid_classifier.tier_counts == {"rules": 0, "centroid": 1, "llm": 0}
+
+
+def test_off_topic_review_falls_through_to_llm(centroid_classifier):
+    local = centroid_classifier.local_classifier
+    assert local.classify_by_centroid("오늘 점심 메뉴 추천해주세요") == (None, 0.0)
+    
+    assert centroid_classifier.classify_review(_review("오늘 점심 메뉴 추천해주세요")) == "기타"
+    assert centroid_classifier.llm_calls == ["오늘 점심 메뉴 추천해주세요"]
+    assert centroid_classifier.tier_counts["llm"] == 1
+
+
+def test_uncached_review_is_not_embedded(centroid_classifier):
+    embeddings = centroid_classifier.local_classifier.embeddings
+    embeddings.cached.discard("리워드가 안 쌓여요")
+    
+    # 중심점 단계는 이미 계산된 임베딩만 사용하고 API 호출 없이 LLM 단계로 넘김
+    assert centroid_classifier.classify_review(_review("리워드가 안 쌓여요")) == "기타"
+    assert "리워드가 안 쌓여요" not in embeddings.requested
+
+
+def test_worker_tier_counts_are_taken_and_merged(centroid_classifier):
+    centroid_classifier.classify_review(_review("리워드가 안 쌓여요"))
+    
+    counts = centroid_classifier.take_tier_counts()
+    assert counts == {"rules": 0, "centroid": 1, "llm": 0}
+    assert centroid_classifier.tier_counts == {"rules": 0, "centroid": 0, "llm": 0}
+    
+    centroid_classifier.merge_tier_counts(counts)
+    centroid_classifier.merge_tier_counts({"rules": 2, "centroid": 0, "llm": 1})
+    assert centroid_classifier.tier_counts == {"rules": 2, "centroid": 1, "llm": 1}
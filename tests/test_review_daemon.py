@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import pytest
+from services.review_daemon import HttpError, ReviewDaemon
+
+
+class FakeBot:
+    """업데이트가 release될 때까지 끝나지 않는 봇"""
+    
+    def __init__(self):
+        self.kb_update_lock = threading.Lock()
+        self.release = threading.Event()
+        self.updates = 0
+    
+    def update_knowledge_base(self):
+        with self.kb_update_lock:
+            self.updates += 1
+            self.release.wait(5)
+
+
+def _read(daemon, raw: bytes):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await daemon._read_request(reader)
+    return asyncio.run(read())
+
+
+def test_kb_refresh_conflicts_until_task_finishes():
+    bot = FakeBot()
+    daemon = ReviewDaemon(bot, run_scheduler=False)
+    
+    async def scenario():
+        status, _ = await daemon._post_kb_refresh(b"")
+        assert status == 202
+        # 작업이 실행 스레드에서 잠금을 잡기 전에 들어온 요청도 거절
+        with pytest.raises(HttpError) as error:
+            await daemon._post_kb_refresh(b"")
+        assert error.value.status == 409
+        with pytest.raises(HttpError) as error:
+            await daemon._post_kb_rollback(b"")
+        assert error.value.status == 409
+        
+        bot.release.set()
+        await daemon._refresh_task
+        status, _ = await daemon._post_kb_refresh(b"")
+        assert status == 202
+        await daemon._refresh_task
+    
+    asyncio.run(scenario())
+    assert bot.updates == 2
+    assert daemon._last_refresh["status"] == "completed"
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1.5"])
+def test_malformed_content_length_is_bad_request(length):
+    daemon = ReviewDaemon(FakeBot(), run_scheduler=False)
+    raw = f"POST /reviews HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode('latin-1')
+    
+    with pytest.raises(HttpError) as error:
+        _read(daemon, raw)
+    assert error.value.status == 400
+
+
+def test_request_body_is_read_by_content_length():
+    daemon = ReviewDaemon(FakeBot(), run_scheduler=False)
+    raw = b"POST /reviews/ HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}extra"
+    
+    assert _read(daemon, raw) == ("POST", "/reviews", "HTTP/1.1", {"content-length": "2"}, b"{}")
+
+
+@pytest.mark.parametrize("raw", [
+    b"GET /" + b"a" * 70_000 + b" HTTP/1.1\r\n\r\n",
+    b"GET /stats HTTP/1.1\r\nX-Padding: " + b"a" * 70_000 + b"\r\n\r\n",
+])
+def test_over_long_line_is_431(raw):
+    daemon = ReviewDaemon(FakeBot(), run_scheduler=False)
+    
+    with pytest.raises(HttpError) as error:
+        _read(daemon, raw)
+    assert error.value.status == 431
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b""
+    
+    def write(self, data):
+        self.data += data
+    
+    async def drain(self):
+        pass
+    
+    def close(self):
+        pass
+    
+    async def wait_closed(self):
+        pass
+
+
+def test_over_long_header_gets_a_response():
+    daemon = ReviewDaemon(FakeBot(), run_scheduler=False)
+    writer = FakeWriter()
+    
+    async def handle():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"GET /stats HTTP/1.1\r\nCookie: " + b"a" * 70_000 + b"\r\n\r\n")
+        reader.feed_eof()
+        await daemon._handle_connection(reader, writer)
+    asyncio.run(handle())
+    
+    assert writer.data.startswith(b"HTTP/1.1 431 Request Header Fields Too Large\r\n")
+    assert b"Connection: close" in writer.data
@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+import pytest
+from config import Config
+from models.review import Review, ReviewResponse
+from services.review_stream import ReviewStreamProcessor
+
+
+class FakeResponseCache:
+    @contextmanager
+    def batch(self):
+        yield
+    
+    def join_batch(self):
+        pass
+    
+    def flush(self):
+        pass
+
+
+class FakeBot:
+    """앞 번호 리뷰일수록 늦게 끝나는 봇 (완료 순서가 입력 순서와 반대), fail_ids는 예외 발생"""
+    
+    def __init__(self, fail_ids=(), stop_after=None):
+        self.response_cache = FakeResponseCache()
+        self.fail_ids = set(fail_ids)
+        self.stop_after = stop_after
+        self.calls = []
+        self.lock = threading.Lock()
+    
+    def process_review(self, review, relevant_docs=None, journal=None):
+        with self.lock:
+            self.calls.append(review.id)
+            if self.stop_after is not None and len(self.calls) > self.stop_after:
+                raise KeyboardInterrupt
+        time.sleep(0.02 * (5 - int(review.id) % 5))
+        if review.id in self.fail_ids:
+            raise RuntimeError("생성 실패")
+        return ReviewResponse(
+            review_id=review.id, response_text=f"답변 {review.id}",
+            generated_at=datetime(2024, 1, 1), country=review.country, platform=review.platform
+        )
+
+
+def _reviews(count):
+    return [
+        Review(id=str(i), author="사용자", rating=5, content=f"리뷰 {i}",
+               created_at=datetime(2024, 1, 1), country="KR", platform="google_play")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def no_journal(monkeypatch):
+    monkeypatch.setattr(Config, "RUN_JOURNAL_ENABLED", False)
+
+
+def _output_ids(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)["review_id"] for line in f]
+
+
+def test_stream_writes_in_input_order(tmp_path):
+    output = str(tmp_path / "out.jsonl")
+    bot = FakeBot(fail_ids={"3"})
+    
+    summary = ReviewStreamProcessor(bot, window_size=4, checkpoint_interval=2).process(_reviews(12), output, max_workers=4)
+    
+    assert _output_ids(output) == [str(i) for i in range(12) if i != 3]
+    assert (summary["input_records"], summary["responses"], summary["failed"]) == (12, 11, 1)
+
+
+def test_stream_resumes_from_checkpoint(tmp_path):
+    output = str(tmp_path / "out.jsonl")
+    processor = ReviewStreamProcessor(FakeBot(stop_after=6), window_size=2, checkpoint_interval=2)
+    with pytest.raises(KeyboardInterrupt):
+        processor.process(_reviews(10), output, source={"path": "reviews.jsonl"}, max_workers=2)
+    
+    with open(f"{output}.checkpoint.json", encoding='utf-8') as f:
+        records = json.load(f)["records"]
+    assert 0 < records < 10
+    
+    bot = FakeBot()
+    summary = ReviewStreamProcessor(bot, window_size=2, checkpoint_interval=2).process(
+        _reviews(10), output, source={"path": "reviews.jsonl"}, max_workers=2
+    )
+    # 체크포인트 이후 입력만 다시 처리하고, 출력은 중복·누락 없이 이어짐
+    assert sorted(bot.calls, key=int) == [str(i) for i in range(records, 10)]
+    assert _output_ids(output) == [str(i) for i in range(10)]
+    assert summary["responses"] == 10
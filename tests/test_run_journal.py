@@ -0,0 +1,129 @@
+import sqlite3
+from datetime import datetime
+import pytest
+from config import Config
+from models.review import Review, ReviewResponse
+from services.review_bot import ReviewBot
+from services.run_journal import CLASSIFIED, FAILED, GENERATED, PENDING, RunJournal, RunRetriesExceeded
+
+
+def _review(review_id, content):
+    return Review(id=review_id, author="사용자", rating=5, content=content,
+                  created_at=datetime(2024, 1, 1), country="KR", platform="google_play")
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_PATH", str(tmp_path / "response_cache.db"))
+    monkeypatch.setattr(Config, "LEGACY_RESPONSE_CACHE_FILE", str(tmp_path / "response_cache.json"))
+    monkeypatch.setattr(Config, "RUN_JOURNAL_PATH", str(tmp_path / "run_journal.db"))
+    monkeypatch.setattr(Config, "RUN_JOURNAL_ENABLED", True)
+    
+    bot = ReviewBot(fused_mode=False)
+    # 생성 단계는 리뷰 내용을 그대로 돌려줌 (저널 재사용 여부만 확인)
+    bot._process_review = lambda review, relevant_docs, journal=None, entry=None: ReviewResponse(
+        review_id=review.id, response_text=f"답변: {review.content}",
+        generated_at=datetime(2024, 1, 1), country=review.country, platform=review.platform
+    )
+    return bot
+
+
+def test_same_review_id_with_new_content_is_not_reused(bot):
+    first = bot._open_run_journal("run", [_review("1", "배송이 늦어요")])
+    assert bot.process_review(_review("1", "배송이 늦어요"), journal=first).response_text == "답변: 배송이 늦어요"
+    first.close()
+    
+    # 같은 실행 ID·리뷰 ID라도 내용이 다르면 저널의 응답을 쓰지 않음
+    second = bot._open_run_journal("run", [_review("1", "앱이 자꾸 꺼져요")])
+    assert second.summary()[PENDING] == 1
+    assert bot.process_review(_review("1", "앱이 자꾸 꺼져요"), journal=second).response_text == "답변: 앱이 자꾸 꺼져요"
+    second.close()
+
+
+class FailingGenerator:
+    """LLM 호출이 실패해 기본 응답을 돌려주는 생성기"""
+    
+    def generate_response(self, review, category, relevant_docs=None):
+        return ReviewResponse(
+            review_id=review.id, response_text="기본 응답", generated_at=datetime(2024, 1, 1),
+            country=review.country, platform=review.platform, fallback=True
+        )
+    
+    def _process_author_name(self, author):
+        return author
+
+
+class FixedClassifier:
+    def classify_review(self, review):
+        return "기타"
+
+
+def test_fallback_response_is_journaled_as_failed_and_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_PATH", str(tmp_path / "response_cache.db"))
+    monkeypatch.setattr(Config, "LEGACY_RESPONSE_CACHE_FILE", str(tmp_path / "response_cache.json"))
+    monkeypatch.setattr(Config, "RUN_JOURNAL_PATH", str(tmp_path / "run_journal.db"))
+    monkeypatch.setattr(Config, "RUN_JOURNAL_ENABLED", True)
+    monkeypatch.setattr(Config, "SEMANTIC_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "RUN_MAX_RETRIES", 2)
+    
+    bot = ReviewBot(fused_mode=False)
+    bot._response_generator = FailingGenerator()
+    bot._review_classifier = FixedClassifier()
+    review = _review("1", "앱이 자꾸 꺼져요")
+    journal = bot._open_run_journal("run", [review])
+    
+    assert bot.process_review(review, journal=journal).fallback
+    entry = journal.get("1", bot._generate_cache_key(review))
+    assert (entry["state"], entry["attempts"]) == (FAILED, 1)
+    assert bot._generate_cache_key(review) not in bot.response_cache
+    
+    # 다음 실행에서 다시 생성하고, 재시도 한도에 이르면 건너뜀
+    assert bot.process_review(review, journal=journal).fallback
+    with pytest.raises(RunRetriesExceeded):
+        bot.process_review(review, journal=journal)
+    journal.close()
+
+
+def test_run_id_includes_content(bot):
+    first = bot._open_run_journal(None, [_review("1", "배송이 늦어요")])
+    second = bot._open_run_journal(None, [_review("1", "앱이 자꾸 꺼져요")])
+    same = bot._open_run_journal(None, [_review("1", "배송이 늦어요")])
+    
+    assert first.run_id != second.run_id
+    assert first.run_id == same.run_id
+    for journal in (first, second, same):
+        journal.close()
+
+
+def test_content_key_mismatch_is_a_miss(tmp_path):
+    journal = RunJournal("run", db_path=str(tmp_path / "journal.db"))
+    journal.mark_classified("1", "key-a", "배송")
+    journal.mark_generated("1", "key-a", {"response_text": "답변"})
+    
+    assert journal.get("1", "key-a")["state"] == GENERATED
+    assert journal.get("1", "key-b") is None
+    
+    # 내용이 바뀐 리뷰의 상태 기록은 이전 분류·응답 없이 새로 시작
+    journal.mark_classified("1", "key-b", "앱 오류")
+    entry = journal.get("1", "key-b")
+    assert (entry["state"], entry["category"], entry["response"]) == (CLASSIFIED, "앱 오류", None)
+    journal.close()
+
+
+def test_journal_without_content_key_column_is_migrated(tmp_path):
+    db_path = str(tmp_path / "journal.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE reviews (
+            run_id TEXT NOT NULL, review_id TEXT NOT NULL, state TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0, category TEXT, response TEXT, error TEXT,
+            updated_at TEXT NOT NULL, PRIMARY KEY (run_id, review_id)
+        )
+    """)
+    conn.execute("INSERT INTO reviews VALUES ('run', '1', 'generated', 0, NULL, '{}', NULL, '')")
+    conn.commit()
+    conn.close()
+    
+    journal = RunJournal("run", db_path=db_path)
+    assert journal.get("1", "key-a") is None
+    journal.close()
@@ -0,0 +1,43 @@
+from services.semantic_cache import mentions_author, personalize_response
+
+
+def test_replaces_only_whole_name():
+    text = "Hi Al, thanks. All rewards are always delivered."
+    assert personalize_response(text, "Al", "Bob") == "Hi Bob, thanks. All rewards are always delivered."
+
+
+def test_removes_name_without_touching_other_words():
+    text = "Hi Al, thanks. All rewards are always delivered."
+    assert personalize_response(text, "Al", "") == "Hi, thanks. All rewards are always delivered."
+
+
+def test_korean_name_with_honorific():
+    text = "김민수님, 안녕하세요. 김민수님의 포인트를 확인했습니다."
+    personalized = personalize_response(text, "김민수", "이영희")
+    assert personalized == "이영희님, 안녕하세요. 이영희님의 포인트를 확인했습니다."
+    assert "김민수" not in personalized
+    assert personalize_response("안녕하세요 김민수님! 감사합니다.", "김민수", "") == "안녕하세요! 감사합니다."
+
+
+def test_every_mention_is_replaced():
+    text = "Hi Al, we checked Al's account. Thanks again, Al!"
+    assert personalize_response(text, "Al", "Bob") == "Hi Bob, we checked Bob's account. Thanks again, Bob!"
+    assert personalize_response("Hi Al, thanks again, Al!", "Al", "") == "Hi, thanks again!"
+
+
+def test_name_left_in_sentence_is_a_miss():
+    # 새 작성자명 없이 지울 수 없는 이름(문장 속 사용)이 남으면 재사용하지 않음
+    assert personalize_response("Hi Al, we checked Al's account.", "Al", "") is None
+    assert personalize_response("김민수님, 김민수님의 포인트를 확인했습니다.", "김민수", "") is None
+    assert mentions_author("We checked Al's account.", "Al")
+    assert not mentions_author("All rewards are delivered.", "Al")
+
+
+def test_name_inside_longer_word_is_untouched():
+    assert personalize_response("Hi Sam, Samsung phones sync later.", "Sam", "Jo") == "Hi Jo, Samsung phones sync later."
+    assert personalize_response("Samsung phones sync later.", "Sam", "Jo") == "Samsung phones sync later."
+
+
+def test_missing_old_author_is_noop():
+    assert personalize_response("Hello there", "", "Bob") == "Hello there"
+    assert personalize_response("Hello there", "Al", "Bob") == "Hello there"
@@ -0,0 +1,216 @@
+import pytest
+from langchain.docstore.document import Document
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+from config import Config
+from services.lexical_index import LexicalIndex
+from services.metrics import metrics
+from services.vector_store import VectorStoreService
+from utils.vector_store_paths import list_store_versions, resolve_store_path
+
+
+class CountingEmbeddings(Embeddings):
+    """글자 빈도 벡터 임베딩 (요청한 텍스트 기록)"""
+    
+    def __init__(self):
+        self.requested = []
+    
+    def embed_documents(self, texts):
+        self.requested.extend(texts)
+        return [self._vector(text) for text in texts]
+    
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+    
+    @staticmethod
+    def _vector(text):
+        vector = [0.0] * 16
+        for char in text:
+            vector[ord(char) % 16] += 1.0
+        return vector
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(Config, "EMBEDDING_CACHE_PATH", str(tmp_path / "embedding_cache"))
+    monkeypatch.setattr(Config, "RETRIEVAL_MODE", "hybrid")
+    monkeypatch.setattr(Config, "BM25_SKIP_CONFIDENCE", -1.0)  # 임베딩되지 않은 쿼리는 항상 BM25만 사용
+    
+    service = VectorStoreService()
+    service.embeddings.embeddings = CountingEmbeddings()
+    docs = [
+        Document(page_content="출금 신청은 마이페이지에서 할 수 있습니다", metadata={"country": "kr"}),
+        Document(page_content="광고 시청 후 포인트가 적립됩니다", metadata={"country": "kr"}),
+        Document(page_content="걸음 수는 건강 앱과 연동됩니다", metadata={"country": "kr"}),
+    ]
+    ids = ["withdraw", "ads", "steps"]
+    service.vector_stores["kr"] = FAISS.from_documents(docs, service.embeddings, ids=ids)
+    service.lexical_indexes["kr"] = LexicalIndex.build(list(zip(ids, docs)))
+    service.embeddings.embeddings.requested.clear()
+    metrics.reset()
+    return service
+
+
+def test_confident_bm25_query_skips_embedding(service):
+    results = service.similarity_search_many(["출금 신청"], "kr", k=1)
+    
+    assert results[0][0].page_content.startswith("출금 신청")
+    assert service.embeddings.embeddings.requested == []
+    assert metrics.counters.get("retrieval_dense_skipped_total") == 1
+
+
+def test_already_embedded_query_is_not_counted_as_skipped(service):
+    # 유사 캐시 조회가 리뷰를 먼저 임베딩한 경우
+    service.embeddings.embed_query("출금 신청")
+    service.embeddings.embeddings.requested.clear()
+    
+    results = service.similarity_search_many(["출금 신청", "광고 포인트"], "kr", k=1)
+    
+    assert [docs[0].metadata for docs in results] == [{"country": "kr"}] * 2
+    # 임베딩된 쿼리는 캐시로 벡터 검색(하이브리드), 나머지만 BM25로 생략
+    assert service.embeddings.embeddings.requested == []
+    assert metrics.counters.get("retrieval_dense_skipped_total") == 1
+    assert metrics.counters.get("retrieval_hybrid_total") == 1
+
+
+def _page_docs(pages):
+    """페이지 URL → 청크 본문 목록으로 문서 생성"""
+    return [
+        Document(page_content=text, metadata={"country": "kr", "source": url})
+        for url, texts in pages.items() for text in texts
+    ]
+
+
+@pytest.fixture
+def published(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(Config, "EMBEDDING_CACHE_PATH", str(tmp_path / "embedding_cache"))
+    monkeypatch.setattr(Config, "VECTOR_STORE_PATH", str(tmp_path / "vector_stores"))
+    monkeypatch.setattr(Config, "VECTOR_INDEX_TYPE", "flat")
+    monkeypatch.setattr(Config, "VECTOR_INDEX_QUANTIZATION", "none")
+    
+    service = VectorStoreService()
+    service.embeddings.embeddings = CountingEmbeddings()
+    pages = {
+        f"https://help.example/docs/{name}": [f"{name} 안내 {i}번 문단입니다" for i in range(3)]
+        for name in ("출금", "광고", "걸음", "포인트")
+    }
+    service.create_or_load_vector_store(_page_docs(pages), "kr")
+    return service, pages
+
+
+def _sources(service):
+    return sorted({doc.metadata["source"] for doc in service._store_documents(service.vector_stores["kr"]).values()})
+
+
+def test_refresh_keeps_chunks_of_pages_not_crawled(published):
+    service, pages = published
+    # "걸음" 페이지는 수집 실패(확인 못 함), "포인트" 페이지는 삭제 확인(404)
+    crawled = {url: texts for url, texts in pages.items() if not url.endswith(("걸음", "포인트"))}
+    resolved = set(crawled) | {"https://help.example/docs/포인트"}
+    
+    result = service.refresh_vector_store(_page_docs(crawled), "kr", resolved_sources=resolved)
+    
+    assert result["removed"] == 3
+    assert _sources(service) == sorted(url for url in pages if not url.endswith("포인트"))
+
+
+def test_publish_rejects_large_document_drop(published):
+    service, pages = published
+    current = service._store_paths["kr"]
+    partial = {url: texts for url, texts in list(pages.items())[:1]}
+    
+    result = service.refresh_vector_store(_page_docs(partial), "kr")
+    
+    # 12개 → 3개 (75% 감소)는 부분 수집으로 보고 현재 버전 유지
+    assert result == {"added": 0, "removed": 0, "unchanged": 0}
+    assert service._store_paths["kr"] == current
+    assert service.vector_stores["kr"].index.ntotal == 12
+
+
+def test_flat_fallback_is_updated_in_place(published, monkeypatch, capsys):
+    service, pages = published
+    monkeypatch.setattr(Config, "VECTOR_INDEX_QUANTIZATION", "pq")
+    monkeypatch.setattr(Config, "VECTOR_PQ_M", 4)
+    # 문서 12개로는 PQ 학습이 불가능하여 flat 인덱스로 생성
+    service._create_new_vector_store(_page_docs(pages), "kr")
+    assert service._read_manifest("kr")["index"] == {"config": "flat/pq", "factory": "Flat", "recall_at_k": 1.0, "fallback": True}
+    
+    service.embeddings.embeddings.requested.clear()
+    pages["https://help.example/docs/쿠폰"] = ["쿠폰 안내 문단입니다"]
+    result = service.refresh_vector_store(_page_docs(pages), "kr")
+    
+    # 설정 불일치·재생성 없이 새 청크만 추가
+    assert result == {"added": 1, "removed": 0, "unchanged": 12}
+    assert "증분 갱신" in capsys.readouterr().out
+    assert service.embeddings.embeddings.requested == ["쿠폰 안내 문단입니다"]
+    assert service._read_manifest("kr")["index"]["fallback"] is True
+
+
+def test_store_info_reports_file_and_memory_size(published):
+    service, _ = published
+    info = service.get_store_info()["kr"]
+    
+    assert info["index_file_bytes"] > 0
+    # flat 인덱스는 벡터 12개 × 16차원 float32 이상
+    assert info["index_memory_bytes"] >= 12 * 16 * 4
+
+
+def _add_page(pages):
+    return {**pages, "https://help.example/docs/쿠폰": ["쿠폰 안내 문단입니다"]}
+
+
+def test_publish_swaps_pointer_and_store_on_success(published):
+    service, pages = published
+    previous = service._store_paths["kr"]
+    
+    service.refresh_vector_store(_page_docs(_add_page(pages)), "kr")
+    
+    current = service._store_paths["kr"]
+    assert current != previous
+    assert resolve_store_path("kr") == current
+    assert service.vector_stores["kr"].index.ntotal == 13
+    # 직전 버전은 롤백용으로 남김
+    assert list_store_versions("kr") == [previous, current]
+    
+    # 새 프로세스도 교체된 버전을 로드
+    reloaded = VectorStoreService()
+    reloaded.embeddings.embeddings = CountingEmbeddings()
+    reloaded.load_existing_store("kr")
+    assert reloaded.vector_stores["kr"].index.ntotal == 13
+
+
+def test_publish_keeps_current_version_when_validation_fails(published, monkeypatch):
+    service, pages = published
+    current = service._store_paths["kr"]
+    serving = service.vector_stores["kr"]
+    
+    def reject(store, expected_count, current_count=None):
+        raise ValueError("표본 질의 실패")
+    monkeypatch.setattr(service, "_validate_store", reject)
+    
+    result = service.refresh_vector_store(_page_docs(_add_page(pages)), "kr")
+    
+    assert result == {"added": 0, "removed": 0, "unchanged": 0}
+    assert service.vector_stores["kr"] is serving
+    assert serving.index.ntotal == 12
+    assert resolve_store_path("kr") == current
+    # 검증에 실패한 버전 디렉터리는 삭제
+    assert list_store_versions("kr") == [current]
+
+
+def test_rollback_restores_previous_version(published):
+    service, pages = published
+    first = service._store_paths["kr"]
+    service.refresh_vector_store(_page_docs(_add_page(pages)), "kr")
+    
+    assert service.rollback("kr") is True
+    
+    assert service._store_paths["kr"] == first
+    assert resolve_store_path("kr") == first
+    assert service.vector_stores["kr"].index.ntotal == 12
+    assert len(service.lexical_indexes["kr"]) == 12
+    # 더 이전 버전이 없으면 현재 버전 유지
+    assert service.rollback("kr") is False
+    assert service._store_paths["kr"] == first
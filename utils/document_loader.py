@@ -1,12 +1,24 @@
+import hashlib
+import json
 import os
+import re
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.docstore.document import Document
-from typing import List
-from urllib.parse import urljoin, urlparse
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
 from config import Config
 
+# 수집하지 않는 파일 확장자
+SKIP_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.pdf', '.zip', '.mp4', '.css', '.js', '.xml')
+
 class DocumentLoader:
     """머니워크 공식 문서를 수집하고 처리하는 클래스"""
     
@@ -16,65 +28,193 @@ class DocumentLoader:
             chunk_overlap=Config.CHUNK_OVERLAP,
             separators=["\n\n", "\n", " ", ""]
         )
+        
+        # 연결 재사용을 위한 공용 세션
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=Config.CRAWL_MAX_WORKERS,
+            pool_maxsize=Config.CRAWL_MAX_WORKERS
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        
+        # 호스트별 동시 요청 제한
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._host_lock = threading.Lock()
+        
+        # 조건부 요청(ETag/Last-Modified)용 HTTP 캐시
+        self._http_cache = self._load_http_cache()
+        self._http_cache_lock = threading.Lock()
+        self.stats = {"fetched": 0, "not_modified": 0, "failed": 0}
+        # 마지막 수집에서 상태를 확인한 URL (받음·304·캐시 본문 사용·사라짐·robots.txt 제외)
+        # 여기에 없는 페이지(수집 실패·예산 초과로 방문 못 함)의 기존 청크는 증분 갱신에서 유지
+        self.resolved_urls: Set[str] = set()
     
     def load_web_documents(self, urls: dict) -> List[Document]:
-        """웹 문서들을 로드하고 청크화 (메인 페이지 + 세부 문서들)"""
+        """웹 문서들을 로드하고 청크화 (시작 페이지부터 너비 우선 탐색)"""
         documents = []
+        self.resolved_urls = set()
         
-        for country, url in urls.items():
-            try:
-                print(f"문서 수집 중: {country} - {url}")
-                
-                # 메인 페이지 수집
-                main_content = self._fetch_web_content(url)
-                if main_content:
-                    documents.extend(self._create_documents(main_content, url, country, "main"))
-                
-                # 세부 링크들 찾기 및 수집
-                sub_links = self._find_sub_links(url)
-                print(f"  → {len(sub_links)}개의 세부 페이지 발견")
-                
-                for i, sub_url in enumerate(sub_links[:10]):  # 최대 10개로 제한
-                    print(f"    세부 문서 {i+1}: {sub_url}")
-                    sub_content = self._fetch_web_content(sub_url)
-                    if sub_content:
-                        documents.extend(self._create_documents(sub_content, sub_url, country, f"sub_{i+1}"))
-                        
-            except Exception as e:
-                print(f"문서 로드 실패 {url}: {e}")
+        with ThreadPoolExecutor(max_workers=Config.CRAWL_MAX_WORKERS) as executor:
+            for country, url in urls.items():
+                try:
+                    print(f"문서 수집 중: {country} - {url}")
+                    
+                    pages = self._crawl(url, executor)
+                    print(f"  → {len(pages)}개 페이지 수집")
+                    
+                    for i, (page_url, content) in enumerate(pages):
+                        doc_type = "main" if i == 0 else f"sub_{i}"
+                        documents.extend(self._create_documents(content, page_url, country, doc_type))
                 
+                except Exception as e:
+                    print(f"문서 로드 실패 {url}: {e}")
+        
+        self._save_http_cache()
+        print(f"수집 통계: 새로 받음 {self.stats['fetched']}개, 변경 없음(304) {self.stats['not_modified']}개, 실패 {self.stats['failed']}개")
         return documents
     
-    def _find_sub_links(self, base_url: str) -> List[str]:
-        """메인 페이지에서 세부 문서 링크들을 찾기"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(base_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            base_domain = urlparse(base_url).netloc
+    def _crawl(self, start_url: str, executor: ThreadPoolExecutor) -> List[Tuple[str, str]]:
+        """너비 우선 크롤링 (깊이/페이지 수/시간 예산 적용), 방문 순서대로 (URL, 본문) 반환
+        
+        같은 입력에 대해 항상 같은 순서로 방문하도록 각 깊이의 URL을
+        발견 순서대로 처리하고, sitemap.xml에서 찾은 URL은 정렬 후 1단계에 추가합니다.
+        """
+        start_url = self._normalize_url(start_url)
+        deadline = time.monotonic() + Config.CRAWL_TIME_BUDGET_SECONDS
+        robots = self._load_robots(start_url)
+        
+        seen = {start_url}
+        frontier = [start_url]
+        sitemap_urls = sorted(
+            u for u in (self._normalize_url(loc) for loc in self._load_sitemap_urls(start_url, robots))
+            if self._in_scope(start_url, u)
+        )
+        pages = []
+        
+        for depth in range(Config.CRAWL_MAX_DEPTH + 1):
+            next_frontier = []
             
-            links = []
-            # 다양한 링크 패턴 찾기
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                full_url = urljoin(base_url, href)
+            # 동시 요청 수 단위로 나눠 수집하며 예산 확인
+            for batch_start in range(0, len(frontier), Config.CRAWL_MAX_WORKERS):
+                if len(pages) >= Config.CRAWL_MAX_PAGES or time.monotonic() > deadline:
+                    break
                 
-                # 같은 도메인 내의 문서 링크만 수집
-                if (base_domain in full_url and 
-                    full_url != base_url and
-                    not any(skip in full_url for skip in ['#', 'javascript:', 'mailto:', 'tel:'])):
-                    links.append(full_url)
+                batch = frontier[batch_start:batch_start + Config.CRAWL_MAX_WORKERS]
+                disallowed = [u for u in batch if robots is not None and not robots.can_fetch(self.session.headers['User-Agent'], u)]
+                self._resolve(*disallowed)
+                batch = [u for u in batch if u not in disallowed]
+                
+                for url, (content, links) in zip(batch, executor.map(self._fetch_page, batch)):
+                    if content and len(pages) < Config.CRAWL_MAX_PAGES:
+                        pages.append((url, content))
+                    
+                    for link in links:
+                        link = self._normalize_url(link)
+                        if link not in seen and self._in_scope(start_url, link):
+                            seen.add(link)
+                            next_frontier.append(link)
+            
+            if depth == 0:
+                for url in sitemap_urls:
+                    if url not in seen:
+                        seen.add(url)
+                        next_frontier.append(url)
             
-            # 중복 제거
-            return list(set(links))
+            if len(pages) >= Config.CRAWL_MAX_PAGES:
+                print(f"  페이지 예산({Config.CRAWL_MAX_PAGES}개) 도달로 수집 종료")
+                break
+            if time.monotonic() > deadline:
+                print(f"  시간 예산({Config.CRAWL_TIME_BUDGET_SECONDS}초) 초과로 수집 종료")
+                break
+            if not next_frontier:
+                break
             
+            frontier = next_frontier
+        
+        return pages
+    
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """URL 정규화 (소문자 호스트, 기본 포트·프래그먼트·추적 파라미터 제거, 쿼리 정렬)"""
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+            host = f"{host}:{parts.port}"
+        
+        path = re.sub(r"/{2,}", "/", parts.path or "/")
+        if len(path) > 1 and path.endswith("/"):
+            path = path.rstrip("/")
+        
+        query = urlencode(sorted(
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in ("fbclid", "gclid")
+        ))
+        
+        return urlunsplit((scheme, host, path, query, ""))
+    
+    @staticmethod
+    def _in_scope(start_url: str, url: str) -> bool:
+        """시작 URL과 같은 호스트이면서 같은 경로 아래의 HTML 문서인지 확인"""
+        start, target = urlsplit(start_url), urlsplit(url)
+        if target.scheme not in ("http", "https") or target.netloc != start.netloc:
+            return False
+        
+        base_path = start.path.rstrip("/")
+        if target.path != base_path and not target.path.startswith(base_path + "/"):
+            return False
+        
+        return not target.path.lower().endswith(SKIP_EXTENSIONS)
+    
+    def _load_robots(self, start_url: str) -> Optional[RobotFileParser]:
+        """robots.txt 로드 (없거나 실패하면 None → 제한 없음)"""
+        parts = urlsplit(start_url)
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        try:
+            response = self.session.get(robots_url, timeout=Config.CRAWL_TIMEOUT)
+            if response.status_code != 200:
+                return None
+            robots = RobotFileParser(robots_url)
+            robots.parse(response.text.splitlines())
+            return robots
         except Exception as e:
-            print(f"세부 링크 찾기 실패 {base_url}: {e}")
-            return []
+            print(f"robots.txt 로드 실패 {robots_url}: {e}")
+            return None
+    
+    def _load_sitemap_urls(self, start_url: str, robots: Optional[RobotFileParser]) -> List[str]:
+        """sitemap.xml(및 robots.txt에 명시된 sitemap)의 URL 목록 (sitemap index는 한 단계까지 확장)"""
+        parts = urlsplit(start_url)
+        sitemaps = [f"{parts.scheme}://{parts.netloc}/sitemap.xml"]
+        if robots is not None and robots.site_maps():
+            sitemaps = list(dict.fromkeys(robots.site_maps() + sitemaps))
+        
+        urls = []
+        for depth in range(2):
+            nested = []
+            for sitemap_url in sitemaps:
+                try:
+                    response = self.session.get(sitemap_url, timeout=Config.CRAWL_TIMEOUT)
+                    if response.status_code != 200:
+                        continue
+                    root = ElementTree.fromstring(response.content)
+                except Exception:
+                    continue
+                
+                locs = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+                if root.tag.endswith("sitemapindex"):
+                    nested.extend(locs)
+                else:
+                    urls.extend(locs)
+            
+            if not nested or len(urls) >= Config.CRAWL_MAX_PAGES:
+                break
+            sitemaps = nested
+        
+        return urls
     
     def _create_documents(self, content: str, url: str, country: str, doc_type: str) -> List[Document]:
         """텍스트 내용을 Document 객체들로 변환"""
@@ -88,37 +228,118 @@ class DocumentLoader:
                     "source": url,
                     "country": country,
                     "doc_type": doc_type,
-                    "chunk_id": f"{country}_{doc_type}_{i}"
+                    "chunk_id": f"{country}_{doc_type}_{i}",
+                    # 증분 갱신용 내용 해시 (출처 URL + 본문)
+                    "content_hash": hashlib.sha256(f"{url}\n{chunk}".encode('utf-8')).hexdigest()
                 }
             )
             documents.append(doc)
         
         return documents
     
-    def _fetch_web_content(self, url: str) -> str:
-        """웹 페이지에서 텍스트 내용 추출"""
+    def _fetch_page(self, url: str) -> Tuple[str, List[str]]:
+        """웹 페이지를 한 번 받아 (텍스트 내용, 링크 목록) 반환 (변경 없으면 캐시 사용)"""
+        cached = self._http_cache.get(url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with self._host_semaphore(url):
+                response = self.session.get(url, headers=headers, timeout=Config.CRAWL_TIMEOUT)
             
-            # 불필요한 태그 제거
-            for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
-                tag.decompose()
+            if response.status_code == 304 and cached:
+                self._count("not_modified")
+                self._resolve(url)
+                return cached["text"], cached["links"]
             
-            # 텍스트만 추출
-            text = soup.get_text()
+            if response.status_code in (404, 410):
+                # 삭제된 페이지: 캐시를 지우고 기존 청크도 삭제되도록 확인 완료로 표시
+                with self._http_cache_lock:
+                    self._http_cache.pop(url, None)
+                self._count("failed")
+                self._resolve(url)
+                return "", []
             
-            # 공백 정리
-            lines = [line.strip() for line in text.splitlines()]
-            text = '\n'.join(line for line in lines if line)
+            response.raise_for_status()
+            text, links = self._parse_page(url, response.content)
             
-            return text
+            if response.headers.get("ETag") or response.headers.get("Last-Modified"):
+                with self._http_cache_lock:
+                    self._http_cache[url] = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "text": text,
+                        "links": links
+                    }
             
+            self._count("fetched")
+            self._resolve(url)
+            return text, links
+        
         except Exception as e:
+            self._count("failed")
+            if cached:
+                # 일시적 오류(시간 초과·5xx 등)는 이전에 받은 본문으로 대체
+                print(f"웹 콘텐츠 가져오기 실패, 캐시된 본문 사용 {url}: {e}")
+                self._resolve(url)
+                return cached["text"], cached["links"]
             print(f"웹 콘텐츠 가져오기 실패 {url}: {e}")
-            return "" 
\ No newline at end of file
+            return "", []
+    
+    def _parse_page(self, url: str, html: bytes) -> Tuple[str, List[str]]:
+        """HTML을 한 번만 파싱하여 링크와 본문 텍스트 추출"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # 링크는 태그 제거 전에 수집 (내비게이션 링크 포함)
+        links = [urljoin(url, link['href']) for link in soup.find_all('a', href=True)]
+        
+        # 불필요한 태그 제거
+        for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
+            tag.decompose()
+        
+        # 텍스트만 추출
+        text = soup.get_text()
+        
+        # 공백 정리
+        lines = [line.strip() for line in text.splitlines()]
+        text = '\n'.join(line for line in lines if line)
+        
+        return text, links
+    
+    def _host_semaphore(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.Semaphore(Config.CRAWL_CONCURRENCY_PER_HOST)
+            return self._host_semaphores[host]
+    
+    def _resolve(self, *urls: str):
+        with self._http_cache_lock:
+            self.resolved_urls.update(urls)
+    
+    def _count(self, key: str):
+        with self._http_cache_lock:
+            self.stats[key] += 1
+    
+    def _load_http_cache(self) -> Dict:
+        if not os.path.exists(Config.CRAWL_CACHE_PATH):
+            return {}
+        try:
+            with open(Config.CRAWL_CACHE_PATH, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"크롤링 캐시 로드 실패: {e}")
+            return {}
+    
+    def _save_http_cache(self):
+        try:
+            with self._http_cache_lock:
+                with open(f"{Config.CRAWL_CACHE_PATH}.tmp", 'w', encoding='utf-8') as f:
+                    json.dump(self._http_cache, f, ensure_ascii=False)
+                os.replace(f"{Config.CRAWL_CACHE_PATH}.tmp", Config.CRAWL_CACHE_PATH)
+        except Exception as e:
+            print(f"크롤링 캐시 저장 실패: {e}")
@@ -0,0 +1,100 @@
+import csv
+import os
+from typing import Dict, List
+from config import Config
+
+# CSV 케이스명 → 리뷰 카테고리 매핑
+CASE_CATEGORY_MAP = {
+    "포인트 미지급": "포인트_관련",
+    "수면모드 오류": "기능_오류",
+    "교환상품 변경": "상품_교환",
+    "초대 코드/친구 초대": "친구_초대",
+    "Step Tracking Error": "기능_오류",
+    "Accessibility (VoiceOver)": "접근성",
+    "Reward Delays/Missing Gift Cards": "상품_교환",
+    "Points Decrease After Redemption": "포인트_관련"
+}
+
+# 국가별 CSV 컬럼명 (케이스, 리뷰, 답변)
+CASE_COLUMNS = {
+    "KR": ("케이스", "예시 리뷰", "실제 답변"),
+    "US": ("Case", "Example Review", "Actual Response")
+}
+
+# 응답 생성 프롬프트에 쓰던 실제 답변 예시 (국가, 케이스, 카테고리, 답변)
+PROMPT_EXAMPLES = [
+    ("KR", "현금 인출 관련", "기능_오류",
+     "더 나은 서비스를 제공하기 위한 기능 업데이트 과정에서 약 3~4일간 일시적으로 현금 인출 기능이 표시되지 않았을 수 있습니다. 현재는 정상적으로 이용 가능하오니 다시 한번 확인 부탁드립니다."),
+    ("KR", "문의 답변 지연", "문의_누락",
+     "문의 답변이 지연되어 불편을 드려 죄송합니다. 채팅 문의의 특성상 간혹 누락이 발생할 수 있으며, 이런 경우 기존 문의가 아닌 '새 문의'로 다시 남겨주시면 더욱 신속하게 확인하여 답변드리겠습니다."),
+    ("KR", "기능 변경", "기타",
+     "기존 기능을 유지하는 것보다, 유저분들께 더욱 유용한 경험을 제공하기 위해 새로운 기능 개발에 집중하고 있습니다. 앞으로도 지속적인 개선을 통해 더 나은 서비스를 제공할 수 있도록 노력하겠습니다."),
+    ("KR", "상품 변경", "상품_교환",
+     "쿠폰의 경우 공급 상황에 따라 구성이 변경될 수 있으며, 더 많은 상품을 제공하기 위해 이번 선물샵 개편을 통해 300여 가지의 새로운 상품을 추가했습니다."),
+    ("KR", "문의 누락", "문의_누락",
+     "번거롭게 해드려 죄송합니다. 채팅 상담 특성상 유저님의 문의가 누락되었을 가능성이 있습니다. 정말 죄송하지만, 다시 한 번 상담을 남겨주시면 저희가 바로 확인하여 도움을 드리겠습니다."),
+    ("KR", "일반적인 불편사항", "기타",
+     "이용 중 불편을 겪으셨다니 죄송한 마음입니다. 정확한 확인을 위해 앱 내 1:1 문의를 남겨주시면 신속하게 도움을 드리겠습니다. 유저분들의 피드백을 소중하게 생각하며, 더 나은 서비스 제공을 위해 지속적으로 개선하겠습니다."),
+    ("US", "Step Tracking Error", "기능_오류",
+     "Hi [Name], sorry for the confusion! Step data may sync differently depending on your phone's motion settings. Please check if the app has motion permission enabled in Settings."),
+    ("US", "Accessibility", "접근성",
+     "Hi [Name], thank you for your feedback and for using VoiceOver. We're aware of this issue and working to improve accessibility. Your input truly helps us build a better experience."),
+    ("US", "Reward Delays", "상품_교환",
+     "Hi [Name], sorry to hear that. Gift card delivery may take some time depending on provider. If you still haven't received it, please contact us through the in-app Help Center."),
+    ("US", "Points Decrease", "포인트_관련",
+     "Hi [Name], thanks for your feedback. Point amounts may change over time based on app events and level progress. We appreciate your continued support!"),
+    ("US", "Inquiry Missing", "문의_누락",
+     "We sincerely apologize for the inconvenience. Due to the nature of our chat system, it's possible that your previous message was missed. We're truly sorry about that. Could you please send your message again? Also, to help us locate your previous inquiry faster, please include your nickname in the new message. Thank you so much for your patience!")
+]
+
+def load_prompt_examples() -> List[Dict]:
+    """프롬프트 답변 예시를 리뷰 케이스와 같은 형식으로 반환 (원본 리뷰는 없음)"""
+    return [
+        {"country": country, "case": case, "category": category, "review": "", "response": response}
+        for country, case, category, response in PROMPT_EXAMPLES
+    ]
+
+def render_prompt_examples(country: str) -> str:
+    """국가별 프롬프트 답변 예시 블록 (예시 검색을 쓰지 않을 때 시스템 프롬프트에 포함)"""
+    if country == "KR":
+        lines = ["실제 답변 예시:"]
+        for example_country, case, _, response in PROMPT_EXAMPLES:
+            if example_country == country:
+                lines.append(f'\n{case}:\n"{response}"')
+        return "\n".join(lines)
+    
+    lines = ["**Actual Response Examples:**"]
+    for example_country, case, _, response in PROMPT_EXAMPLES:
+        if example_country == country:
+            lines.append(f'- {case}: "{response}"')
+    return "\n".join(lines)
+
+def load_review_cases() -> List[Dict]:
+    """KR/US 리뷰 케이스 CSV를 읽어 (국가, 케이스, 카테고리, 리뷰, 답변) 목록으로 반환"""
+    cases = []
+    
+    for country, file_path in Config.REVIEW_CASE_FILES.items():
+        if not os.path.exists(file_path):
+            continue
+        
+        case_col, review_col, response_col = CASE_COLUMNS.get(country, CASE_COLUMNS["US"])
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+                for row in csv.DictReader(f):
+                    review_text = (row.get(review_col) or "").strip()
+                    if not review_text:
+                        continue
+                    
+                    case_name = (row.get(case_col) or "").strip()
+                    cases.append({
+                        "country": country,
+                        "case": case_name,
+                        "category": CASE_CATEGORY_MAP.get(case_name),
+                        "review": review_text,
+                        "response": (row.get(response_col) or "").strip()
+                    })
+        except Exception as e:
+            print(f"리뷰 케이스 로드 실패 {file_path}: {e}")
+    
+    return cases
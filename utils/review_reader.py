@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+from models.review import Review
+
+# Review 필드 → 입력 파일 컬럼명 후보 (대소문자·공백 무시, 앞쪽 우선)
+COLUMN_ALIASES = {
+    "id": ["id", "review_id", "reviewid", "review id", "리뷰 id", "리뷰id"],
+    "content": ["content", "review", "review text", "text", "body", "예시 리뷰", "example review", "리뷰", "리뷰 내용"],
+    "author": ["author", "nickname", "user", "username", "reviewer", "작성자"],
+    "rating": ["rating", "star rating", "stars", "score", "별점", "평점"],
+    "created_at": ["created_at", "date", "review submit date and time", "review submit millis since epoch", "작성일", "작성 일시"],
+    "country": ["country", "territory", "region", "국가"],
+    "platform": ["platform", "store", "플랫폼"]
+}
+
+# 국가 컬럼 값 → Config.COUNTRIES 코드
+COUNTRY_ALIASES = {"kr": "KR", "kor": "KR", "korea": "KR", "south korea": "KR", "ko": "KR", "한국": "KR",
+                   "us": "US", "usa": "US", "united states": "US", "en": "US", "미국": "US"}
+
+# 플랫폼 컬럼 값 → Review.platform
+PLATFORM_ALIASES = {"google_play": "google_play", "google play": "google_play", "android": "google_play", "play": "google_play",
+                    "app_store": "app_store", "app store": "app_store", "ios": "app_store", "apple": "app_store"}
+
+HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+def read_reviews(file_path: str, country: Optional[str] = None, platform: Optional[str] = None) -> Iterator[Review]:
+    """CSV/JSONL 리뷰 파일을 한 행씩 읽어 Review로 반환 (파일 전체를 메모리에 올리지 않음)
+
+    확장자가 .jsonl/.ndjson이면 JSON Lines, 그 외는 CSV(UTF-8, BOM 허용)로 읽습니다.
+    country/platform을 지정하면 파일 값보다 우선하며, 국가 정보가 없으면 한글 포함 여부로 판단합니다.
+    내용이 없거나 읽을 수 없는 행은 건너뜁니다.
+    """
+    source = os.path.splitext(os.path.basename(file_path))[0]
+    is_jsonl = file_path.lower().endswith((".jsonl", ".ndjson"))
+    skipped = 0
+    
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = _iter_jsonl(f) if is_jsonl else csv.DictReader(f)
+        for row_number, row in enumerate(rows, 1):
+            review = parse_review(row, f"{source}_{row_number}", country, platform) if row else None
+            if review is None:
+                skipped += 1
+                continue
+            yield review
+    
+    if skipped:
+        print(f"리뷰 파일 {file_path}: 내용이 없거나 읽을 수 없는 행 {skipped}개 건너뜀")
+
+def _iter_jsonl(f) -> Iterator[Optional[Dict]]:
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+def parse_review(row: Dict, default_id: str, country: Optional[str] = None, platform: Optional[str] = None) -> Optional[Review]:
+    """행(dict)을 Review로 변환 (컬럼명 별칭 허용, 내용이 없으면 None)"""
+    normalized = {str(key).strip().lower(): value for key, value in row.items() if key is not None}
+    fields = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            value = normalized.get(alias)
+            if value not in (None, ""):
+                fields[field] = value
+                break
+    
+    content = str(fields.get("content", "")).strip()
+    if not content:
+        return None
+    
+    if country:
+        country = country.upper()
+    else:
+        country = COUNTRY_ALIASES.get(str(fields.get("country", "")).strip().lower())
+        if country is None:
+            country = "KR" if HANGUL_PATTERN.search(content) else "US"
+    
+    if not platform:
+        platform = PLATFORM_ALIASES.get(str(fields.get("platform", "")).strip().lower(), "google_play")
+    
+    return Review(
+        id=str(fields.get("id") or default_id),
+        author=str(fields.get("author") or "익명"),
+        rating=_parse_rating(fields.get("rating")),
+        content=content,
+        created_at=_parse_datetime(fields.get("created_at")),
+        country=country,
+        platform=platform
+    )
+
+def _parse_rating(value) -> int:
+    try:
+        return min(5, max(1, int(float(value))))
+    except (TypeError, ValueError):
+        return 3
+
+def _parse_datetime(value) -> datetime:
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.strip().isdigit()):
+        # 밀리초 epoch (Google Play 콘솔 내보내기)
+        timestamp = float(value)
+        return datetime.fromtimestamp(timestamp / 1000 if timestamp > 1e11 else timestamp)
+    
+    if isinstance(value, str) and value.strip():
+        text = value.strip().replace("Z", "+00:00")
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            for date_format in ("%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M", "%Y.%m.%d", "%m/%d/%Y"):
+                try:
+                    return datetime.strptime(text, date_format)
+                except ValueError:
+                    continue
+    
+    return datetime.now()
@@ -0,0 +1,67 @@
+import os
+import shutil
+from datetime import datetime
+from typing import List, Optional
+from config import Config
+
+# 버전 디렉터리: {country}_faiss.v<생성 시각>, 현재 버전 포인터: {country}_current (디렉터리 이름 1줄)
+VERSION_MARKER = "_faiss.v"
+
+def legacy_store_path(country: str) -> str:
+    """버전 관리 이전의 저장소 경로"""
+    return os.path.join(Config.VECTOR_STORE_PATH, f"{country}_faiss")
+
+def current_pointer_path(country: str) -> str:
+    return os.path.join(Config.VECTOR_STORE_PATH, f"{country}_current")
+
+def resolve_store_path(country: str) -> Optional[str]:
+    """현재 서비스 중인 저장소 경로 (포인터 → 이전 방식 디렉터리 순, 없으면 None)"""
+    try:
+        with open(current_pointer_path(country), 'r', encoding='utf-8') as f:
+            name = f.read().strip()
+        if name and os.path.isdir(os.path.join(Config.VECTOR_STORE_PATH, name)):
+            return os.path.join(Config.VECTOR_STORE_PATH, name)
+    except OSError:
+        pass
+    
+    legacy_path = legacy_store_path(country)
+    return legacy_path if os.path.isdir(legacy_path) else None
+
+def list_store_versions(country: str) -> List[str]:
+    """국가별 저장소 경로 목록 (오래된 순, 이전 방식 디렉터리가 있으면 가장 앞)"""
+    if not os.path.isdir(Config.VECTOR_STORE_PATH):
+        return []
+    
+    prefix = f"{country}{VERSION_MARKER}"
+    versions = sorted(name for name in os.listdir(Config.VECTOR_STORE_PATH) if name.startswith(prefix))
+    paths = [os.path.join(Config.VECTOR_STORE_PATH, name) for name in versions]
+    if os.path.isdir(legacy_store_path(country)):
+        paths.insert(0, legacy_store_path(country))
+    return paths
+
+def new_version_path(country: str) -> str:
+    """새 버전 디렉터리 경로 (아직 만들지 않음, 이름순 = 생성순)"""
+    return os.path.join(Config.VECTOR_STORE_PATH, f"{country}{VERSION_MARKER}{datetime.now().strftime('%Y%m%d%H%M%S%f')}")
+
+def set_current_version(country: str, store_path: str):
+    """현재 버전 포인터를 원자적으로 교체"""
+    pointer_path = current_pointer_path(country)
+    with open(f"{pointer_path}.tmp", 'w', encoding='utf-8') as f:
+        f.write(os.path.basename(store_path))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{pointer_path}.tmp", pointer_path)
+
+def prune_store_versions(country: str, keep: Optional[int] = None):
+    """현재 버전과 그 직전 버전들(롤백용)만 남기고 오래된 버전 삭제"""
+    keep = keep or Config.VECTOR_STORE_KEEP_VERSIONS
+    current = resolve_store_path(country)
+    versions = list_store_versions(country)
+    if current not in versions:
+        return
+    
+    # 현재 버전보다 새로운 디렉터리는 검증에 실패했거나 중단된 빌드
+    position = versions.index(current)
+    stale = versions[:max(0, position + 1 - keep)] + versions[position + 1:]
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)